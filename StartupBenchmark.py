@@ -0,0 +1,159 @@
+##
+# Quick script to measure how long each console script takes
+# to get from process start to the point where it does real work.
+# For the stuart invocables that is the call to Go().
+#
+# Usage: python StartupBenchmark.py [--runs N]
+#
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+# console script: (module, invocable class, settings manager class)
+INVOCABLES = {
+    "stuart_setup": ("edk2toolext.invocables.edk2_setup", "Edk2PlatformSetup", "SetupSettingsManager"),
+    "stuart_update": ("edk2toolext.invocables.edk2_update", "Edk2Update", "UpdateSettingsManager"),
+    "stuart_build": ("edk2toolext.invocables.edk2_platform_build", "Edk2PlatformBuild", "BuildSettingsManager"),
+    "stuart_ci_build": ("edk2toolext.invocables.edk2_ci_build", "Edk2CiBuild", "CiBuildSettingsManager"),
+    "stuart_ci_setup": ("edk2toolext.invocables.edk2_ci_setup", "Edk2CiBuildSetup", "CiSetupSettingsManager"),
+    "stuart_pr_eval": ("edk2toolext.invocables.edk2_pr_eval", "Edk2PrEval", "PrEvalSettingsManager"),
+}
+
+# required command line arguments beyond the settings file
+EXTRA_ARGS = {
+    "stuart_pr_eval": ["--pr-target", "origin/master"],
+}
+
+# The settings file only imports the invocable being measured so it doesn't add to the startup time
+SETTINGS_TEXT = '''
+import os
+from {module} import {manager}
+
+
+class Settings({manager}):
+    def GetWorkspaceRoot(self):
+        return os.path.dirname(os.path.abspath(__file__))
+
+    def GetActiveScopes(self):
+        return ()
+
+    def GetPackagesPath(self):
+        return []
+
+    def GetPackagesSupported(self):
+        return []
+
+    def GetArchitecturesSupported(self):
+        return []
+
+    def GetTargetsSupported(self):
+        return []
+
+    def GetRequiredSubmodules(self):
+        return []
+
+    def GetDependencies(self):
+        return []
+
+    def GetName(self):
+        return "StartupBenchmark"
+'''
+
+# stuart_build also needs a UefiBuilder in the settings file
+BUILDER_TEXT = '''
+
+from edk2toolext.environment.uefi_build import UefiBuilder
+
+
+class Builder(UefiBuilder):
+    pass
+'''
+
+# Runs in the child process.  Go() reports the time it was reached and exits.
+INVOCABLE_RUNNER = '''
+import sys
+import time
+from {module} import {invocable}, main
+
+
+def Go(self):
+    print("GO_REACHED", time.time())
+    return 0
+
+
+{invocable}.Go = Go
+sys.argv = {argv!r}
+main()
+'''
+
+OMNICACHE_RUNNER = '''
+import sys
+import time
+from edk2toolext import omnicache
+
+
+def get_cli_options():
+    print("GO_REACHED", time.time())
+    sys.exit(0)
+
+
+omnicache.get_cli_options = get_cli_options
+sys.argv = ["omnicache", "--list", r"{cache}"]
+omnicache.main()
+'''
+
+
+def TimeToGo(code, cwd):
+    ''' return the seconds from process start until the runner code reports it reached Go() '''
+    # measure the edk2toolext in this tree rather than an installed copy
+    env = dict(os.environ)
+    paths = [os.path.dirname(os.path.abspath(__file__)), env.get("PYTHONPATH")]
+    env["PYTHONPATH"] = os.pathsep.join(p for p in paths if p)
+    start = time.time()
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, universal_newlines=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("GO_REACHED"):
+            return float(line.split()[1]) - start
+    raise RuntimeError(f"Go() was not reached:\n{result.stdout}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the time to Go() of each console script")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs of each script.  The median is reported")
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp()
+    try:
+        runners = {}
+        for (script, (module, invocable, manager)) in INVOCABLES.items():
+            settings = os.path.join(workspace, script + "_settings.py")
+            with open(settings, "w") as f:
+                f.write(SETTINGS_TEXT.format(module=module, manager=manager))
+                if script == "stuart_build":
+                    f.write(BUILDER_TEXT)
+            argv = [script, "-c", settings] + EXTRA_ARGS.get(script, [])
+            runners[script] = INVOCABLE_RUNNER.format(module=module, invocable=invocable, argv=argv)
+        runners["omnicache"] = OMNICACHE_RUNNER.format(cache=os.path.join(workspace, "omnicache"))
+
+        print(f"{'Script':<20}{'Median (ms)':>12}{'Min (ms)':>12}")
+        for (script, code) in runners.items():
+            times = [TimeToGo(code, workspace) * 1000 for _ in range(args.runs)]
+            print(f"{script:<20}{statistics.median(times):>12.1f}{min(times):>12.1f}")
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
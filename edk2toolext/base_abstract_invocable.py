@@ -11,14 +11,16 @@
 from datetime import datetime
 from edk2toolext import edk2_logging
 from edk2toolext.environment import plugin_manager
-from edk2toolext.environment.plugintypes.uefi_helper_plugin import HelperFunctions
+from edk2toolext.environment.plugintypes.uefi_helper_plugin import HelperFunctions, IUefiHelperPlugin
 from edk2toolext.environment import self_describing_environment
+from edk2toolext.environment import profiler
 
 
 class BaseAbstractInvocable(object):
 
     def __init__(self):
         self.log_filename = None
+        self.profile = False
         return
 
     def ParseCommandLineOptions(self):
@@ -39,6 +41,7 @@ def GetLoggingLevel(self, loggerType):
         con  == Screen logging
         txt  == plain text file logging
         md   == markdown file logging
+        json == json lines file logging
         '''
         raise NotImplementedError()
 
@@ -56,6 +59,12 @@ def GetVerifyCheckRequired(self):
         ''' Will call self_describing_environment.VerifyEnvironment if this returns True '''
         return True
 
+    def GetPluginClasses(self):
+        ''' Return tuple of plugin interface classes this invocable uses.
+        Plugins of these classes are loaded up front.  Other plugins are only loaded if requested.
+        '''
+        return (IUefiHelperPlugin,)
+
     def GetLoggingFileName(self, loggerType):
         ''' Get the logging file name for the type.
         Return None if the logger shouldn't be created
@@ -64,9 +73,16 @@ def GetLoggingFileName(self, loggerType):
         con  == Screen logging
         txt  == plain text file logging
         md   == markdown file logging
+        json == json lines file logging
         '''
         raise NotImplementedError()
 
+    def GetProfileFileName(self):
+        ''' Return the path the profile is written to when profiling.  It is next to the txt log '''
+        if self.log_filename is not None:
+            return os.path.splitext(self.log_filename)[0] + ".prof"
+        return os.path.join(self.GetWorkspaceRoot(), self.GetLoggingFolderRelativeToRoot(), "profile.prof")
+
     def Go(self):
         ''' Main function to run '''
         raise NotImplementedError()
@@ -88,14 +104,20 @@ def ConfigureLogging(self):
         if(txtlogfile is not None):
             logfile, filelogger = edk2_logging.setup_txt_logger(log_directory,
                                                                 self.GetLoggingFileName("txt"),
-                                                                txtlogfile)
+                                                                txtlogfile, use_queue=True)
             self.log_filename = logfile
 
         md_log_file = self.GetLoggingLevel("md")
         if(md_log_file is not None):
             md_file, md_logger = edk2_logging.setup_markdown_logger(log_directory,
                                                                     self.GetLoggingFileName("md"),
-                                                                    md_log_file)
+                                                                    md_log_file, use_queue=True)
+
+        json_log_file = self.GetLoggingLevel("json")
+        if(json_log_file is not None):
+            json_file, json_logger = edk2_logging.setup_json_logger(log_directory,
+                                                                    self.GetLoggingFileName("json"),
+                                                                    json_log_file, use_queue=True)
 
         logging.info("Log Started: " + datetime.strftime(datetime.now(), "%A, %B %d, %Y %I:%M%p"))
 
@@ -108,42 +130,50 @@ def Invoke(self):
         self.ConfigureLogging()
         self.InputParametersConfiguredCallback()
 
-        logging.log(edk2_logging.SECTION, "Init SDE")
-
-        #
-        # Next, get the environment set up.
-        #
-        (build_env, shell_env) = self_describing_environment.BootstrapEnvironment(
-            self.GetWorkspaceRoot(), self.GetActiveScopes())
-
-        # Make sure the environment verifies IF it is required for this invocation
-        if self.GetVerifyCheckRequired() and not self_describing_environment.VerifyEnvironment(
-                self.GetWorkspaceRoot(), self.GetActiveScopes()):
-            raise RuntimeError("SDE is not current.  Please update your env before running this tool.")
-
-        # Load plugins
-        logging.log(edk2_logging.SECTION, "Loading Plugins")
-
-        self.plugin_manager = plugin_manager.PluginManager()
-        failedPlugins = self.plugin_manager.SetListOfEnvironmentDescriptors(
-            build_env.plugins)
-        if failedPlugins:
-            logging.critical("One or more plugins failed to load. Halting build.")
-            for a in failedPlugins:
-                logging.error("Failed Plugin: {0}".format(a["name"]))
-            raise Exception("One or more plugins failed to load.")
-
-        self.helper = HelperFunctions()
-        if(self.helper.LoadFromPluginManager(self.plugin_manager) > 0):
-            raise Exception("One or more helper plugins failed to load.")
-
-        logging.log(edk2_logging.SECTION, "Start Invocable Tool")
-        retcode = self.Go()
+        profile = None
+        if self.profile:
+            profile = profiler.start_profile()
+        try:
+            with edk2_logging.timed_section("Init SDE"):
+                #
+                # Next, get the environment set up.
+                #
+                (build_env, shell_env) = self_describing_environment.BootstrapEnvironment(
+                    self.GetWorkspaceRoot(), self.GetActiveScopes())
+
+                # Make sure the environment verifies IF it is required for this invocation
+                if self.GetVerifyCheckRequired() and not self_describing_environment.VerifyEnvironment(
+                        self.GetWorkspaceRoot(), self.GetActiveScopes()):
+                    raise RuntimeError("SDE is not current.  Please update your env before running this tool.")
+
+            # Load plugins
+            with edk2_logging.timed_section("Loading Plugins"):
+                self.plugin_manager = plugin_manager.PluginManager()
+                failedPlugins = self.plugin_manager.SetListOfEnvironmentDescriptors(
+                    build_env.plugins, self.GetPluginClasses())
+                if failedPlugins:
+                    logging.critical("One or more plugins failed to load. Halting build.")
+                    for a in failedPlugins:
+                        logging.error("Failed Plugin: {0}".format(a["name"]))
+                    raise Exception("One or more plugins failed to load.")
+
+                self.helper = HelperFunctions()
+                if(self.helper.LoadFromPluginManager(self.plugin_manager) > 0):
+                    raise Exception("One or more helper plugins failed to load.")
+
+            with edk2_logging.timed_section("Start Invocable Tool"):
+                retcode = self.Go()
+        finally:
+            if profile is not None:
+                profile_path = profiler.stop_profile(profile, self.GetProfileFileName())
+
         logging.log(edk2_logging.SECTION, "Summary")
         if(retcode != 0):
             logging.error("Error")
         else:
             edk2_logging.log_progress("Success")
+        if profile is not None:
+            edk2_logging.log_progress("\n".join(profiler.summarize_profile(profile_path)))
 
         logging.shutdown()
         sys.exit(retcode)
@@ -9,11 +9,12 @@
 ##
 
 import os
+import re
 import sys
 import logging
 import inspect
-import pkg_resources
 import argparse
+import threading
 from typing import Iterable, Tuple
 from edk2toolext.environment import shell_environment
 from edk2toollib.utility_functions import GetHostInfo
@@ -49,6 +50,7 @@ def GetLoggingLevel(self, loggerType: str) -> str:
         con  == Screen logging
         txt  == plain text file logging
         md   == markdown file logging
+        json == json lines file logging
         '''
         return None
 
@@ -69,22 +71,45 @@ class Edk2Invocable(BaseAbstractInvocable):
     '''
 
     @classmethod
-    def collect_python_pip_info(cls):
+    def collect_python_pip_info(cls, background=False):
         ''' Class method to collect all pip packages names and
             versions and report them to the global version_aggregator as
             well as print them to the screen.
+
+            background - collect the pip package versions in a separate thread.
+                         Reading from the version_aggregator waits for it to finish.
         '''
         # Get the current python version
         cur_py = "%d.%d.%d" % sys.version_info[:3]
         ver_agg = version_aggregator.GetVersionAggregator()
         ver_agg.ReportVersion("Python", cur_py, version_aggregator.VersionTypes.TOOL)
-        # Get a list of all the packages currently installed in pip
-        pip_packages = [p for p in pkg_resources.working_set]
-        # go through all installed pip versions
-        for package in pip_packages:
-            version = pkg_resources.get_distribution(package).version
-            logging.info("{0} version: {1}".format(package.project_name, version))
-            ver_agg.ReportVersion(package.project_name, version, version_aggregator.VersionTypes.PIP)
+        if background:
+            thread = threading.Thread(target=cls._report_pip_versions, args=(ver_agg,), daemon=True)
+            ver_agg.AddPendingReporter(thread)
+            thread.start()
+        else:
+            cls._report_pip_versions(ver_agg)
+
+    @staticmethod
+    def _report_pip_versions(ver_agg):
+        ''' report the name and version of every installed pip package '''
+        try:
+            from importlib import metadata as importlib_metadata
+            seen = set()
+            # go through all installed pip versions.  The first one found on sys.path is the one imported
+            for dist in importlib_metadata.distributions():
+                name = dist.metadata["Name"]
+                if name is None:
+                    continue
+                # use the same normalized project name that pkg_resources reported
+                name = re.sub('[^A-Za-z0-9.]+', '-', name)
+                if name.lower() in seen:
+                    continue
+                seen.add(name.lower())
+                logging.info("{0} version: {1}".format(name, dist.version))
+                ver_agg.ReportVersion(name, dist.version, version_aggregator.VersionTypes.PIP)
+        except Exception as e:
+            logging.error(f"Failed to collect pip package versions: {e}")
 
     def GetWorkspaceRoot(self) -> os.PathLike:
         ''' Use the SettingsManager to get the absolute path to the workspace root '''
@@ -122,6 +147,7 @@ def GetLoggingLevel(self, loggerType):
         con  == Screen logging
         txt  == plain text file logging
         md   == markdown file logging
+        json == json lines file logging
         '''
         try:
             level = self.PlatformSettings.GetLoggingLevel(loggerType)
@@ -232,11 +258,15 @@ def ParseCommandLineOptions(self):
                                help='Provide shell variables in a file')
         parserObj.add_argument('--verbose', '--VERBOSE', '-v', dest="verbose", action='store_true', default=False,
                                help='verbose')
+        parserObj.add_argument('--profile', dest="profile", action='store_true', default=False,
+                               help='Profile the main thread of the command with cProfile.  The profile is written '
+                               'next to the log file and a summary is logged at the end.')
 
         # setup sys.argv and argparse round 2
         sys.argv = [sys.argv[0]] + unknown_args
         args, unknown_args = parserObj.parse_known_args()
         self.Verbose = args.verbose
+        self.profile = args.profile
 
         # give the parsed args to the subclass
         self.RetrieveCommandLineOptions(args)
@@ -7,9 +7,18 @@
 # SPDX-License-Identifier: BSD-2-Clause-Patent
 ##
 import logging
+import logging.handlers
+import io
 import os
+import copy
+import json
+import time
+import contextlib
+import queue
 import shutil
 import re
+import threading
+import collections
 
 try:
     from edk2toollib.log import ansi_handler
@@ -19,10 +28,6 @@
     from edk2toollib.log import markdown_handler
 except ImportError:
     markdown_handler = None
-try:
-    from edk2toollib.log import string_handler
-except ImportError:
-    string_handler = None
 try:
     from edk2toollib.log import file_handler
 except ImportError:
@@ -86,22 +91,102 @@ def setup_section_level():
         logging.addLevelName(progress_level, "PROGRESS")
 
 
+class _BatchFileHandler(file_handler.FileHandler):
+    ''' FileHandler that doesn't flush after every record.  QueuedHandler flushes it once per batch '''
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class QueuedHandler(logging.handlers.QueueHandler):
+    ''' Logging handler that hands records to a background thread.  The thread formats the
+        records and writes them to the target handler in batches.
+
+        flush() waits until every record queued so far has been written and close() writes
+        any queued records before closing the target.  logging.shutdown closes this handler
+        before its target so nothing is lost at process exit.
+    '''
+    BATCH_SIZE = 500
+    _STOP = object()
+
+    def __init__(self, target):
+        logging.handlers.QueueHandler.__init__(self, queue.SimpleQueue())
+        self.target = target
+        self.setLevel(target.level)
+        self._thread = threading.Thread(target=self._write_records, name="QueuedHandler", daemon=True)
+        self._thread.start()
+
+    def prepare(self, record):
+        # merge the message now so later changes to the arguments aren't seen.
+        # formatting is done by the target on the background thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def _write_records(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.BATCH_SIZE and not self.queue.empty():
+                batch.append(self.queue.get())
+            stop = False
+            flushed = []
+            for item in batch:
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    flushed.append(item)
+                else:
+                    self.target.handle(item)
+            self.target.flush()
+            for event in flushed:
+                event.set()
+            if stop:
+                return
+
+    def flush(self):
+        if self._thread.is_alive():
+            event = threading.Event()
+            self.queue.put(event)
+            event.wait()
+
+    def close(self):
+        if self._thread.is_alive():
+            self.queue.put(self._STOP)
+            self._thread.join()
+            self.target.close()
+        logging.handlers.QueueHandler.close(self)
+
+
 # creates the the plaintext logger
+# use_queue moves formatting and writing of the file to a background thread
 def setup_txt_logger(directory, filename="log", logging_level=logging.INFO,
-                     formatter=None, logging_namespace='', isVerbose=False):
+                     formatter=None, logging_namespace='', isVerbose=False, use_queue=False):
     logger = logging.getLogger(logging_namespace)
     log_formatter = formatter
     if log_formatter is None:
         log_formatter = logging.Formatter("%(levelname)s - %(message)s")
 
-    if not os.path.isdir(directory):
-        os.makedirs(directory)
+    # CI worker processes can create the same package log directory at the same time
+    os.makedirs(directory, exist_ok=True)
 
     # Create file logger
     logfile_path = os.path.join(directory, filename + ".txt")
-    filelogger = file_handler.FileHandler(filename=(logfile_path), mode='w+')
+    if use_queue:
+        filelogger = _BatchFileHandler(filename=(logfile_path), mode='w+')
+    else:
+        filelogger = file_handler.FileHandler(filename=(logfile_path), mode='w+')
     filelogger.setLevel(logging_level)
     filelogger.setFormatter(log_formatter)
+    if use_queue:
+        filelogger = QueuedHandler(filelogger)
     logger.addHandler(filelogger)
 
     filelogger.addFilter(get_edk2_filter(isVerbose))
@@ -110,16 +195,16 @@ def setup_txt_logger(directory, filename="log", logging_level=logging.INFO,
 
 
 # creates the markdown logger
+# use_queue moves formatting and writing of the file to a background thread
 def setup_markdown_logger(directory, filename="log", logging_level=logging.INFO,
-                          formatter=None, logging_namespace='', isVerbose=False):
+                          formatter=None, logging_namespace='', isVerbose=False, use_queue=False):
 
     logger = logging.getLogger(logging_namespace)
     log_formatter = formatter
     if log_formatter is None:
         log_formatter = logging.Formatter("%(levelname)s - %(message)s")
 
-    if not os.path.isdir(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
 
     # add markdown handler
     markdown_filename = filename + ".md"
@@ -133,14 +218,147 @@ def setup_markdown_logger(directory, filename="log", logging_level=logging.INFO,
     if logging_level <= logging.DEBUG:
         logging_level = logging.INFO  # we don't show debugging output in markdown since it gets too full
 
+    markdownHandler.setLevel(logging_level)
+    if use_queue:
+        markdownHandler = QueuedHandler(markdownHandler)
+
     markdownHandler.addFilter(get_edk2_filter(isVerbose))
 
-    markdownHandler.setLevel(logging_level)
     logger.addHandler(markdownHandler)
 
     return markdown_path, markdownHandler
 
 
+class JsonLinesHandler(file_handler.FileHandler):
+    ''' Logging handler that writes each record as a line of json.
+
+        SECTION, SUB_SECTION and PROGRESS records also start a span.  A span ends when a record
+        of the same or a higher span level is logged or when the handler is closed.  Sections
+        started by timed_section() instead end when the with block exits and can contain other
+        sections.  Each span is written as a line with its start, end and duration once it ends.
+        Records are written when the handler is flushed or closed.
+    '''
+    SPAN_LEVELS = (PROGRESS, SUB_SECTION, SECTION)
+    # the names setup_section_level gives the span levels.  Used even if it hasn't been called
+    LEVEL_NAMES = {PROGRESS: "PROGRESS", SUB_SECTION: "SUBSECTION", SECTION: "SECTION"}
+
+    def __init__(self, filename, mode='w'):
+        file_handler.FileHandler.__init__(self, filename, mode=mode)
+        # span level: (name, logger name, start time) of the open span at that level
+        self._spans = {}
+        # (level, name, logger name, start time) of the open timed_section spans, innermost last
+        self._timed_spans = []
+
+    def _write(self, entry):
+        self.stream.write(json.dumps(entry) + self.terminator)
+
+    def _write_span(self, level, name, logger_name, start, end):
+        self._write({"type": "span", "level": self.LEVEL_NAMES.get(level, logging.getLevelName(level)), "name": name,
+                     "logger": logger_name, "start": start, "end": end, "duration": round(end - start, 6)})
+
+    def _end_spans(self, levelno, end):
+        # end the innermost spans first
+        for level in self.SPAN_LEVELS:
+            if level <= levelno and level in self._spans:
+                (name, logger_name, start) = self._spans.pop(level)
+                self._write_span(level, name, logger_name, start, end)
+
+    def _end_timed_span(self, name, end):
+        for index in range(len(self._timed_spans) - 1, -1, -1):
+            if self._timed_spans[index][1] == name:
+                (level, name, logger_name, start) = self._timed_spans.pop(index)
+                self._write_span(level, name, logger_name, start, end)
+                return
+
+    def emit(self, record):
+        try:
+            if getattr(record, "span_end", False):
+                # sections started inside the timed section end with it
+                self._end_spans(record.levelno, record.created)
+                self._end_timed_span(record.getMessage(), record.created)
+                return
+            if record.levelno in self.SPAN_LEVELS or getattr(record, "span_start", False):
+                self._end_spans(record.levelno, record.created)
+                span = (record.getMessage(), record.name, record.created)
+                if getattr(record, "span_start", False):
+                    self._timed_spans.append((record.levelno,) + span)
+                else:
+                    self._spans[record.levelno] = span
+            entry = {"type": "record", "time": record.created, "logger": record.name,
+                     "level": self.LEVEL_NAMES.get(record.levelno, record.levelname),
+                     "message": record.getMessage()}
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text:
+                entry["exception"] = record.exc_text
+            self._write(entry)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.stream is not None:
+                end = time.time()
+                self._end_spans(SECTION, end)
+                while len(self._timed_spans) > 0:
+                    self._end_timed_span(self._timed_spans[-1][1], end)
+        finally:
+            self.release()
+        file_handler.FileHandler.close(self)
+
+
+# creates the json lines logger
+# use_queue moves formatting and writing of the file to a background thread
+def setup_json_logger(directory, filename="log", logging_level=logging.INFO,
+                      logging_namespace='', isVerbose=False, use_queue=False):
+    logger = logging.getLogger(logging_namespace)
+
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = os.path.join(directory, filename + ".jsonl")
+    jsonHandler = JsonLinesHandler(json_path, mode="w")
+    jsonHandler.setLevel(logging_level)
+    if use_queue:
+        jsonHandler = QueuedHandler(jsonHandler)
+
+    jsonHandler.addFilter(get_edk2_filter(isVerbose))
+
+    logger.addHandler(jsonHandler)
+
+    return json_path, jsonHandler
+
+
+@contextlib.contextmanager
+def timed_section(name, level=SECTION, logger=None):
+    ''' context manager that logs name at level when the with block starts.  JsonLinesHandlers
+        record a span from then until the block exits.  The duration is also logged at debug level.
+    '''
+    if logger is None:
+        logger = logging.getLogger()
+    start = time.perf_counter()
+    logger.log(level, name, extra={"span_start": True})
+    try:
+        yield
+    finally:
+        logger.debug("%s finished in %.3f seconds", name, time.perf_counter() - start)
+        _end_span(logger, level, name)
+
+
+def _end_span(logger, level, name):
+    ''' send a record that ends the span at level to the JsonLinesHandlers the logger uses '''
+    record = None
+    current = logger
+    while current is not None:
+        for handler in current.handlers:
+            if isinstance(handler, JsonLinesHandler) or isinstance(getattr(handler, "target", None), JsonLinesHandler):
+                if record is None:
+                    record = logger.makeRecord(logger.name, level, "", 0, name, None, None,
+                                               extra={"span_end": True})
+                handler.handle(record)
+        current = current.parent if current.propagate else None
+
+
 # sets up a colored console logger
 def setup_console_logging(logging_level=logging.INFO, formatter=None, logging_namespace='',
                           isVerbose=False, use_azure_colors=False, use_color=True):
@@ -191,14 +409,110 @@ def stop_logging(loghandle, logging_namespace=''):
         logger.removeHandler(loghandle)
 
 
-def create_output_stream(level=logging.INFO, logging_namespace=''):
-    # creates an output stream that is in memory
-    if string_handler:
-        handler = string_handler.StringStreamHandler()
-    else:
-        handler = logging.StreamHandler()
+class OutputStreamHandler(logging.Handler):
+    ''' Logging handler that captures the formatted output so it can be read back like a file.
+
+        By default every line is kept in memory.
+        max_lines - only keep the most recent lines.  Older lines are dropped and replaced by a
+                    single line saying how many were dropped.
+        spill_size - keep up to this many characters in memory then move the output to a
+                     temporary file.  Nothing is dropped.
+
+        The read position is separate from where records are written so records logged
+        while the output is being read are appended rather than overwriting it.
+    '''
+    terminator = '\n'
+
+    def __init__(self, level=logging.INFO, max_lines=None, spill_size=None):
+        logging.Handler.__init__(self, level)
+        self.max_lines = max_lines
+        self.dropped_lines = 0
+        self._read_pos = 0
+        if max_lines is not None:
+            self._lines = collections.deque(maxlen=max_lines)
+            self.stream = io.StringIO()
+        elif spill_size is not None:
+            import tempfile
+            self._lines = None
+            self.stream = tempfile.SpooledTemporaryFile(max_size=spill_size, mode="w+", encoding="utf-8")
+        else:
+            self._lines = None
+            self.stream = io.StringIO()
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        if self._lines is not None:
+            lines = msg.splitlines(keepends=True)
+            self.dropped_lines += max(0, len(self._lines) + len(lines) - self.max_lines)
+            self._lines.extend(lines)
+        else:
+            self.stream.seek(0, io.SEEK_END)
+            self.stream.write(msg)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        ''' move the read position.  With max_lines this reads a snapshot of the lines kept so far '''
+        self.acquire()
+        try:
+            if self._lines is not None:
+                self.stream = io.StringIO()
+                if self.dropped_lines > 0:
+                    self.stream.write(f"... {self.dropped_lines} earlier lines were dropped\n")
+                self.stream.writelines(self._lines)
+            self._read_pos = self.stream.seek(offset, whence)
+            return self._read_pos
+        finally:
+            self.release()
+
+    def seek_start(self):
+        self.seek(0, io.SEEK_SET)
+
+    def seek_end(self):
+        self.seek(0, io.SEEK_END)
+
+    def readline(self):
+        self.acquire()
+        try:
+            self.stream.seek(self._read_pos, io.SEEK_SET)
+            line = self.stream.readline()
+            self._read_pos = self.stream.tell()
+            return line
+        finally:
+            self.release()
+
+    def readlines(self, hint=-1):
+        self.acquire()
+        try:
+            self.stream.seek(self._read_pos, io.SEEK_SET)
+            lines = self.stream.readlines(hint)
+            self._read_pos = self.stream.tell()
+            return lines
+        finally:
+            self.release()
+
+    def __iter__(self):
+        return iter(self.readline, "")
+
+    def close(self):
+        self.acquire()
+        try:
+            self.stream.close()
+            if self._lines is not None:
+                self._lines.clear()
+        finally:
+            self.release()
+        logging.Handler.close(self)
+
+
+# creates a handler that captures the output of the logger.  Read it back with seek and readlines.
+# max_lines keeps only the most recent lines.  spill_size moves the output to a temporary file once
+# it is larger than that many characters.  By default everything is kept in memory.
+def create_output_stream(level=logging.INFO, logging_namespace='', max_lines=None, spill_size=None):
+    handler = OutputStreamHandler(level, max_lines=max_lines, spill_size=spill_size)
     logger = logging.getLogger(logging_namespace)
-    handler.setLevel(level)
     logger.addHandler(handler)
     return handler
 
@@ -212,48 +526,110 @@ def remove_output_stream(handler, logging_namespace=''):
         logger.removeHandler(handler)
 
 
-def scan_compiler_output(output_stream):
-    # seek to the start of the output stream
-    def output_compiler_error(match, line, start_txt="Compiler"):
+# Each kind of problem found in compiler output.  The name is used as a regex group name.
+# (name, regex, logging level, start text)
+_COMPILER_PROBLEM_KINDS = [
+    ("compiler_error", r"error [A-EG-Z]?(?P<compiler_error_num>\d+):", logging.ERROR, "Compiler"),
+    ("compiler_warning", r"warning [A-Z]?(?P<compiler_warning_num>\d+):", logging.WARNING, "Compiler"),
+    ("linker_error", r"error LNK(?P<linker_error_num>\d+):", logging.ERROR, "Linker"),
+    ("edk2_error", r"error F(?P<edk2_error_num>\d+):", logging.ERROR, "EDK2"),
+    ("build_py_error", r"error (?P<build_py_error_num>\d+)E:", logging.ERROR, "Build.py"),
+]
+_compiler_problem_exp = re.compile("|".join(f"(?P<{name}>{exp})" for name, exp, _, _ in _COMPILER_PROBLEM_KINDS))
+
+
+def _scan_compiler_output_line(line):
+    ''' return a list of (level, problem) tuples found in a single line of output '''
+    line = line.strip("\n").strip()
+    # quick reject for the vast majority of lines
+    if "error" not in line and "warning" not in line:
+        return []
+    matches = {}
+    for match in _compiler_problem_exp.finditer(line):
+        # only report the first match of each kind per line.  lastgroup is the outer (kind) group
+        matches.setdefault(match.lastgroup, match)
+    problems = []
+    for name, _, level, start_txt in _COMPILER_PROBLEM_KINDS:
+        match = matches.get(name)
+        if match is None:
+            continue
         start, end = match.span()
-        source = line[:start]
-        error = line[end:]
-        num = match.group(1)
-        return f"{start_txt} #{num} from {source} {error}"
+        problems.append((level, f"{start_txt} #{match.group(name + '_num')} from {line[:start]} {line[end:]}"))
+    return problems
+
+
+def scan_compiler_output(output_stream):
+    ''' scan an output stream for compiler, linker and build problems.
+        returns a list of (level, problem) tuples
+    '''
     problems = []
+    # seek to the start of the output stream
     output_stream.seek(0, 0)
-    error_exp = re.compile(r"error [A-EG-Z]?(\d+):")
-    edk2_error_exp = re.compile(r"error F(\d+):")
-    build_py_error_exp = re.compile(r"error (\d+)E:")
-    linker_error_exp = re.compile(r"error LNK(\d+):")
-    warning_exp = re.compile(r"warning [A-Z]?(\d+):")
-    for raw_line in output_stream.readlines():
-        line = raw_line.strip("\n").strip()
-        match = error_exp.search(line)
-        if match is not None:
-            error = output_compiler_error(match, line, "Compiler")
-            problems.append((logging.ERROR, error))
-        match = warning_exp.search(line)
-        if match is not None:
-            error = output_compiler_error(match, line, "Compiler")
-            problems.append((logging.WARNING, error))
-        match = linker_error_exp.search(line)
-        if match is not None:
-            error = output_compiler_error(match, line, "Linker")
-            problems.append((logging.ERROR, error))
-        match = edk2_error_exp.search(line)
-        if match is not None:
-            error = output_compiler_error(match, line, "EDK2")
-            problems.append((logging.ERROR, error))
-        match = build_py_error_exp.search(line)
-        if match is not None:
-            error = output_compiler_error(match, line, "Build.py")
-            problems.append((logging.ERROR, error))
+    for raw_line in output_stream:
+        problems.extend(_scan_compiler_output_line(raw_line))
     return problems
 
 
+class CompilerOutputScanner(logging.Handler):
+    ''' Logging handler that scans build output for problems as it is logged.
+
+        Only a bounded ring buffer of recent lines and a bounded list of problems are kept
+        so memory use does not depend on the size of the build output.
+
+        callback - optional callable(level, problem, context) invoked as each problem is found.
+                   context is a list of the most recent lines of output before the problem.
+                   Anything the callback logs is not scanned.
+    '''
+
+    def __init__(self, level=logging.INFO, context_lines=10, max_problems=10000, callback=None):
+        logging.Handler.__init__(self, level)
+        self.context = collections.deque(maxlen=context_lines)
+        self.problems = []
+        self.max_problems = max_problems
+        self.dropped_problems = 0
+        self.callback = callback
+        self._in_callback = False
+
+    def emit(self, record):
+        if self._in_callback:
+            return
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        for line in msg.splitlines():
+            for level, problem in _scan_compiler_output_line(line):
+                if self.callback is not None:
+                    self._in_callback = True
+                    try:
+                        self.callback(level, problem, list(self.context))
+                    finally:
+                        self._in_callback = False
+                if len(self.problems) < self.max_problems:
+                    self.problems.append((level, problem))
+                else:
+                    self.dropped_problems += 1
+            self.context.append(line)
+
+    def get_problems(self):
+        ''' return a list of (level, problem) tuples found so far '''
+        problems = list(self.problems)
+        if self.dropped_problems > 0:
+            problems.append((logging.WARNING, f"{self.dropped_problems} additional problems were not recorded"))
+        return problems
+
+
+def create_compiler_output_scanner(level=logging.INFO, logging_namespace='', **kwargs):
+    ''' creates a CompilerOutputScanner attached to the logger.  Remove with remove_output_stream '''
+    handler = CompilerOutputScanner(level, **kwargs)
+    logger = logging.getLogger(logging_namespace)
+    logger.addHandler(handler)
+    return handler
+
+
 class Edk2LogFilter(logging.Filter):
-    _allowedLoggers = ["root"]
+    _allowedLoggers = {"root"}
 
     def __init__(self):
         logging.Filter.__init__(self)
@@ -266,11 +642,11 @@ def setVerbose(self, isVerbose=True):
     def addSection(self, section):
         # TODO request the global singleton?
         # how to make this class static
-        Edk2LogFilter._allowedLoggers.append(section)
+        Edk2LogFilter._allowedLoggers.add(section)
 
     def filter(self, record):
-        # check to make sure we haven't already filtered this record
-        if record.name not in Edk2LogFilter._allowedLoggers and record.levelno < logging.WARNING and not self._verbose:
+        # records at WARNING and above never need the allow-list lookup
+        if record.levelno < logging.WARNING and not self._verbose and record.name not in Edk2LogFilter._allowedLoggers:
             return False
 
         return True
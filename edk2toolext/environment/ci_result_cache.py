@@ -0,0 +1,151 @@
+# @file ci_result_cache.py
+# This module contains a local directory cache for CI build plugin results.
+# Plugins that are pure functions of a package's files and their configuration
+# can have their testcase result and log replayed instead of being run again.
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import os
+import json
+import hashlib
+import logging
+from xml.sax.saxutils import unescape
+
+
+def _unescape(text):
+    ''' undo the xml escaping done by the junit report objects '''
+    return unescape(text, {"&quot;": '"'})
+
+
+class CiResultCache(object):
+    ''' Cache of CI build plugin results stored as one json file per result in a directory.
+
+        Results are keyed by plugin name and source, target, merged plugin configuration,
+        and the content of every file in the package.
+        The least recently used results are removed when there are more than max_entries.
+    '''
+
+    def __init__(self, cache_dir, max_entries=2000):
+        self.Logger = logging.getLogger("CiResultCache")
+        self.CacheDir = os.path.abspath(cache_dir)
+        self.MaxEntries = max_entries
+        self._package_hashes = {}
+        self._file_hashes = {}
+        os.makedirs(self.CacheDir, exist_ok=True)
+
+    def _hash_file(self, path):
+        if path not in self._file_hashes:
+            with open(path, "rb") as f:
+                self._file_hashes[path] = hashlib.sha1(f.read()).hexdigest()
+        return self._file_hashes[path]
+
+    def GetPackageHash(self, abs_pkg_path):
+        ''' return a hash of the relative path and content of every file in the package.
+            This is computed once per package for the life of the object.
+        '''
+        if abs_pkg_path not in self._package_hashes:
+            h = hashlib.sha1()
+            for root, dirs, files in os.walk(abs_pkg_path):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    h.update(os.path.relpath(path, abs_pkg_path).replace("\\", "/").encode("utf-8"))
+                    h.update(self._hash_file(path).encode("utf-8"))
+            self._package_hashes[abs_pkg_path] = h.hexdigest()
+        return self._package_hashes[abs_pkg_path]
+
+    def GetKey(self, descriptor, target, plugin_config, abs_pkg_path, extra=None):
+        ''' return the cache key for running the plugin described by descriptor on a package '''
+        plugin_path = os.path.join(os.path.dirname(os.path.abspath(descriptor.descriptor["descriptor_file"])),
+                                   descriptor.Module + ".py")
+        key_data = {"name": descriptor.Name,
+                    "module": descriptor.Module,
+                    "plugin_version": self._hash_file(plugin_path),
+                    "target": target,
+                    "config": plugin_config,
+                    "package": self.GetPackageHash(abs_pkg_path),
+                    "extra": extra}
+        return hashlib.sha1(json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.CacheDir, key + ".json")
+
+    def Lookup(self, key):
+        ''' return the stored result for key or None '''
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def Store(self, key, rc, tc, output_stream=None):
+        ''' store the return code, testcase state, and the plugin log for key '''
+        log = []
+        if output_stream is not None and hasattr(output_stream, "readlines"):
+            output_stream.seek(0, 0)
+            log = [line.rstrip("\n") for line in output_stream.readlines()]
+        result = {"rc": rc,
+                  "status": tc.Status,
+                  "failure": None,
+                  "error": None,
+                  "stdout": tc.StdOut,
+                  "stderr": tc.StdErr,
+                  "log": log}
+        if tc.FailureMsg is not None:
+            result["failure"] = [_unescape(tc.FailureMsg.Type), _unescape(tc.FailureMsg.Message)]
+        if tc.ErrorMsg is not None:
+            result["error"] = [_unescape(tc.ErrorMsg.Type), _unescape(tc.ErrorMsg.Message)]
+
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(result, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.Logger.warning(f"Failed to store CI result cache entry {key}: {e}")
+
+    def Replay(self, result, tc):
+        ''' apply a stored result to the testcase and log.  returns the stored return code '''
+        logging.info("Replaying cached plugin result")
+        for line in result["log"]:
+            logging.info(line)
+        # stdout and stderr were stored already escaped
+        tc.StdOut += result["stdout"]
+        tc.StdErr += result["stderr"]
+
+        if result["failure"] is not None:
+            tc.SetFailed(result["failure"][1], result["failure"][0])
+        elif result["error"] is not None:
+            tc.SetError(result["error"][1], result["error"][0])
+        elif result["status"] == tc.SKIPPED:
+            tc.SetSkipped()
+        elif result["status"] == tc.SUCCESS:
+            tc.SetSuccess()
+        return result["rc"]
+
+    def Evict(self):
+        ''' remove the least recently used entries so at most MaxEntries remain '''
+        entries = []
+        for entry in os.scandir(self.CacheDir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                entries.append((entry.stat().st_mtime, entry.path))
+        if len(entries) <= self.MaxEntries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.MaxEntries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.Logger.debug(f"Evicted {len(entries) - self.MaxEntries} CI result cache entries")
@@ -9,7 +9,6 @@
 # SPDX-License-Identifier: BSD-2-Clause-Patent
 ##
 import os
-import yaml
 
 
 class PathEnv(object):
@@ -35,6 +34,7 @@ def __init__(self, file_path):
         self.file_path = file_path
         self.descriptor_contents = None
 
+        import yaml
         with open(file_path, 'r') as file:
             try:
                 self.descriptor_contents = yaml.safe_load(file)
@@ -13,7 +13,10 @@
 from edk2toolext.environment.external_dependency import ExternalDependency
 from edk2toollib.utility_functions import RunCmd
 from edk2toollib.utility_functions import GetHostInfo
-import pkg_resources
+try:
+    from importlib.resources import files as resource_files
+except ImportError:
+    resource_files = None  # python 3.8
 
 
 class NugetDependency(ExternalDependency):
@@ -37,9 +40,11 @@ def GetNugetCmd():
         if GetHostInfo().os == "Linux":
             cmd += ["mono"]
         # TODO Find the Nuget rom our bin file
-        requirement = pkg_resources.Requirement.parse("edk2-pytool-extensions")
-        nuget_file_path = os.path.join("edk2toolext", "bin", file)
-        nuget_path = pkg_resources.resource_filename(requirement, nuget_file_path)
+        if resource_files is not None:
+            nuget_path = str(resource_files("edk2toolext.bin").joinpath(file))
+        else:
+            import edk2toolext.bin
+            nuget_path = os.path.join(os.path.dirname(os.path.abspath(edk2toolext.bin.__file__)), file)
 
         # check if we don't have it, look for nuget in the path
         if not os.path.isfile(nuget_path):
@@ -13,7 +13,6 @@
 import logging
 import shutil
 import time
-import yaml
 from edk2toolext.environment import version_aggregator
 from edk2toollib.utility_functions import GetHostInfo
 
@@ -129,6 +128,7 @@ def verify(self):
 
         # Attempt to load the state file.
         if result:
+            import yaml
             with open(self.state_file_path, 'r') as file:
                 try:
                     state_data = yaml.safe_load(file)
@@ -151,6 +151,7 @@ def report_version(self):
                                                                 self.descriptor_location)
 
     def update_state_file(self):
+        import yaml
         with open(self.state_file_path, 'w+') as file:
             yaml.dump({'version': self.version}, file)
 
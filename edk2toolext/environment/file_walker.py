@@ -0,0 +1,91 @@
+# @file file_walker.py
+# This module contains a fast directory walker that finds files by extension.
+# It is shared by the CI build plugins and the PR evaluation invocable.
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import os
+import logging
+from collections import Counter
+
+_walk_cache = {}
+
+
+def clear_walk_cache():
+    ''' forget all cached walk results '''
+    _walk_cache.clear()
+
+
+def _scan(directory, ignore_dirs):
+    ''' yield a DirEntry for every file under directory in the same order as os.walk '''
+    pending = [directory]
+    while len(pending) > 0:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                yield entry
+            elif not entry.is_symlink() and (ignore_dirs is None or entry.name.lower() not in ignore_dirs):
+                subdirs.append(entry.path)
+        # reversed so sub directories are visited in listing order
+        pending.extend(reversed(subdirs))
+
+
+def walk_dir_for_extensions(extensionlist, directory, ignorelist=None, ignore_dirs=None, use_cache=False):
+    ''' Walks a directory recursively for all files ending in one of the extensions (case insensitive)
+
+        extensionlist - list of extensions.  Example: [".inf", ".dec"]
+        directory - absolute path of the directory to walk
+        ignorelist - optional list of case insensitive file name prefixes to ignore
+        ignore_dirs - optional list of case insensitive directory names to not walk into
+        use_cache - return the result of a previous identical call instead of walking again
+
+        returns a list of paths in os.walk order.  A file is listed once for each extension it matches.
+    '''
+    cache_key = None
+    if use_cache:
+        cache_key = (os.path.abspath(directory), tuple(extensionlist), tuple(ignorelist or ()),
+                     tuple(ignore_dirs or ()))
+        if cache_key in _walk_cache:
+            return list(_walk_cache[cache_key])
+
+    extension_counts = Counter(e.lower() for e in extensionlist)
+    # extensions like ".c" can be matched with a lookup on the text after the last dot.
+    # anything else falls back to a suffix match.
+    simple = all(e.startswith(".") and e.count(".") == 1 for e in extension_counts)
+    suffixes = tuple(extension_counts.keys())
+    ignore_prefixes = tuple(i.lower() for i in ignorelist) if ignorelist is not None else ()
+    ignore_dir_names = {d.lower() for d in ignore_dirs} if ignore_dirs is not None else None
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+    returnlist = []
+    for entry in _scan(directory, ignore_dir_names):
+        name = entry.name.lower()
+        if simple:
+            dot = name.rfind(".")
+            count = extension_counts.get(name[dot:], 0) if dot >= 0 else 0
+        elif name.endswith(suffixes):
+            count = sum(extension_counts[e] for e in suffixes if name.endswith(e))
+        else:
+            count = 0
+        if count == 0 or (ignore_prefixes and name.startswith(ignore_prefixes)):
+            continue
+        if debug:
+            logging.debug(entry.path)
+        returnlist.extend([entry.path] * count)
+
+    if cache_key is not None:
+        _walk_cache[cache_key] = list(returnlist)
+    return returnlist
@@ -0,0 +1,111 @@
+# @file package_model.py
+# This module contains a shared, per run model of the files in an edk2 package.
+# CI build plugins commonly walk the same package and parse the same DEC, INF and
+# DSC files.  The model does one directory scan per package and memoizes parse
+# results so the cost is paid once no matter how many plugins use them.
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import os
+import logging
+
+
+class PackageModel(object):
+    ''' Model of a single package.  The directory is scanned on first use.
+
+        Parsers returned by this object are shared between plugins and must be treated as read only.
+    '''
+
+    def __init__(self, abs_pkg_path, workspace=None, packages_path=None):
+        self.Logger = logging.getLogger("PackageModel")
+        self.PackagePath = os.path.abspath(abs_pkg_path)
+        self.WorkspacePath = workspace
+        self.PackagesPath = list(packages_path) if packages_path is not None else []
+        self._files = None
+        self._files_by_extension = None
+        self._parsers = {}
+
+    def _scan(self):
+        if self._files is not None:
+            return
+        self._files = []
+        self._files_by_extension = {}
+        for root, dirs, files in os.walk(self.PackagePath):
+            for name in files:
+                path = os.path.join(root, name)
+                self._files.append(path)
+                ext = os.path.splitext(name)[1].lower()
+                self._files_by_extension.setdefault(ext, []).append(path)
+        self.Logger.debug(f"Scanned {len(self._files)} files in {self.PackagePath}")
+
+    def GetAllFiles(self):
+        ''' return a list of the absolute path of every file in the package '''
+        self._scan()
+        return list(self._files)
+
+    def GetFilesWithExtension(self, extensionlist):
+        ''' return a list of absolute paths to files with one of the extensions (case insensitive)
+            Extensions include the leading dot.  Example: [".inf", ".dec"]
+        '''
+        self._scan()
+        found = []
+        for ext in dict.fromkeys(e.lower() for e in extensionlist):
+            found.extend(self._files_by_extension.get(ext, []))
+        return found
+
+    def _configure(self, parser):
+        if self.WorkspacePath is not None:
+            parser.SetBaseAbsPath(self.WorkspacePath)
+            parser.SetPackagePaths(self.PackagesPath)
+        return parser
+
+    def _get_parser(self, key, factory, path):
+        path = os.path.abspath(path)
+        key = (key, path)
+        if key not in self._parsers:
+            parser = factory()
+            parser.ParseFile(path)
+            self._parsers[key] = parser
+        return self._parsers[key]
+
+    def GetDecParser(self, path):
+        ''' return a parsed DecParser for the dec file at path '''
+        from edk2toollib.uefi.edk2.parsers.dec_parser import DecParser
+        return self._get_parser("dec", lambda: self._configure(DecParser()), path)
+
+    def GetInfParser(self, path):
+        ''' return a parsed InfParser for the inf file at path '''
+        from edk2toollib.uefi.edk2.parsers.inf_parser import InfParser
+        return self._get_parser("inf", lambda: self._configure(InfParser()), path)
+
+    def GetDscParser(self, path, input_vars=None):
+        ''' return a parsed DscParser for the dsc file at path using the optional dictionary of input_vars '''
+        from edk2toollib.uefi.edk2.parsers.dsc_parser import DscParser
+        input_vars = dict(input_vars) if input_vars is not None else {}
+
+        def factory():
+            parser = self._configure(DscParser())
+            parser.SetInputVars(input_vars)
+            return parser
+        return self._get_parser(("dsc", tuple(sorted(input_vars.items()))), factory, path)
+
+
+class PackageModelService(object):
+    ''' Hands out one PackageModel per package for the life of a run '''
+
+    def __init__(self):
+        self._models = {}
+
+    def GetPackageModel(self, abs_pkg_path, workspace=None, packages_path=None):
+        ''' return the shared PackageModel for the package at abs_pkg_path '''
+        key = os.path.normcase(os.path.abspath(abs_pkg_path))
+        if key not in self._models:
+            self._models[key] = PackageModel(abs_pkg_path, workspace, packages_path)
+        return self._models[key]
+
+    def Clear(self):
+        ''' forget all models so the next request rescans the packages '''
+        self._models = {}
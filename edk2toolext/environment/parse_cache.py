@@ -0,0 +1,137 @@
+# @file parse_cache.py
+# This module contains a small on-disk cache for the results of parsing
+# edk2 build files (target.txt, tools_def.txt, DSC, FDF).
+# Results are keyed by the caller and validated against the content
+# hash of every file that contributed to the result.
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import os
+import json
+import hashlib
+import logging
+
+
+def hash_file(path):
+    ''' return the sha1 hex digest of the file contents or None if it can't be read '''
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def hash_object(obj):
+    ''' return a stable sha1 hex digest for a json serializable object '''
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_include_files(parser, filepath):
+    ''' Find all files pulled in with !include from filepath (recursively)
+        using an already configured and parsed edk2toollib parser to resolve macros and paths.
+
+        returns a list of absolute paths or None if an include couldn't be resolved.
+    '''
+    found = []
+    pending = [filepath]
+    while len(pending) > 0:
+        current = pending.pop()
+        try:
+            with open(current, "r") as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+        for line in lines:
+            stripped = line.strip()
+            if not stripped.lower().startswith("!include"):
+                continue
+            try:
+                tokens = parser.ReplaceVariables(stripped).split()
+                path = parser.FindPath(tokens[1]) if len(tokens) > 1 else None
+            except Exception:
+                path = None
+            if path is None:
+                return None
+            path = os.path.abspath(path)
+            if path not in found:
+                found.append(path)
+                pending.append(path)
+    return found
+
+
+class ParseCache(object):
+    ''' Cache of parse results stored as a json file.
+
+        Each entry is stored under a caller provided key and records the hash
+        of every file used to produce the result.  A lookup only hits if all
+        of those files are unchanged.
+    '''
+    MAX_ENTRIES = 64
+
+    def __init__(self, cache_file_path, max_entries=MAX_ENTRIES):
+        self.Logger = logging.getLogger("ParseCache")
+        self.CacheFilePath = cache_file_path
+        self.MaxEntries = max_entries
+        self._entries = None
+        self._dirty = False
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not os.path.isfile(self.CacheFilePath):
+            return
+        try:
+            with open(self.CacheFilePath, "r") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self.Logger.debug(f"Ignoring unreadable parse cache {self.CacheFilePath}")
+            self._entries = {}
+
+    def Lookup(self, key):
+        ''' return the cached result for key or None if missing or stale '''
+        self._load()
+        entry = self._entries.get(key)
+        if entry is None:
+            self.Logger.debug(f"Parse cache miss: {key}")
+            return None
+        for path, digest in entry["files"].items():
+            if hash_file(path) != digest:
+                self.Logger.debug(f"Parse cache stale: {key} due to {path}")
+                return None
+        self.Logger.debug(f"Parse cache hit: {key}")
+        return entry["result"]
+
+    def Store(self, key, files, result):
+        ''' store a json serializable result for key that depends on the list of files '''
+        self._load()
+        hashes = {}
+        for path in files:
+            digest = hash_file(path)
+            if digest is None:
+                self.Logger.debug(f"Not caching {key}. Unable to hash {path}")
+                return
+            hashes[os.path.abspath(path)] = digest
+        # re-insert so the dict order tracks the most recent use
+        self._entries.pop(key, None)
+        self._entries[key] = {"files": hashes, "result": result}
+        while len(self._entries) > self.MaxEntries:
+            self._entries.pop(next(iter(self._entries)))
+        self._dirty = True
+
+    def Save(self):
+        ''' write the cache to disk if it changed '''
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.CacheFilePath), exist_ok=True)
+            temp_path = self.CacheFilePath + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.CacheFilePath)
+            self._dirty = False
+        except OSError as e:
+            self.Logger.warning(f"Failed to write parse cache {self.CacheFilePath}: {e}")
@@ -8,9 +8,16 @@
 
 import sys
 import os
-import imp
+import ast
+import time
 import logging
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from edk2toolext.environment import shell_environment
+from edk2toolext.environment.package_model import PackageModelService
+
+# Names of the plugin interface classes in edk2toolext.environment.plugintypes
+PLUGIN_INTERFACES = ("IUefiBuildPlugin", "ICiBuildPlugin", "IUefiHelperPlugin", "IDscProcessorPlugin")
 
 
 class PluginDescriptor(object):
@@ -23,70 +30,212 @@ def __init__(self, t):
     def __str__(self):
         return "PLUGIN DESCRIPTOR:{0}".format(self.Name)
 
+    def GetModulePath(self):
+        ''' return the absolute path of the python file of the plugin '''
+        return os.path.join(os.path.dirname(os.path.abspath(self.descriptor["descriptor_file"])), self.Module + ".py")
+
+    def GetDeclaredInterfaces(self):
+        ''' return the set of plugin interface names the plugin class derives from without importing it.
+            Returns None when that can't be determined from the source, for example when the plugin
+            derives from another plugin class.
+        '''
+        try:
+            with open(self.GetModulePath(), "rb") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            return None
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name == self.Module:
+                names = set()
+                for base in node.bases:
+                    if isinstance(base, ast.Name):
+                        names.add(base.id)
+                    elif isinstance(base, ast.Attribute):
+                        names.add(base.attr)
+                    else:
+                        return None
+                if not names.issubset(PLUGIN_INTERFACES):
+                    return None
+                return names
+        return None
+
 
 class PluginManager(object):
 
     def __init__(self):
+        # plugins that have been imported and instantiated
         self.Descriptors = []
+        self.PackageModels = PackageModelService()
+        # plugins that have not been imported yet.  Maps PluginDescriptor to its declared interface names.
+        self._pending = {}
+        # position of each plugin in the Environment Descriptor list so plugins stay in that order
+        self._order = {}
+        # GetPluginsOfClass results by class
+        self._class_index = {}
 
     #
     # Pass tuple of Environment Descriptor dictionaries to be loaded as plugins
+    # classes is an optional list of plugin interface classes to load now.  Plugins that only
+    # implement other interfaces are imported the first time GetPluginsOfClass asks for them.
+    # Plugins whose interfaces can't be read from the source, including source that doesn't
+    # parse, are loaded now so their failures are reported here.
+    # Returns the list of Environment Descriptor dictionaries that failed to load.
     #
-    def SetListOfEnvironmentDescriptors(self, newlist):
+    def SetListOfEnvironmentDescriptors(self, newlist, classes=None):
         env = shell_environment.GetBuildVars()
-        failed = []
         if newlist is None:
             return []
+        requested = None if classes is None else {c.__name__ for c in classes}
+        load_now = []
         for a in newlist:
             b = PluginDescriptor(a)
-            if(self._load(b) == 0):
-                val = env.GetValue(b.Module.upper())
-                if val and val == "skip":
-                    logging.info(f"{b.Module} turned off by environment variable")
-                    continue
-                self.Descriptors.append(b)
+            val = env.GetValue(b.Module.upper())
+            if val and val == "skip":
+                logging.info(f"{b.Module} turned off by environment variable")
+                continue
+            self._order[b] = len(self._order)
+            interfaces = None if requested is None else b.GetDeclaredInterfaces()
+            if interfaces is None or not interfaces.isdisjoint(requested):
+                load_now.append(b)
             else:
-                failed.append(a)
-        return failed
+                logging.debug("Deferring Plugin %s until it is requested", b.Name)
+                self._pending[b] = interfaces
+        return [b.descriptor for b in self._load_all(load_now)]
+
+    #
+    # Return the Environment Descriptor dictionaries of the loaded and not yet loaded plugins
+    #
+    def GetEnvironmentDescriptors(self):
+        plugins = sorted(self.Descriptors + list(self._pending.keys()), key=self._position)
+        return [d.descriptor for d in plugins]
 
     #
     # Return List of all plugins of a given class
     #
     def GetPluginsOfClass(self, classobj):
-        temp = []
-        for a in self.Descriptors:
-            if(isinstance(a.Obj, classobj)):
-                temp.append(a)
-        return temp
+        if classobj not in self._class_index:
+            if classobj.__name__ in PLUGIN_INTERFACES:
+                needed = [d for (d, interfaces) in self._pending.items() if classobj.__name__ in interfaces]
+            else:
+                needed = list(self._pending.keys())
+            self._load_pending(needed)
+            self._class_index[classobj] = [a for a in self.Descriptors if isinstance(a.Obj, classobj)]
+        return list(self._class_index[classobj])
 
     #
     # Return List of all plugins
     #
     def GetAllPlugins(self):
+        self._load_pending(list(self._pending.keys()))
         return self.Descriptors
 
     #
-    # Load and Instantiate the plugin
+    # Import and instantiate plugins that were deferred.  Plugins that fail to load are logged
+    # and left out of the list of plugins.
     #
-    def _load(self, PluginDescriptor):
-        PluginDescriptor.Obj = None
-        PythonFileName = PluginDescriptor.descriptor["module"] + ".py"
-        PyModulePath = os.path.join(os.path.dirname(os.path.abspath(
-            PluginDescriptor.descriptor["descriptor_file"])), PythonFileName)
+    def _load_pending(self, descriptors):
+        if len(descriptors) == 0:
+            return
+        for d in descriptors:
+            del self._pending[d]
+        failed = self._load_all(descriptors)
+        if failed:
+            logging.critical("One or more plugins failed to load.")
+            for d in failed:
+                logging.error("Failed Plugin: {0}".format(d.Name))
+
+    def _position(self, descriptor):
+        return self._order.get(descriptor, len(self._order))
+
+    #
+    # Import and instantiate the plugins.  Plugins that load are added to the list of plugins.
+    # Returns the list of PluginDescriptors that failed to load.
+    #
+    def _load_all(self, descriptors):
+        modules = self._import_all(descriptors)
+        failed = []
+        for d in descriptors:
+            if self._instantiate(d, modules[id(d)]) == 0:
+                self.Descriptors.append(d)
+            else:
+                failed.append(d)
+        self.Descriptors.sort(key=self._position)
+        self._class_index = {}
+        return failed
+
+    #
+    # Return the PackageModel shared by all plugins for a package.
+    # package is the edk2 relative path to the package and Edk2pathObj is the Edk2Path for the workspace
+    #
+    def GetPackageModel(self, package, Edk2pathObj):
+        abs_pkg_path = Edk2pathObj.GetAbsolutePathOnThisSytemFromEdk2RelativePath(package)
+        if abs_pkg_path is None:
+            return None
+        return self.PackageModels.GetPackageModel(abs_pkg_path, Edk2pathObj.WorkspacePath,
+                                                  Edk2pathObj.PackagePathList)
+
+    #
+    # Import the python module of every plugin.  Modules are imported in parallel.
+    # Descriptors that share a module name are imported in order on the same thread
+    # as they replace each other in sys.modules.
+    # Returns a dictionary of id(PluginDescriptor): module or None if the import failed
+    #
+    def _import_all(self, descriptors):
+        groups = {}
+        for d in descriptors:
+            groups.setdefault(d.Module, []).append(d)
+
+        def import_group(group):
+            return [(id(d), self._import(d)) for d in group]
+
+        start = time.perf_counter()
+        if len(groups) <= 1:
+            results = [import_group(g) for g in groups.values()]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(groups), os.cpu_count() or 1)) as executor:
+                results = list(executor.map(import_group, groups.values()))
+        logging.debug("Imported %d Plugins in %.3f seconds", len(descriptors), time.perf_counter() - start)
+        return {key: module for group in results for (key, module) in group}
+
+    #
+    # Import the python module of the plugin.  Returns the module or None on failure.
+    #
+    def _import(self, PluginDescriptor):
+        PyModulePath = PluginDescriptor.GetModulePath()
+        ModuleName = "UefiBuild_Plugin_" + PluginDescriptor.descriptor["module"]
         logging.debug("Loading Plugin from %s", PyModulePath)
+        start = time.perf_counter()
         try:
-            with open(PyModulePath, "r") as plugin_file:
-                _module = imp.load_module(
-                    "UefiBuild_Plugin_" + PluginDescriptor.descriptor["module"],
-                    plugin_file,
-                    PyModulePath,
-                    ("py", "r", imp.PY_SOURCE))
+            # importlib writes and reuses the __pycache__ bytecode for the plugin
+            spec = importlib.util.spec_from_file_location(ModuleName, PyModulePath)
+            _module = importlib.util.module_from_spec(spec)
+            sys.modules[ModuleName] = _module
+            spec.loader.exec_module(_module)
 
         except Exception:
+            sys.modules.pop(ModuleName, None)
             exc_info = sys.exc_info()
             logging.error("Failed to import plugin: %s",
                           PyModulePath, exc_info=exc_info)
+            return None
+
+        logging.debug("Imported Plugin %s in %.3f seconds", PluginDescriptor.Name, time.perf_counter() - start)
+        return _module
+
+    #
+    # Load and Instantiate the plugin
+    #
+    def _load(self, PluginDescriptor):
+        return self._instantiate(PluginDescriptor, self._import(PluginDescriptor))
+
+    #
+    # Instantiate the plugin from its imported module
+    #
+    def _instantiate(self, PluginDescriptor, _module):
+        PluginDescriptor.Obj = None
+        if _module is None:
             return -1
+        PyModulePath = _module.__file__
 
         # Instantiate the plugin
         try:
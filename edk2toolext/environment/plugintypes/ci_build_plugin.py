@@ -10,6 +10,7 @@
 import os
 import logging
 from typing import List, Tuple
+from edk2toolext.environment import file_walker
 
 
 class ICiBuildPlugin(object):
@@ -21,7 +22,8 @@ class ICiBuildPlugin(object):
     #   - edk2path object configured with workspace and packages path
     #   - PkgConfig Object (dict) for the pkg
     #   - EnvConfig Object
-    #   - Plugin Manager Instance
+    #   - Plugin Manager Instance.  PLM.GetPackageModel(packagename, Edk2pathObj) returns a shared
+    #     model of the package with the file list and parsed DEC/INF/DSC files.
     #   - Plugin Helper Obj Instance
     #   - tc - test case that needs state configured for reporting by plugin.
     #   - output_stream the StringIO output stream from this plugin via logging
@@ -60,13 +62,31 @@ def RunsOnTargetList(self) -> List[str]:
         '''
         return ["NO-TARGET"]
 
+    def IsParallelSafe(self) -> bool:
+        ''' Returns True if this plugin can run in a worker process at the same time as
+            other plugins and packages.  Plugins that share state across packages or
+            use global resources (like the edk2 build) should return False.
+
+            Parallel safe plugins run in a separate process with a copy of the environment
+            so any changes they make to the environment are not seen by other plugins.
+        '''
+        return False
+
+    def IsResultCacheable(self) -> bool:
+        ''' Returns True if the result of this plugin only depends on the files in the package
+            and the plugin configuration.  When stuart_ci_build is run with a result cache the
+            stored result and log of a cacheable plugin are replayed instead of running it again.
+        '''
+        return False
+
     def WalkDirectoryForExtension(self, extensionlist: List[str], directory: os.PathLike,
-                                  ignorelist: List[str] = None) -> List[os.PathLike]:
+                                  ignorelist: List[str] = None, use_cache: bool = False) -> List[os.PathLike]:
         ''' Walks a file directory recursively for all items ending in certain extension
 
             @extensionlist: List[str] list of file extensions
             @directory: Path - absolute path to directory to start looking
             @ignorelist: List[str] or None.  optional - default is None: a list of case insensitive filenames to ignore
+            @use_cache: bool.  optional - default is False: reuse the result of an identical earlier walk in this run
 
             @returns a List of file paths to matching files
         '''
@@ -91,27 +111,4 @@ def WalkDirectoryForExtension(self, extensionlist: List[str], directory: os.Path
                 logging.critical("Expected list but got " + str(type(ignorelist)))
                 raise TypeError("ignorelist must be a list")
 
-            ignorelist_lower = list()
-            for item in ignorelist:
-                ignorelist_lower.append(item.lower())
-
-        extensionlist_lower = list()
-        for item in extensionlist:
-            extensionlist_lower.append(item.lower())
-
-        returnlist = list()
-        for Root, Dirs, Files in os.walk(directory):
-            for File in Files:
-                for Extension in extensionlist_lower:
-                    if File.lower().endswith(Extension):
-                        ignoreIt = False
-                        if(ignorelist is not None):
-                            for c in ignorelist_lower:
-                                if(File.lower().startswith(c)):
-                                    ignoreIt = True
-                                    break
-                        if not ignoreIt:
-                            logging.debug(os.path.join(Root, File))
-                            returnlist.append(os.path.join(Root, File))
-
-        return returnlist
+        return file_walker.walk_dir_for_extensions(extensionlist, directory, ignorelist, use_cache=use_cache)
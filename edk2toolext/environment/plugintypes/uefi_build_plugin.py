@@ -31,3 +31,19 @@ def do_pre_build(self, thebuilder):
         Run Pre build Operation
         '''
         return 0
+
+    ##
+    # Return True if this plugin can run on a separate thread at the same time as other
+    # parallel safe plugins.  The builder and its environment are shared between threads
+    # so a parallel safe plugin must not change values that other plugins read.
+    # Plugins that are not parallel safe run alone, after every plugin before them.
+    ##
+    def IsParallelSafe(self):
+        return False
+
+    ##
+    # Return a list of the module names of plugins that must finish their pre and post
+    # build steps before this plugin starts.  Plugins that are not loaded are ignored.
+    ##
+    def RunsAfter(self):
+        return []
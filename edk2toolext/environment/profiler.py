@@ -0,0 +1,77 @@
+# @file profiler.py
+# This module contains helpers to profile a stuart command with cProfile
+# and summarize where the time went.
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import os
+
+
+def _is_run_cmd(func):
+    ''' return True if the pstats function key is edk2toollib's RunCmd '''
+    return func[2] == "RunCmd" and os.path.basename(func[0]) == "utility_functions.py"
+
+
+def _is_popen_wait(func):
+    ''' return True if the pstats function key is subprocess.Popen.wait '''
+    return func[2] == "wait" and os.path.basename(func[0]) == "subprocess.py"
+
+
+def start_profile():
+    ''' start profiling the calling thread.  Returns the profile to pass to stop_profile '''
+    import cProfile
+    profile = cProfile.Profile()
+    profile.enable()
+    return profile
+
+
+def stop_profile(profile, path):
+    ''' stop the profile and write it to path in the pstats format.  Returns path '''
+    profile.disable()
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    profile.dump_stats(path)
+    return path
+
+
+def summarize_profile(path, count=20):
+    ''' return a list of lines summarizing the profile written to path.
+
+        Lists the count functions with the highest cumulative time then the time spent in
+        RunCmd and how much of that was waiting for the child processes to finish.  Only the
+        thread that started the profile is profiled so work done on other threads or in worker
+        processes (such as parallel builds) only shows up as the time spent waiting for it.
+    '''
+    import pstats
+    stats = pstats.Stats(path)
+    lines = [f"Profile written to {path}",
+             "Only the main thread was profiled.  Work on other threads and worker processes is not included.",
+             f"Top {count} functions by cumulative time:",
+             f"{'cumtime':>10} {'tottime':>10} {'calls':>10}  function"]
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    for (func, (_, calls, tottime, cumtime, _)) in entries[:count]:
+        lines.append(f"{cumtime:10.3f} {tottime:10.3f} {calls:>10}  {pstats.func_std_string(func)}")
+
+    run_cmd_calls = 0
+    run_cmd_time = 0.0
+    for (func, (_, calls, _, cumtime, _)) in stats.stats.items():
+        if _is_run_cmd(func):
+            run_cmd_calls += calls
+            run_cmd_time += cumtime
+    # the time Popen.wait was called from RunCmd is the time spent waiting for the child process
+    wait_time = 0.0
+    for (func, (_, _, _, _, callers)) in stats.stats.items():
+        if _is_popen_wait(func):
+            wait_time += sum(edge[3] for (caller, edge) in callers.items() if _is_run_cmd(caller))
+    if run_cmd_calls == 0:
+        lines.append("RunCmd: not called on the main thread")
+    else:
+        lines.append(f"RunCmd: {run_cmd_calls} calls on the main thread in {run_cmd_time:.3f} seconds, "
+                     f"{wait_time:.3f} seconds waiting on child processes")
+    lines.append(f"Total: {stats.total_tt:.3f} seconds, {stats.total_tt - wait_time:.3f} seconds not waiting "
+                 "on RunCmd child processes")
+    return lines
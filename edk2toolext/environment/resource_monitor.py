@@ -0,0 +1,99 @@
+# @file resource_monitor.py
+# This module contains a context manager that measures the time and
+# resources used by a block of code such as a single build plugin.
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import sys
+import time
+import threading
+
+try:
+    import resource
+except ImportError:
+    resource = None  # not available on Windows
+
+_subprocess_count = 0
+_subprocess_lock = threading.Lock()
+_audit_hook_installed = False
+
+
+def _subprocess_audit_hook(event, args):
+    global _subprocess_count
+    if event == "subprocess.Popen":
+        with _subprocess_lock:
+            _subprocess_count += 1
+
+
+def get_subprocess_count():
+    ''' return the number of subprocesses started by this process since counting began '''
+    global _audit_hook_installed
+    if not _audit_hook_installed:
+        # audit hooks can't be removed so only ever install one
+        sys.addaudithook(_subprocess_audit_hook)
+        _audit_hook_installed = True
+    return _subprocess_count
+
+
+def get_peak_rss_kb():
+    ''' return the peak resident set size in KB of this process so far, or None if unknown '''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak = peak // 1024  # reported in bytes on macOS
+    return peak
+
+
+def _get_cpu_time():
+    ''' return the cpu time used by this process and its finished children '''
+    cpu_time = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu_time += children.ru_utime + children.ru_stime
+    return cpu_time
+
+
+class ResourceMonitor(object):
+    ''' Context manager that measures the resources used while it is active.
+
+        The operating system only reports cpu time and memory for the whole process so the
+        measurements include any other threads running at the same time.
+
+        wall_time - elapsed seconds
+        cpu_time - cpu seconds used by this process and any subprocesses that finished
+        peak_rss_growth_kb - how much the peak memory of this process grew (None if unknown)
+        subprocess_count - number of subprocesses started
+    '''
+
+    def __init__(self):
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_rss_growth_kb = None
+        self.subprocess_count = 0
+
+    def __enter__(self):
+        self._start_subprocess_count = get_subprocess_count()
+        self._start_peak_rss = get_peak_rss_kb()
+        self._start_cpu = _get_cpu_time()
+        self._start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall_time = time.perf_counter() - self._start_wall
+        self.cpu_time = _get_cpu_time() - self._start_cpu
+        self.subprocess_count = get_subprocess_count() - self._start_subprocess_count
+        if self._start_peak_rss is not None:
+            # the peak only ever grows so this is how far the block pushed it past the earlier peak
+            self.peak_rss_growth_kb = get_peak_rss_kb() - self._start_peak_rss
+        return False
+
+    def ToDict(self):
+        ''' return the measurements as a json serializable dictionary '''
+        return {"wall_time": round(self.wall_time, 3),
+                "cpu_time": round(self.cpu_time, 3),
+                "peak_rss_growth_kb": self.peak_rss_growth_kb,
+                "subprocess_count": self.subprocess_count}
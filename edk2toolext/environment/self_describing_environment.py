@@ -12,7 +12,6 @@
 from edk2toolext.environment import shell_environment
 from edk2toolext.environment import environment_descriptor_files as EDF
 from edk2toolext.environment import external_dependency
-from multiprocessing import dummy
 import time
 
 
@@ -243,6 +242,7 @@ def update_extdep(self, extdep):
         # don't create more threads than needed
         num_threads = min(os.cpu_count(), num_extdeps)
         # create a pool
+        from multiprocessing import dummy
         pool = dummy.Pool(num_threads)
         logging.debug(f"Creating {num_threads} threads for the SDE update")
         # map the task to the data
@@ -0,0 +1,74 @@
+# @file tools_def.py
+# This module contains a targeted lookup for values in an edk2 tools_def.txt file.
+# tools_def.txt files are thousands of lines long and the build process normally
+# only needs a few values for the active TOOL_CHAIN_TAG so this scans the file
+# line by line and stops as soon as all requested keys have been found.
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+
+import os
+import logging
+
+# Attributes of a tool chain that are commonly needed outside of the edk2 build
+COMMON_TOOL_CHAIN_ATTRIBUTES = ("*_FAMILY", "*_BUILDRULEFAMILY", "MAKE_PATH", "CC_PATH", "DLINK_PATH")
+
+_lookup_cache = {}
+
+
+def get_tools_def_values(tools_def_path, keys):
+    ''' Get the values for a list of fully qualified tools_def keys.
+        Example key: *_VS2019_*_*_FAMILY
+
+        The file is scanned until the first definition of every key is found.
+        Results are memoized per file modification time.
+
+        returns a dictionary of key: value for every key that was found
+    '''
+    keys = tuple(keys)
+    st = os.stat(tools_def_path)
+    memo_key = (os.path.abspath(tools_def_path), st.st_mtime_ns, st.st_size, keys)
+    if memo_key in _lookup_cache:
+        return dict(_lookup_cache[memo_key])
+
+    logging.debug("Scanning tools_def.txt file for: " + ", ".join(keys))
+    remaining = set(keys)
+    found = {}
+    with open(tools_def_path, "r") as f:
+        for line in f:
+            stripped = line.lstrip()
+            # cheap prefix check so only candidate lines get fully processed
+            if not stripped.startswith(keys):
+                continue
+            stripped = stripped.split("#", 1)[0]
+            if stripped.count("=") != 1:
+                continue
+            key, value = (token.strip() for token in stripped.split("=", 1))
+            if key in remaining:
+                found[key] = value
+                remaining.remove(key)
+                if len(remaining) == 0:
+                    break
+
+    _lookup_cache[memo_key] = found
+    return dict(found)
+
+
+def get_tool_chain_values(tools_def_path, tool_chain_tag, attributes=COMMON_TOOL_CHAIN_ATTRIBUTES,
+                          target="*", arch="*"):
+    ''' Get the values of attributes for a tool chain tag.
+        The tools_def key format is TARGET_TOOLCHAIN_ARCH_COMMANDTYPE_ATTRIBUTE and
+        attributes are given as COMMANDTYPE_ATTRIBUTE.  Example: *_FAMILY or CC_PATH
+
+        returns a dictionary of attribute: value for every attribute that was found
+    '''
+    full_keys = {f"{target}_{tool_chain_tag}_{arch}_{attribute}": attribute for attribute in attributes}
+    values = get_tools_def_values(tools_def_path, full_keys.keys())
+    return {full_keys[k]: v for k, v in values.items()}
+
+
+def get_tool_chain_family(tools_def_path, tool_chain_tag, default="UNKNOWN"):
+    ''' return the tool chain family for a tool chain tag (*_<TAG>_*_*_FAMILY) '''
+    return get_tool_chain_values(tools_def_path, tool_chain_tag, ["*_FAMILY"]).get("*_FAMILY", default)
@@ -11,19 +11,40 @@
 
 import os
 import logging
+import importlib
 from edk2toolext.environment.multiple_workspace import MultipleWorkspace
 from edk2toolext.environment import conf_mgmt
+from edk2toolext.environment import tools_def
+from edk2toolext.environment.parse_cache import ParseCache, hash_object, get_include_files
 import traceback
 import shutil
 import time
 from edk2toolext.environment import shell_environment
-from edk2toollib.uefi.edk2.parsers.targettxt_parser import TargetTxtParser
-from edk2toollib.uefi.edk2.parsers.dsc_parser import DscParser
-from edk2toollib.uefi.edk2.parsers.fdf_parser import FdfParser
 from edk2toollib.utility_functions import RunCmd
 from edk2toolext import edk2_logging
 from edk2toolext.environment.plugintypes.uefi_build_plugin import IUefiBuildPlugin
 import datetime
+import json
+
+
+# edk2toollib parsers that are only imported the first time they are used.  They can still be
+# imported from (and patched in) this module.
+_LAZY_IMPORTS = {"TargetTxtParser": "edk2toollib.uefi.edk2.parsers.targettxt_parser",
+                 "DscParser": "edk2toollib.uefi.edk2.parsers.dsc_parser",
+                 "FdfParser": "edk2toollib.uefi.edk2.parsers.fdf_parser"}
+
+
+def _lazy_import(name):
+    ''' return a name from _LAZY_IMPORTS, importing its module the first time it's used '''
+    if name not in globals():
+        globals()[name] = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    return globals()[name]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return _lazy_import(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class UefiBuilder(object):
@@ -38,6 +59,11 @@ def __init__(self):
         self.Clean = False
         self.UpdateConf = False
         self.OutputConfig = None
+        self.OutputConfigFormat = "text"
+        self.ForceParse = False
+        self.parse_cache = None  # set in Go.  Nothing is cached without it
+        self.BuildTargetList = None
+        self.BuildToolChainList = None
 
     def AddPlatformCommandLineOptions(self, parserObj):
         ''' adds command line options to the argparser '''
@@ -63,10 +89,32 @@ def AddPlatformCommandLineOptions(self, parserObj):
         parserObj.add_argument("--OUTPUTCONFIG", "--outputconfig", "--OutputConfig",
                                dest='OutputConfig', required=False, type=str,
                                help='Provide shell variables in a file')
+        parserObj.add_argument("--OUTPUTCONFIGFORMAT", "--outputconfigformat", "--OutputConfigFormat",
+                               dest='OutputConfigFormat', required=False, type=str.lower, default="text",
+                               choices=["text", "json", "keyvalue"],
+                               help='Format of the OutputConfig file.  json and keyvalue can be loaded back '
+                                    'into a VarDict.  Default is text')
+        parserObj.add_argument("--FORCEPARSE", "--forceparse", "--ForceParse", dest="FORCEPARSE",
+                               action='store_true', default=False,
+                               help="Ignore cached target.txt, tools_def.txt, DSC and FDF parse results")
+        parserObj.add_argument("--BUILDTARGETS", "--buildtargets", "--BuildTargets", dest="BUILDTARGETS",
+                               required=False, type=str, default=None,
+                               help="CSV of TARGETs to build concurrently from one environment setup. "
+                                    "Example: --BuildTargets DEBUG,RELEASE")
+        parserObj.add_argument("--BUILDTOOLCHAINS", "--buildtoolchains", "--BuildToolChains", dest="BUILDTOOLCHAINS",
+                               required=False, type=str, default=None,
+                               help="CSV of TOOL_CHAIN_TAGs to build concurrently from one environment setup. "
+                                    "Example: --BuildToolChains VS2019,CLANGPDB")
 
     def RetrievePlatformCommandLineOptions(self, args):
         '''  Retrieve command line options from the argparser'''
         self.OutputConfig = os.path.abspath(args.OutputConfig) if args.OutputConfig else None
+        self.OutputConfigFormat = args.OutputConfigFormat
+        self.ForceParse = args.FORCEPARSE
+        if(args.BUILDTARGETS):
+            self.BuildTargetList = [t.strip().upper() for t in args.BUILDTARGETS.split(",")]
+        if(args.BUILDTOOLCHAINS):
+            self.BuildToolChainList = [t.strip() for t in args.BUILDTOOLCHAINS.split(",")]
 
         if(args.SKIPBUILD):
             self.SkipBuild = True
@@ -100,6 +148,7 @@ def Go(self, WorkSpace, PackagesPath, PInHelper, PInManager):
         self.pp = PackagesPath  # string using os.pathsep
         self.Helper = PInHelper
         self.pm = PInManager
+        self.parse_cache = ParseCache(os.path.join(WorkSpace, "Build", "ParseCache.json"))
 
         try:
             edk2_logging.log_progress("Start time: {0}".format(datetime.datetime.now()))
@@ -134,7 +183,10 @@ def Go(self, WorkSpace, PackagesPath, PInHelper, PInManager):
             if(self.OutputConfig is not None):
                 edk2_logging.log_progress("Writing Build Env Info out to File")
                 logging.debug("Found an Output Build Env File: " + self.OutputConfig)
-                self.env.PrintAll(self.OutputConfig)
+                if(self.OutputConfigFormat == "text"):
+                    self.env.PrintAll(self.OutputConfig)
+                else:
+                    self.env.SaveToFile(self.OutputConfig, self.OutputConfigFormat)
 
             if(self.env.GetValue("GATEDBUILD") is not None) and (self.env.GetValue("GATEDBUILD").upper() == "TRUE"):
                 ShouldGatedBuildRun = self.PlatformGatedBuildShouldHappen()
@@ -149,7 +201,10 @@ def Go(self, WorkSpace, PackagesPath, PInHelper, PInManager):
             if(self.SkipBuild):
                 edk2_logging.log_progress("Skipping Build")
             else:
-                ret = self.Build()
+                if(self.BuildTargetList or self.BuildToolChainList):
+                    ret = self.BuildMultiple()
+                else:
+                    ret = self.Build()
 
                 if(ret != 0):
                     logging.critical("Build failed")
@@ -225,59 +280,192 @@ def Build(self):
         BuildType = self.env.GetValue("TARGET")
         edk2_logging.log_progress("Running Build %s" % BuildType)
 
+        params = self.GetBuildParameters(self.env)
+        self._CheckSingleModuleBuild()
+
+        # scan the build output for problems as it is logged rather than holding it all in memory
+        # and log each one as it is found
+        output_scanner = edk2_logging.create_compiler_output_scanner(
+            callback=lambda level, problem, context: logging.log(level, problem))
+
+        env = shell_environment.ShellEnvironment()
+        # WORKAROUND - Pin the PYTHONHASHSEED so that TianoCore build tools
+        #               have consistent ordering. Addresses incremental builds.
+        pre_build_env_chk = env.checkpoint()
+        env.set_shell_var('PYTHONHASHSEED', '0')
+        env.log_environment()
+        ret = RunCmd("build", params)
+        # WORKAROUND - Undo the workaround.
+        env.restore_checkpoint(pre_build_env_chk)
+
+        edk2_logging.remove_output_stream(output_scanner)
+
+        if(ret != 0):
+            return ret
+
+        return 0
+
+    def _CheckSingleModuleBuild(self):
+        ''' a single module build (BUILDMODULE) skips post build and flashing '''
+        mod = self.env.GetValue("BUILDMODULE")
+        if(mod is not None and len(mod.strip()) > 0):
+            edk2_logging.log_progress("Single Module Build: " + mod)
+            self.SkipPostBuild = True
+            self.FlashImage = False
+
+    def GetBuildParameters(self, env):
+        ''' return the parameter string for the edk2 build command based on the VarDict env '''
+        BuildType = env.GetValue("TARGET")
+
         # set target, arch, toolchain, threads, and platform
-        params = "-p " + self.env.GetValue("ACTIVE_PLATFORM")
+        params = "-p " + env.GetValue("ACTIVE_PLATFORM")
         params += " -b " + BuildType
-        params += " -t " + self.env.GetValue("TOOL_CHAIN_TAG")
+        params += " -t " + env.GetValue("TOOL_CHAIN_TAG")
         # Thread number is now optional and not set in default tianocore target.txt
-        if self.env.GetValue("MAX_CONCURRENT_THREAD_NUMBER") is not None:
-            params += " -n " + self.env.GetValue("MAX_CONCURRENT_THREAD_NUMBER")
+        if env.GetValue("MAX_CONCURRENT_THREAD_NUMBER") is not None:
+            params += " -n " + env.GetValue("MAX_CONCURRENT_THREAD_NUMBER")
 
         # Set the arch flags.  Multiple are split by space
-        rt = self.env.GetValue("TARGET_ARCH").split(" ")
+        rt = env.GetValue("TARGET_ARCH").split(" ")
         for t in rt:
             params += " -a " + t
 
         # get the report options and setup the build command
-        if(self.env.GetValue("BUILDREPORTING") == "TRUE"):
-            params += " -y " + self.env.GetValue("BUILDREPORT_FILE")
-            rt = self.env.GetValue("BUILDREPORT_TYPES").split(" ")
+        if(env.GetValue("BUILDREPORTING") == "TRUE"):
+            params += " -y " + env.GetValue("BUILDREPORT_FILE")
+            rt = env.GetValue("BUILDREPORT_TYPES").split(" ")
             for t in rt:
                 params += " -Y " + t
 
         # add special processing to handle building a single module
-        mod = self.env.GetValue("BUILDMODULE")
+        mod = env.GetValue("BUILDMODULE")
         if(mod is not None and len(mod.strip()) > 0):
             params += " -m " + mod
-            edk2_logging.log_progress("Single Module Build: " + mod)
-            self.SkipPostBuild = True
-            self.FlashImage = False
 
         # attach the generic build vars
-        buildvars = self.env.GetAllBuildKeyValues(BuildType)
+        buildvars = env.GetAllBuildKeyValues(BuildType)
         for key, value in buildvars.items():
             params += " -D " + key + "=" + value
-        output_stream = edk2_logging.create_output_stream()
+        return params
 
-        env = shell_environment.ShellEnvironment()
-        # WORKAROUND - Pin the PYTHONHASHSEED so that TianoCore build tools
-        #               have consistent ordering. Addresses incremental builds.
-        pre_build_env_chk = env.checkpoint()
-        env.set_shell_var('PYTHONHASHSEED', '0')
-        env.log_environment()
-        ret = RunCmd("build", params)
-        # WORKAROUND - Undo the workaround.
-        env.restore_checkpoint(pre_build_env_chk)
+    #
+    # Build every requested TARGET / TOOL_CHAIN_TAG combination concurrently
+    #
+    def BuildMultiple(self):
+        targets = self.BuildTargetList or [self.env.GetValue("TARGET")]
+        tool_chains = self.BuildToolChainList or [self.env.GetValue("TOOL_CHAIN_TAG")]
+        combinations = list(dict.fromkeys((target, tool_chain) for tool_chain in tool_chains for target in targets))
+        self._CheckSingleModuleBuild()
+
+        # edk2 build writes to OUTPUT_DIRECTORY/<TARGET>_<TOOL_CHAIN_TAG>, which is the BUILD_OUTPUT_BASE of
+        # the combination.  Combinations that share an output directory are built one after another.
+        groups = {}
+        for (target, tool_chain) in combinations:
+            output_base = os.path.normcase(self.GetBuildOutputBase(target, tool_chain))
+            groups.setdefault(output_base, []).append((target, tool_chain))
+
+        # MAX_CONCURRENT_THREAD_NUMBER is the job budget shared by all of the builds
+        job_budget = self.env.GetValue("MAX_CONCURRENT_THREAD_NUMBER")
+        job_budget = int(job_budget) if job_budget is not None else (os.cpu_count() or 1)
+        concurrent_builds = max(1, min(len(groups), job_budget))
+        threads_per_build = max(1, job_budget // concurrent_builds)
+        edk2_logging.log_progress(f"Running {len(combinations)} Builds. {concurrent_builds} at a time "
+                                  f"with {threads_per_build} threads each")
+
+        def build_group(group):
+            return [self._BuildCombination(target, tool_chain, threads_per_build) for (target, tool_chain) in group]
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=concurrent_builds) as executor:
+            group_results = list(executor.map(build_group, groups.values()))
+        results = sorted((result for group in group_results for result in group),
+                         key=lambda result: combinations.index((result["target"], result["tool_chain"])))
+
+        # consolidated report
+        ret = 0
+        logging.log(edk2_logging.SUB_SECTION, "Build Results")
+        for result in results:
+            msg = "{0}_{1}: {2} in {3:.1f}s with {4} errors and {5} warnings. Log: {6}".format(
+                result["target"], result["tool_chain"], "Success" if result["return_code"] == 0 else "Failed",
+                result["elapsed_time"], result["errors"], result["warnings"], result["log_file"])
+            if(result["return_code"] != 0):
+                logging.error(msg)
+                if(ret == 0):
+                    ret = result["return_code"]
+            else:
+                edk2_logging.log_progress(msg)
 
-        problems = edk2_logging.scan_compiler_output(output_stream)
-        edk2_logging.remove_output_stream(output_stream)
-        for level, problem in problems:
-            logging.log(level, problem)
+        report_path = os.path.join(self.env.GetValue("BUILD_OUT_TEMP"), "MULTI_BUILD_REPORT.json")
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        with open(report_path, "w") as f:
+            json.dump(results, f, indent=2)
+        logging.debug("Multi Build report written to " + report_path)
 
-        if(ret != 0):
-            return ret
+        return ret
 
-        return 0
+    def GetBuildOutputBase(self, target, tool_chain):
+        ''' return the directory edk2 build writes the output of a TARGET / TOOL_CHAIN_TAG combination to '''
+        return os.path.join(self.env.GetValue("BUILD_OUT_TEMP"), target + "_" + tool_chain)
+
+    def GetBuildEnvOverlay(self, target, tool_chain, thread_count=None):
+        ''' return a copy of the build env for a single TARGET / TOOL_CHAIN_TAG combination '''
+        # self.env may be the forwarding wrapper from shell_environment so ask for the VarDict copy directly
+        env = self.env.__copy__()
+        overrides = {"TARGET": target,
+                     "TOOL_CHAIN_TAG": tool_chain,
+                     "TOOLCHAIN": tool_chain,
+                     "BUILD_OUTPUT_BASE": self.GetBuildOutputBase(target, tool_chain)}
+        overrides["BUILDREPORT_FILE"] = os.path.join(overrides["BUILD_OUTPUT_BASE"], "BUILD_REPORT.TXT")
+        if(tool_chain != self.env.GetValue("TOOL_CHAIN_TAG")):
+            overrides["FAMILY"] = tools_def.get_tool_chain_family(
+                self.mws.join(self.ws, "Conf", "tools_def.txt"), tool_chain)
+        if(thread_count is not None):
+            overrides["MAX_CONCURRENT_THREAD_NUMBER"] = str(thread_count)
+        for key, value in overrides.items():
+            # the overlay must win even if the value was set as not overridable
+            env.ForceValue(key, value, "Multi Build overlay")
+        return env
+
+    def _BuildCombination(self, target, tool_chain, thread_count):
+        env = self.GetBuildEnvOverlay(target, tool_chain, thread_count)
+        build_output_base = env.GetValue("BUILD_OUTPUT_BASE")
+
+        # each build gets its own copy of Conf so edk2 build caches don't collide
+        conf_dir = os.path.join(build_output_base, "Conf")
+        os.makedirs(conf_dir, exist_ok=True)
+        for conf_file in ["target.txt", "tools_def.txt", "build_rule.txt"]:
+            src = os.path.join(self.ws, "Conf", conf_file)
+            if(os.path.isfile(src)):
+                shutil.copy2(src, conf_dir)
+
+        log_file = os.path.join(build_output_base, "BUILDLOG.txt")
+        params = self.GetBuildParameters(env) + " --conf=" + conf_dir
+
+        # Pin the PYTHONHASHSEED without touching the shared process environment
+        environ = os.environ.copy()
+        environ["PYTHONHASHSEED"] = "0"
+
+        edk2_logging.log_progress(f"Starting Build {target}_{tool_chain}")
+        start_time = time.perf_counter()
+        ret = RunCmd("build", params, outfile=log_file, environ=environ, logging_level=logging.DEBUG)
+        elapsed_time = time.perf_counter() - start_time
+
+        errors = 0
+        warnings = 0
+        problems = []
+        if(os.path.isfile(log_file)):
+            with open(log_file, "r", errors="replace") as f:
+                problems = edk2_logging.scan_compiler_output(f)
+        for level, problem in problems:
+            logging.log(level, f"[{target}_{tool_chain}] {problem}")
+            if(level >= logging.ERROR):
+                errors += 1
+            else:
+                warnings += 1
+
+        return {"target": target, "tool_chain": tool_chain, "return_code": ret, "elapsed_time": elapsed_time,
+                "errors": errors, "warnings": warnings, "log_file": log_file,
+                "build_output_base": build_output_base}
 
     def PreBuild(self):
         edk2_logging.log_progress("Running Pre Build")
@@ -292,21 +480,7 @@ def PreBuild(self):
         #
         # run all loaded UefiBuild Plugins
         #
-        for Descriptor in self.pm.GetPluginsOfClass(IUefiBuildPlugin):
-            rc = Descriptor.Obj.do_pre_build(self)
-            if(rc != 0):
-                if(rc is None):
-                    logging.error(
-                        "Plugin Failed: %s returned NoneType" % Descriptor.Name)
-                    ret = -1
-                else:
-                    logging.error("Plugin Failed: %s returned %d" %
-                                  (Descriptor.Name, rc))
-                    ret = rc
-                break  # fail on plugin error
-            else:
-                logging.debug("Plugin Success: %s" % Descriptor.Name)
-        return ret
+        return self._RunBuildPlugins("do_pre_build")
 
     def PostBuild(self):
         edk2_logging.log_progress("Running Post Build")
@@ -322,21 +496,90 @@ def PostBuild(self):
         #
         # run all loaded UefiBuild Plugins
         #
-        for Descriptor in self.pm.GetPluginsOfClass(IUefiBuildPlugin):
-            rc = Descriptor.Obj.do_post_build(self)
+        return self._RunBuildPlugins("do_post_build")
+
+    def _RunBuildPlugins(self, step):
+        ''' Run the step ("do_pre_build" or "do_post_build") of every IUefiBuildPlugin.
+
+            Plugins are ordered by RunsAfter first and by load order where RunsAfter doesn't
+            order them.  Plugins that are not parallel safe run alone in that order.  Parallel safe
+            plugins run on a thread pool once the plugins they run after are done.  After the first
+            failure no more plugins are started.
+
+            returns 0 on success or the return code of the first plugin that failed
+        '''
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        plugins = self.pm.GetPluginsOfClass(IUefiBuildPlugin)
+        parallel = [d.Obj.IsParallelSafe() for d in plugins]
+        # the index of every plugin that must be done before each plugin starts
+        waits_for = []
+        for (i, Descriptor) in enumerate(plugins):
+            runs_after = Descriptor.Obj.RunsAfter()
+            waits_for.append({j for (j, d) in enumerate(plugins) if d.Module in runs_after and j != i})
+
+        # sort by RunsAfter, taking the first loaded plugin whenever more than one can go next.
+        # Plugins in a cycle (or after one) are never sorted and are reported below.
+        order = []
+        unsorted = list(range(len(plugins)))
+        while True:
+            i = next((i for i in unsorted if waits_for[i].issubset(order)), None)
+            if i is None:
+                break
+            unsorted.remove(i)
+            order.append(i)
+        # a plugin also waits for every plugin sorted before it unless both are parallel safe
+        for (position, i) in enumerate(order):
+            waits_for[i].update(j for j in order[:position] if not (parallel[i] and parallel[j]))
+
+        def check_result(Descriptor, rc):
             if(rc != 0):
                 if(rc is None):
                     logging.error(
                         "Plugin Failed: %s returned NoneType" % Descriptor.Name)
-                    ret = -1
-                else:
-                    logging.error("Plugin Failed: %s returned %d" %
-                                  (Descriptor.Name, rc))
-                    ret = rc
-                break  # fail on plugin error
-            else:
-                logging.debug("Plugin Success: %s" % Descriptor.Name)
+                    return -1
+                logging.error("Plugin Failed: %s returned %d" %
+                              (Descriptor.Name, rc))
+                return rc
+            logging.debug("Plugin Success: %s" % Descriptor.Name)
+            return 0
+
+        ret = 0
+        pending = list(range(len(plugins)))
+        done = set()
+        running = {}
+        executor = None
+        if parallel.count(True) > 1:
+            job_budget = self.env.GetValue("MAX_CONCURRENT_THREAD_NUMBER")
+            job_budget = int(job_budget) if job_budget is not None else (os.cpu_count() or 1)
+            executor = ThreadPoolExecutor(max_workers=max(1, min(parallel.count(True), job_budget)))
+        try:
+            while True:
+                ready = [] if ret != 0 else [i for i in pending if waits_for[i].issubset(done)]
+                for i in ready:
+                    pending.remove(i)
+                    if executor is not None and parallel[i]:
+                        running[executor.submit(getattr(plugins[i].Obj, step), self)] = i
+                    else:
+                        # nothing else is running when a plugin that isn't parallel safe is ready
+                        ret = ret or check_result(plugins[i], getattr(plugins[i].Obj, step)(self))
+                        done.add(i)
+                if len(running) == 0:
+                    if len(ready) > 0:
+                        continue
+                    break
+                (finished, _) = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    done.add(i)
+                    ret = ret or check_result(plugins[i], future.result())
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
 
+        if ret == 0 and len(pending) > 0:
+            logging.error("Plugin Failed: %s can't run due to a cycle in RunsAfter" %
+                          ", ".join(plugins[i].Name for i in pending))
+            ret = -1
         return ret
 
     def SetEnv(self):
@@ -393,6 +636,9 @@ def SetEnv(self):
             logging.critical("ParseFdfFile failed")
             return ret
 
+        if(self.parse_cache is not None):
+            self.parse_cache.Save()
+
         # set build output base envs for all builds
         if self.env.GetValue("OUTPUT_DIRECTORY") is None:
             logging.warn("OUTPUT_DIRECTORY was not found, defaulting to Build")
@@ -467,12 +713,18 @@ def PlatformGatedBuildShouldHappen(self):
     # set them so they can be overridden.
     #
     def ParseTargetFile(self):
-        if(os.path.isfile(self.mws.join(self.ws, "Conf", "target.txt"))):
-            # parse TargetTxt File
-            logging.debug("Parse Target.txt file")
-            ttp = TargetTxtParser()
-            ttp.ParseFile(self.mws.join(self.ws, "Conf", "target.txt"))
-            for key, value in ttp.Dict.items():
+        target_txt_path = self.mws.join(self.ws, "Conf", "target.txt")
+        if(os.path.isfile(target_txt_path)):
+            cache_key = "target.txt:" + target_txt_path
+            values = self._LookupParseCache(cache_key)
+            if(values is None):
+                # parse TargetTxt File
+                logging.debug("Parse Target.txt file")
+                ttp = _lazy_import("TargetTxtParser")()
+                ttp.ParseFile(target_txt_path)
+                values = ttp.Dict
+                self._StoreParseCache(cache_key, [target_txt_path], values)
+            for key, value in values.items():
                 # set env as overrideable
                 self.env.SetValue(key, value, "From Target.txt", True)
 
@@ -490,17 +742,13 @@ def ParseTargetFile(self):
         return 0
 
     def ParseToolsDefFile(self):
-        if(os.path.isfile(self.mws.join(self.ws, "Conf", "tools_def.txt"))):
-            # parse ToolsdefTxt File
-            logging.debug("Parse tools_def.txt file")
-            tdp = TargetTxtParser()
-            tdp.ParseFile(self.mws.join(self.ws, "Conf", "tools_def.txt"))
-
+        tools_def_path = self.mws.join(self.ws, "Conf", "tools_def.txt")
+        if(os.path.isfile(tools_def_path)):
             # Get the tool chain tag and then find the family
             # need to parse tools_def and find *_<TAG>_*_*_FAMILY
             # Example:  *_VS2019_*_*_FAMILY        = MSFT
-            tag = "*_" + self.env.GetValue("TOOL_CHAIN_TAG") + "_*_*_FAMILY"
-            tool_chain_family = tdp.Dict.get(tag, "UNKNOWN")
+            # Only the lines needed are scanned rather than parsing the entire file.
+            tool_chain_family = tools_def.get_tool_chain_family(tools_def_path, self.env.GetValue("TOOL_CHAIN_TAG"))
             self.env.SetValue("FAMILY", tool_chain_family, "DSC Spec macro - from tools_def.txt")
 
         else:
@@ -529,10 +777,20 @@ def ParseDscFile(self):
             # Update with special environment set build keys
             input_vars.update(self.env.GetAllBuildKeyValues())
 
-            dscp = DscParser().SetBaseAbsPath(self.ws).SetPackagePaths(
-                self.pp.split(os.pathsep)).SetInputVars(input_vars)
-            dscp.ParseFile(dsc_file_path)
-            for key, value in dscp.LocalVars.items():
+            cache_key = "dsc:" + dsc_file_path + ":" + hash_object([self.ws, self.pp, input_vars])
+            local_vars = self._LookupParseCache(cache_key)
+            if(local_vars is None):
+                dscp = _lazy_import("DscParser")().SetBaseAbsPath(self.ws).SetPackagePaths(
+                    self.pp.split(os.pathsep)).SetInputVars(input_vars)
+                dscp.ParseFile(dsc_file_path)
+                local_vars = dscp.LocalVars
+                if hasattr(dscp, "GetAllDscPaths"):
+                    dsc_files = list(dscp.GetAllDscPaths())
+                else:
+                    dsc_files = get_include_files(dscp, dsc_file_path)
+                if dsc_files is not None:
+                    self._StoreParseCache(cache_key, [dsc_file_path] + dsc_files, local_vars)
+            for key, value in local_vars.items():
                 # set env as overrideable
                 self.env.SetValue(key, value, "From Platform DSC File", True)
         else:
@@ -560,11 +818,18 @@ def ParseFdfFile(self):
             # Update with special environment set build keys
             input_vars.update(self.env.GetAllBuildKeyValues())
 
-            fdf_parser = FdfParser().SetBaseAbsPath(self.ws).SetPackagePaths(
-                self.pp.split(os.pathsep)).SetInputVars(input_vars)
             pa = self.mws.join(self.ws, self.env.GetValue("FLASH_DEFINITION"))
-            fdf_parser.ParseFile(pa)
-            for key, value in fdf_parser.LocalVars.items():
+            cache_key = "fdf:" + pa + ":" + hash_object([self.ws, self.pp, input_vars])
+            local_vars = self._LookupParseCache(cache_key)
+            if(local_vars is None):
+                fdf_parser = _lazy_import("FdfParser")().SetBaseAbsPath(self.ws).SetPackagePaths(
+                    self.pp.split(os.pathsep)).SetInputVars(input_vars)
+                fdf_parser.ParseFile(pa)
+                local_vars = fdf_parser.LocalVars
+                fdf_files = get_include_files(fdf_parser, pa)
+                if fdf_files is not None:
+                    self._StoreParseCache(cache_key, [pa] + fdf_files, local_vars)
+            for key, value in local_vars.items():
                 self.env.SetValue(key, value, "From Platform FDF File", True)
 
         else:
@@ -573,6 +838,21 @@ def ParseFdfFile(self):
 
         return 0
 
+    #
+    # Return the cached parse result for key unless a re-parse was requested
+    #
+    def _LookupParseCache(self, cache_key):
+        if(self.ForceParse or self.parse_cache is None):
+            return None
+        return self.parse_cache.Lookup(cache_key)
+
+    #
+    # Store a parse result for key if there is a parse cache
+    #
+    def _StoreParseCache(self, cache_key, files, result):
+        if(self.parse_cache is not None):
+            self.parse_cache.Store(cache_key, files, result)
+
     #
     # Function used to set default values for numerous build
     # flow control variables
@@ -9,7 +9,23 @@
 # SPDX-License-Identifier: BSD-2-Clause-Patent
 ##
 
+import re
 import logging
+import json
+
+# characters escaped in the keyvalue file format so every entry stays on its own lines
+_KEYVALUE_ESCAPES = {"\\": "\\\\", "\n": "\\n", "\r": "\\r"}
+_KEYVALUE_UNESCAPES = {"\\": "\\", "n": "\n", "r": "\r"}
+
+
+def _escape_keyvalue(text):
+    ''' escape backslashes and line breaks for the keyvalue file format '''
+    return "".join(_KEYVALUE_ESCAPES.get(c, c) for c in text)
+
+
+def _unescape_keyvalue(text):
+    ''' undo _escape_keyvalue.  A backslash that doesn't start an escape is kept '''
+    return re.sub(r"\\([\\nr])", lambda m: _KEYVALUE_UNESCAPES[m.group(1)], text)
 
 
 class EnvEntry(object):
@@ -99,6 +115,16 @@ def SetValue(self, k, v, comment, overridable=False):
 
         return en.SetValue(value, comment, overridable)
 
+    #
+    # Set the value even if the existing entry isn't overridable.
+    # Used for overlays such as the env of a single build in a multi build.
+    #
+    def ForceValue(self, k, v, comment, overridable=False):
+        key = k.upper()
+        self.Logger.debug("Forcing key %s to value %s" % (k, v))
+        self.Dstore[key] = EnvEntry(str(v), comment, overridable)
+        return True
+
     def AllowOverride(self, k):
         key = k.upper()
         en = self.GetEntry(key)
@@ -206,3 +232,72 @@ def PrintAll(self, fp=None):
             value.PrintEntry(f)
         if(f):
             f.close()
+
+    def SaveToFile(self, fp, fmt="json"):
+        ''' Write every entry, including its comment and overridable state, to a file
+            in a machine readable format that LoadFromFile can read back.
+
+            fmt == "json"     - a json object keyed by variable name
+            fmt == "keyvalue" - sorted KEY=VALUE lines, each preceded by a
+                                "# [overridable] comment" metadata line.  Backslashes and
+                                line breaks are escaped and a comment of None is left empty.
+        '''
+        if fmt == "json":
+            data = {}
+            for key in sorted(self.Dstore.keys()):
+                entry = self.Dstore[key]
+                data[key] = {"value": entry.Value, "comment": entry.Comment, "overridable": entry.Overrideable}
+            contents = json.dumps(data, indent=2) + "\n"
+        elif fmt == "keyvalue":
+            lines = []
+            for key in sorted(self.Dstore.keys()):
+                entry = self.Dstore[key]
+                meta = "# [overridable] " if entry.Overrideable else "# "
+                lines.append(meta + _escape_keyvalue("" if entry.Comment is None else str(entry.Comment)))
+                lines.append(key + "=" + _escape_keyvalue(entry.Value))
+            contents = "\n".join(lines) + "\n"
+        else:
+            raise ValueError(f"Unsupported VarDict output format: {fmt}")
+
+        with open(fp, 'w') as f:
+            f.write(contents)
+
+    def LoadFromFile(self, fp):
+        ''' Load entries previously written by SaveToFile. The format is detected from
+            the file contents.  Entries are set with SetValue so existing non-overridable
+            values are honored.
+
+            returns True if all entries were set.
+        '''
+        with open(fp, 'r') as f:
+            contents = f.read()
+
+        ret = True
+        if contents.lstrip().startswith("{"):
+            data = json.loads(contents)
+            for key, entry in data.items():
+                ret &= self.SetValue(key, entry["value"], entry["comment"], entry["overridable"])
+            return ret
+
+        comment = None
+        overridable = False
+        for line in contents.splitlines():
+            if len(line.strip()) == 0:
+                continue
+            if line.startswith("#"):
+                meta = line[1:]
+                if meta.startswith(" "):
+                    meta = meta[1:]
+                overridable = meta == "[overridable]" or meta.startswith("[overridable] ")
+                if overridable:
+                    meta = meta[len("[overridable] "):]
+                # an empty comment was written for a comment of None
+                comment = _unescape_keyvalue(meta) if len(meta) > 0 else None
+                continue
+            key, sep, value = line.partition("=")
+            if sep != "=":
+                raise ValueError(f"Invalid line in VarDict file {fp}: {line}")
+            ret &= self.SetValue(key.strip(), _unescape_keyvalue(value), comment, overridable)
+            comment = None
+            overridable = False
+        return ret
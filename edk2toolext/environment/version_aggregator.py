@@ -9,6 +9,7 @@
 
 import copy
 import logging
+import threading
 from enum import Enum
 
 VERSION_AGGREGATOR = None
@@ -19,6 +20,8 @@ def __init__(self):
         super(version_aggregator, self).__init__()
         self._Versions = {}
         self._logger = logging.getLogger("version_aggregator")
+        self._lock = threading.RLock()
+        self._pending_reporters = []
 
     def ReportVersion(self, key, value, versionType, path=None):
         """
@@ -28,6 +31,10 @@ def ReportVersion(self, key, value, versionType, path=None):
         value -- The value of what you are reporting.
         versionType -- The method of categorizing what is being reported. See VersionTypes for details.
         """
+        with self._lock:
+            self._ReportVersion(key, value, versionType, path)
+
+    def _ReportVersion(self, key, value, versionType, path):
         if key in self._Versions:
             old_version = self._Versions[key]
             if old_version["version"] == value and old_version["path"] == path:
@@ -49,8 +56,24 @@ def ReportVersion(self, key, value, versionType, path=None):
         }
         self._logger.debug("version_aggregator logging version: {0}".format(str(self._Versions[key])))
 
+    def AddPendingReporter(self, thread):
+        """
+        Register a thread that is still reporting versions.
+        Reading the aggregated information waits for it to finish.
+        """
+        with self._lock:
+            self._pending_reporters.append(thread)
+
+    def _WaitForPendingReporters(self):
+        with self._lock:
+            pending = self._pending_reporters
+            self._pending_reporters = []
+        for thread in pending:
+            thread.join()
+
     def Print(self):
         """ Prints out the current information from the version aggregator """
+        self._WaitForPendingReporters()
         for version_key in self._Versions:
             version = self._Versions[version_key]
             print(f"{version['type']} - {version['name']}: {version['version']}")
@@ -61,10 +84,14 @@ def GetAggregatedVersionInformation(self):
         """
         Returns a copy of the aggregated information.
         """
-        return copy.deepcopy(self._Versions)
+        self._WaitForPendingReporters()
+        with self._lock:
+            return copy.deepcopy(self._Versions)
 
     def Reset(self):
-        self._Versions = {}
+        self._WaitForPendingReporters()
+        with self._lock:
+            self._Versions = {}
 
 
 class VersionTypes(Enum):
@@ -10,16 +10,20 @@
 import os
 import sys
 import logging
-import yaml
+import json
 import traceback
 from typing import Dict, Any
 from edk2toollib.uefi.edk2.path_utilities import Edk2Path
-from edk2toollib.log.junit_report_format import JunitTestReport
 from edk2toolext.invocables.edk2_multipkg_aware_invocable import Edk2MultiPkgAwareInvocable
 from edk2toolext.invocables.edk2_multipkg_aware_invocable import MultiPkgAwareSettingsInterface
 from edk2toolext.environment import self_describing_environment
 from edk2toolext.environment.plugintypes.ci_build_plugin import ICiBuildPlugin
 from edk2toolext.environment import shell_environment
+from edk2toolext.environment import plugin_manager
+from edk2toolext.environment import file_walker
+from edk2toolext.environment.plugintypes.uefi_helper_plugin import HelperFunctions, IUefiHelperPlugin
+from edk2toolext.environment.ci_result_cache import CiResultCache
+from edk2toolext.environment.resource_monitor import ResourceMonitor
 from edk2toolext import edk2_logging
 
 
@@ -40,16 +44,48 @@ class Edk2CiBuild(Edk2MultiPkgAwareInvocable):
         leveraging CI build plugins
     '''
 
+    # number of plugin runs listed in the slowest plugins summary
+    SLOWEST_PLUGIN_COUNT = 10
+    # characters of plugin output kept in memory before the rest is written to a temporary file
+    PLUGIN_OUTPUT_SPILL_SIZE = 1024 * 1024
+
     def GetSettingsClass(self):
         return CiBuildSettingsManager
 
+    def __init__(self):
+        self.jobs = 1
+        self.result_cache = None
+        self.plugin_timings = []
+        super().__init__()
+
+    def AddCommandLineOptions(self, parserObj):
+        ''' adds command line options to the argparser '''
+        parserObj.add_argument("--jobs", dest="jobs", type=int, default=1,
+                               help="Number of worker processes used to run parallel safe plugins on "
+                               "packages concurrently.  Default is 1 which runs everything serially.")
+        parserObj.add_argument("--result-cache", "--ResultCache", dest="result_cache_dir", type=str, default=None,
+                               help="Directory used to cache the results of plugins that report they are cacheable. "
+                               "Cached results are replayed when the package and plugin configuration are unchanged.")
+        super().AddCommandLineOptions(parserObj)
+
+    def RetrieveCommandLineOptions(self, args):
+        '''  Retrieve command line options from the argparser '''
+        self.jobs = max(1, args.jobs)
+        if args.result_cache_dir is not None:
+            self.result_cache = CiResultCache(args.result_cache_dir)
+        super().RetrieveCommandLineOptions(args)
+
     def GetLoggingFileName(self, loggerType):
         return "CI_BUILDLOG"
 
+    def GetPluginClasses(self):
+        ''' Load the helper and CI build plugins up front '''
+        return (IUefiHelperPlugin, ICiBuildPlugin)
+
     def Go(self):
         log_directory = os.path.join(self.GetWorkspaceRoot(), self.GetLoggingFolderRelativeToRoot())
 
-        Edk2CiBuild.collect_python_pip_info()
+        Edk2CiBuild.collect_python_pip_info(background=True)
 
         # make Edk2Path object to handle all path operations
         try:
@@ -85,6 +121,7 @@ def Go(self):
         env.SetValue("TARGET_ARCH", " ".join(self.requested_architecture_list), "from edk2 ci build.py")
 
         # Generate consumable XML object- junit format
+        from edk2toollib.log.junit_report_format import JunitTestReport
         JunitReport = JunitTestReport()
 
         # Keep track of failures
@@ -95,120 +132,29 @@ def Go(self):
         logging.log(edk2_logging.SECTION, "Loading plugins")
 
         pluginList = self.plugin_manager.GetPluginsOfClass(ICiBuildPlugin)
+        # walk results are only cached for a single run
+        file_walker.clear_walk_cache()
 
-        for pkgToRunOn in self.requested_package_list:
-            #
-            # run all loaded Edk2CiBuild Plugins/Tests
-            #
-            logging.log(edk2_logging.SECTION, f"Building {pkgToRunOn} Package")
-            logging.info(f"Running on Package: {pkgToRunOn}")
-            package_class_name = f"Edk2CiBuild.{self.PlatformSettings.GetName()}.{pkgToRunOn}"
-            ts = JunitReport.create_new_testsuite(pkgToRunOn, package_class_name)
-            packagebuildlog_path = os.path.join(log_directory, pkgToRunOn)
-            _, txt_handle = edk2_logging.setup_txt_logger(
-                packagebuildlog_path, f"BUILDLOG_{pkgToRunOn}", logging_level=logging.DEBUG, isVerbose=True)
-            _, md_handle = edk2_logging.setup_markdown_logger(
-                packagebuildlog_path, f"BUILDLOG_{pkgToRunOn}", logging_level=logging.DEBUG, isVerbose=True)
-            loghandle = [txt_handle, md_handle]
-            shell_environment.CheckpointBuildVars()
-            env = shell_environment.GetBuildVars()
-
-            # load the package level .ci.yaml
-            pkg_config_file = edk2path.GetAbsolutePathOnThisSytemFromEdk2RelativePath(
-                os.path.join(pkgToRunOn, pkgToRunOn + ".ci.yaml"))
-            if(pkg_config_file):
-                with open(pkg_config_file, 'r') as f:
-                    pkg_config = yaml.safe_load(f)
-            else:
-                logging.info(f"No Pkg Config file for {pkgToRunOn}")
-                pkg_config = dict()
-
-            # get all the defines from the package configuration
-            if "Defines" in pkg_config:
-                for definition_key in pkg_config["Defines"]:
-                    definition = pkg_config["Defines"][definition_key]
-                    env.SetValue(definition_key, definition, "Edk2CiBuild.py from PkgConfig yaml", False)
-
-            # For each plugin
-            for Descriptor in pluginList:
-                # For each target
-                for target in self.requested_target_list:
-
-                    if(target not in Descriptor.Obj.RunsOnTargetList()):
-                        continue
-
-                    edk2_logging.log_progress(f"--Running {pkgToRunOn}: {Descriptor.Name} {target} --")
-                    total_num += 1
-                    shell_environment.CheckpointBuildVars()
-                    env = shell_environment.GetBuildVars()
-
-                    env.SetValue("TARGET", target, "Edk2CiBuild.py before RunBuildPlugin")
-                    (testcasename, testclassname) = Descriptor.Obj.GetTestName(package_class_name, env)
-                    tc = ts.create_new_testcase(testcasename, testclassname)
-
-                    # create the stream for the build log
-                    plugin_output_stream = edk2_logging.create_output_stream()
-
-                    # merge the repo level and package level for this specific plugin
-                    pkg_plugin_configuration = self.merge_config(self.PlatformSettings.GetPluginSettings(),
-                                                                 pkg_config, Descriptor.descriptor)
-
-                    # Still need to see if the package decided this should be skipped
-                    if pkg_plugin_configuration is None or\
-                            "skip" in pkg_plugin_configuration and pkg_plugin_configuration["skip"]:
-                        tc.SetSkipped()
-                        edk2_logging.log_progress("--->Test Skipped by package! %s" % Descriptor.Name)
-
-                    else:
-                        try:
-                            #   - package is the edk2 path to package.  This means workspace/package path relative.
-                            #   - edk2path object configured with workspace and packages path
-                            #   - any additional command line args
-                            #   - RepoConfig Object (dict) for the build
-                            #   - PkgConfig Object (dict)
-                            #   - EnvConfig Object
-                            #   - Plugin Manager Instance
-                            #   - Plugin Helper Obj Instance
-                            #   - testcase Object used for outputing junit results
-                            #   - output_stream the StringIO output stream from this plugin
-                            rc = Descriptor.Obj.RunBuildPlugin(pkgToRunOn, edk2path, pkg_plugin_configuration,
-                                                               env, self.plugin_manager, self.helper,
-                                                               tc, plugin_output_stream)
-                        except Exception as exp:
-                            exc_type, exc_value, exc_traceback = sys.exc_info()
-                            logging.critical("EXCEPTION: {0}".format(exp))
-                            exceptionPrint = traceback.format_exception(type(exp), exp, exc_traceback)
-                            logging.critical(" ".join(exceptionPrint))
-                            tc.SetError("Exception: {0}".format(
-                                exp), "UNEXPECTED EXCEPTION")
-                            rc = 1
-
-                        if(rc > 0):
-                            failure_num += 1
-                            if(rc is None):
-                                logging.error(
-                                    f"--->Test Failed: {Descriptor.Name} {target} returned NoneType")
-                            else:
-                                logging.error(
-                                    f"--->Test Failed: {Descriptor.Name} {target} returned {rc}")
-                        elif(rc < 0):
-                            logging.warn(f"--->Test Skipped: in plugin! {Descriptor.Name} {target}")
-                        else:
-                            edk2_logging.log_progress(f"--->Test Success: {Descriptor.Name} {target}")
-
-                    # revert to the checkpoint we created previously
-                    shell_environment.RevertBuildVars()
-                    # remove the logger
-                    edk2_logging.remove_output_stream(plugin_output_stream)
-                # finished target loop
-            # Finished plugin loop
-
-            edk2_logging.stop_logging(loghandle)  # stop the logging for this particular buildfile
-            shell_environment.RevertBuildVars()
+        if self.jobs > 1:
+            (failure_num, total_num) = self._RunPackagesInParallel(JunitReport, pluginList, edk2path, log_directory)
+        else:
+            for pkgToRunOn in self.requested_package_list:
+                package_class_name = f"Edk2CiBuild.{self.PlatformSettings.GetName()}.{pkgToRunOn}"
+                ts = JunitReport.create_new_testsuite(pkgToRunOn, package_class_name)
+                (pkg_failures, pkg_total) = self._RunPluginsOnPackage(
+                    pkgToRunOn, ts, package_class_name, pluginList, edk2path,
+                    self.PlatformSettings.GetPluginSettings(), log_directory)
+                failure_num += pkg_failures
+                total_num += pkg_total
         # Finished buildable file loop
 
         JunitReport.Output(os.path.join(self.GetWorkspaceRoot(), "Build", "TestSuites.xml"))
 
+        if self.result_cache is not None:
+            self.result_cache.Evict()
+
+        self._ReportPluginTimings(os.path.join(log_directory, "CI_TIMING_REPORT.json"))
+
         # Print Overall Success
         if(failure_num != 0):
             logging.error("Overall Build Status: Error")
@@ -218,6 +164,240 @@ def Go(self):
 
         return failure_num
 
+    def _RunPluginsOnPackage(self, pkgToRunOn, ts, package_class_name, pluginList, edk2path, plugin_settings,
+                             log_directory, log_name=None):
+        ''' Run each plugin in pluginList for every requested target on a single package.
+            Test cases are added to the testsuite ts.
+
+            returns tuple of (number of failures, number of plugins run)
+        '''
+        failure_num = 0
+        total_num = 0
+        if log_name is None:
+            log_name = f"BUILDLOG_{pkgToRunOn}"
+
+        #
+        # run all loaded Edk2CiBuild Plugins/Tests
+        #
+        logging.log(edk2_logging.SECTION, f"Building {pkgToRunOn} Package")
+        logging.info(f"Running on Package: {pkgToRunOn}")
+        packagebuildlog_path = os.path.join(log_directory, pkgToRunOn)
+        _, txt_handle = edk2_logging.setup_txt_logger(
+            packagebuildlog_path, log_name, logging_level=logging.DEBUG, isVerbose=True, use_queue=True)
+        _, md_handle = edk2_logging.setup_markdown_logger(
+            packagebuildlog_path, log_name, logging_level=logging.DEBUG, isVerbose=True, use_queue=True)
+        loghandle = [txt_handle, md_handle]
+        shell_environment.CheckpointBuildVars()
+        env = shell_environment.GetBuildVars()
+
+        # load the package level .ci.yaml
+        pkg_config_file = edk2path.GetAbsolutePathOnThisSytemFromEdk2RelativePath(
+            os.path.join(pkgToRunOn, pkgToRunOn + ".ci.yaml"))
+        if(pkg_config_file):
+            import yaml
+            with open(pkg_config_file, 'r') as f:
+                pkg_config = yaml.safe_load(f)
+        else:
+            logging.info(f"No Pkg Config file for {pkgToRunOn}")
+            pkg_config = dict()
+
+        # get all the defines from the package configuration
+        if "Defines" in pkg_config:
+            for definition_key in pkg_config["Defines"]:
+                definition = pkg_config["Defines"][definition_key]
+                env.SetValue(definition_key, definition, "Edk2CiBuild.py from PkgConfig yaml", False)
+
+        # For each plugin
+        for Descriptor in pluginList:
+            # For each target
+            for target in self.requested_target_list:
+
+                if(target not in Descriptor.Obj.RunsOnTargetList()):
+                    continue
+
+                edk2_logging.log_progress(f"--Running {pkgToRunOn}: {Descriptor.Name} {target} --")
+                total_num += 1
+                shell_environment.CheckpointBuildVars()
+                env = shell_environment.GetBuildVars()
+
+                env.SetValue("TARGET", target, "Edk2CiBuild.py before RunBuildPlugin")
+                (testcasename, testclassname) = Descriptor.Obj.GetTestName(package_class_name, env)
+                tc = ts.create_new_testcase(testcasename, testclassname)
+
+                # create the stream for the build log
+                plugin_output_stream = edk2_logging.create_output_stream(spill_size=self.PLUGIN_OUTPUT_SPILL_SIZE)
+
+                # merge the repo level and package level for this specific plugin
+                pkg_plugin_configuration = self.merge_config(plugin_settings,
+                                                             pkg_config, Descriptor.descriptor)
+
+                # Still need to see if the package decided this should be skipped
+                if pkg_plugin_configuration is None or\
+                        "skip" in pkg_plugin_configuration and pkg_plugin_configuration["skip"]:
+                    tc.SetSkipped()
+                    edk2_logging.log_progress("--->Test Skipped by package! %s" % Descriptor.Name)
+
+                else:
+                    cache_key = None
+                    cached = None
+                    if self.result_cache is not None and Descriptor.Obj.IsResultCacheable():
+                        cache_key = self.result_cache.GetKey(
+                            Descriptor, target, pkg_plugin_configuration,
+                            edk2path.GetAbsolutePathOnThisSytemFromEdk2RelativePath(pkgToRunOn),
+                            extra=env.GetValue("TARGET_ARCH"))
+                        cached = self.result_cache.Lookup(cache_key)
+
+                    with ResourceMonitor() as usage:
+                        if cached is not None:
+                            edk2_logging.log_progress(f"--->Using cached result: {Descriptor.Name} {target}")
+                            rc = self.result_cache.Replay(cached, tc)
+                        else:
+                            rc = self._RunPlugin(Descriptor, pkgToRunOn, edk2path, pkg_plugin_configuration,
+                                                 env, tc, plugin_output_stream)
+                            # only cache results the plugin produced itself
+                            if cache_key is not None and rc is not None and tc.ErrorMsg is None:
+                                self.result_cache.Store(cache_key, rc, tc, plugin_output_stream)
+
+                    tc.Time = round(usage.wall_time, 3)
+                    timing = {"package": pkgToRunOn, "plugin": Descriptor.Name, "target": target,
+                              "testcase": testcasename, "rc": rc, "cached": cached is not None}
+                    timing.update(usage.ToDict())
+                    self.plugin_timings.append(timing)
+                    logging.debug(f"Plugin {Descriptor.Name} {target} resource usage: {usage.ToDict()}")
+
+                    if(rc > 0):
+                        failure_num += 1
+                        if(rc is None):
+                            logging.error(
+                                f"--->Test Failed: {Descriptor.Name} {target} returned NoneType")
+                        else:
+                            logging.error(
+                                f"--->Test Failed: {Descriptor.Name} {target} returned {rc}")
+                    elif(rc < 0):
+                        logging.warn(f"--->Test Skipped: in plugin! {Descriptor.Name} {target}")
+                    else:
+                        edk2_logging.log_progress(f"--->Test Success: {Descriptor.Name} {target}")
+
+                # revert to the checkpoint we created previously
+                shell_environment.RevertBuildVars()
+                # remove the logger and free its output
+                edk2_logging.remove_output_stream(plugin_output_stream)
+                plugin_output_stream.close()
+            # finished target loop
+        # Finished plugin loop
+
+        edk2_logging.stop_logging(loghandle)  # stop the logging for this particular buildfile
+        shell_environment.RevertBuildVars()
+
+        return (failure_num, total_num)
+
+    def _RunPlugin(self, Descriptor, pkgToRunOn, edk2path, pkg_plugin_configuration, env, tc, plugin_output_stream):
+        ''' Run a single plugin on a package and return the plugin return code '''
+        try:
+            #   - package is the edk2 path to package.  This means workspace/package path relative.
+            #   - edk2path object configured with workspace and packages path
+            #   - any additional command line args
+            #   - RepoConfig Object (dict) for the build
+            #   - PkgConfig Object (dict)
+            #   - EnvConfig Object
+            #   - Plugin Manager Instance
+            #   - Plugin Helper Obj Instance
+            #   - testcase Object used for outputing junit results
+            #   - output_stream the StringIO output stream from this plugin
+            rc = Descriptor.Obj.RunBuildPlugin(pkgToRunOn, edk2path, pkg_plugin_configuration,
+                                               env, self.plugin_manager, self.helper,
+                                               tc, plugin_output_stream)
+        except Exception as exp:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            logging.critical("EXCEPTION: {0}".format(exp))
+            exceptionPrint = traceback.format_exception(type(exp), exp, exc_traceback)
+            logging.critical(" ".join(exceptionPrint))
+            tc.SetError("Exception: {0}".format(
+                exp), "UNEXPECTED EXCEPTION")
+            rc = 1
+        return rc
+
+    def _RunPackagesInParallel(self, JunitReport, pluginList, edk2path, log_directory):
+        ''' Run the parallel safe plugins for each package in a pool of worker processes.
+            Plugins that are not parallel safe run serially in this process at the same time.
+
+            returns tuple of (number of failures, number of plugins run)
+        '''
+        failure_num = 0
+        total_num = 0
+        parallel_plugins = [d for d in pluginList if d.Obj.IsParallelSafe()]
+        serial_plugins = [d for d in pluginList if not d.Obj.IsParallelSafe()]
+        logging.info(f"Running {len(parallel_plugins)} parallel safe plugins with {self.jobs} worker processes")
+
+        # every worker starts from a snapshot of the current environment
+        initargs = (self.GetWorkspaceRoot(), list(edk2path.PackagePathList),
+                    self.plugin_manager.GetEnvironmentDescriptors(),
+                    shell_environment.GetEnvironment().active_buildvars.__copy__(),
+                    [d.Name for d in parallel_plugins], self.requested_target_list,
+                    self.PlatformSettings.GetPluginSettings(), log_directory,
+                    self.result_cache.CacheDir if self.result_cache is not None else None)
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_ci_build_worker,
+                                 initargs=initargs) as executor:
+            futures = {}
+            if len(parallel_plugins) > 0:
+                for pkgToRunOn in self.requested_package_list:
+                    package_class_name = f"Edk2CiBuild.{self.PlatformSettings.GetName()}.{pkgToRunOn}"
+                    futures[pkgToRunOn] = executor.submit(_run_ci_build_worker, pkgToRunOn, package_class_name)
+
+            testsuites = {}
+            for pkgToRunOn in self.requested_package_list:
+                package_class_name = f"Edk2CiBuild.{self.PlatformSettings.GetName()}.{pkgToRunOn}"
+                ts = JunitReport.create_new_testsuite(pkgToRunOn, package_class_name)
+                testsuites[pkgToRunOn] = ts
+                if len(serial_plugins) > 0:
+                    (pkg_failures, pkg_total) = self._RunPluginsOnPackage(
+                        pkgToRunOn, ts, package_class_name, serial_plugins, edk2path,
+                        self.PlatformSettings.GetPluginSettings(), log_directory)
+                    failure_num += pkg_failures
+                    total_num += pkg_total
+
+            # merge the worker results into the report
+            for pkgToRunOn, future in futures.items():
+                ts = testsuites[pkgToRunOn]
+                try:
+                    (worker_ts, pkg_failures, pkg_total, worker_timings) = future.result()
+                except Exception as exp:
+                    logging.critical(f"EXCEPTION in worker for {pkgToRunOn}: {exp}")
+                    tc = ts.create_new_testcase(f"{pkgToRunOn} parallel plugins", ts.Package)
+                    tc.SetError(f"Exception: {exp}", "UNEXPECTED EXCEPTION")
+                    failure_num += 1
+                    total_num += 1
+                    continue
+                ts.TestCases = worker_ts.TestCases + ts.TestCases
+                self.plugin_timings.extend(worker_timings)
+                failure_num += pkg_failures
+                total_num += pkg_total
+                edk2_logging.log_progress(f"--Parallel plugins for {pkgToRunOn}: {pkg_failures} failures "
+                                          f"out of {pkg_total}.  Log: {os.path.join(log_directory, pkgToRunOn)}")
+
+        return (failure_num, total_num)
+
+    def _ReportPluginTimings(self, report_path):
+        ''' Write the timing of every plugin run to a json report and log the slowest runs '''
+        try:
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
+            with open(report_path, "w") as f:
+                json.dump(self.plugin_timings, f, indent=2)
+        except OSError as e:
+            logging.warning(f"Failed to write plugin timing report {report_path}: {e}")
+
+        if len(self.plugin_timings) == 0:
+            return
+        slowest = sorted(self.plugin_timings, key=lambda t: t["wall_time"], reverse=True)
+        logging.log(edk2_logging.SUB_SECTION, f"Slowest {Edk2CiBuild.SLOWEST_PLUGIN_COUNT} Plugins")
+        for t in slowest[:Edk2CiBuild.SLOWEST_PLUGIN_COUNT]:
+            growth = "" if t["peak_rss_growth_kb"] is None else f"{t['peak_rss_growth_kb']:>9}KB peak growth  "
+            logging.info(f"{t['wall_time']:>9.2f}s {t['cpu_time']:>9.2f}s cpu  {t['subprocess_count']:>4} procs  "
+                         f"{growth}{t['package']} {t['plugin']} {t['target']}")
+        logging.info(f"Timing report: {report_path}")
+
     def merge_config(self, config, pkg_config, descriptor={}):
         ''' Merge two configurations.  One global and one specific
             to the package to create the proper config for a plugin
@@ -242,5 +422,56 @@ def merge_config(self, config, pkg_config, descriptor={}):
         return config
 
 
+# State for a process pool worker created by _init_ci_build_worker
+_worker_state = {}
+
+
+def _init_ci_build_worker(workspace, packages_path, plugin_descriptors, build_vars, plugin_names,
+                          target_list, plugin_settings, log_directory, result_cache_dir=None):
+    ''' Process pool initializer.  Load the plugins and the environment snapshot once per worker process '''
+    # Drop any handlers inherited from the parent.  Workers only write to their per package log files.
+    logger = logging.getLogger('')
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    edk2_logging.setup_section_level()
+
+    shell_environment.GetEnvironment().active_buildvars = build_vars
+
+    pm = plugin_manager.PluginManager()
+    failedPlugins = pm.SetListOfEnvironmentDescriptors(plugin_descriptors, (IUefiHelperPlugin, ICiBuildPlugin))
+    if failedPlugins:
+        raise Exception("One or more plugins failed to load in worker process.")
+    helper = HelperFunctions()
+    if(helper.LoadFromPluginManager(pm) > 0):
+        raise Exception("One or more helper plugins failed to load in worker process.")
+
+    runner = Edk2CiBuild()
+    runner.plugin_manager = pm
+    runner.helper = helper
+    runner.requested_target_list = target_list
+    if result_cache_dir is not None:
+        runner.result_cache = CiResultCache(result_cache_dir)
+    _worker_state["runner"] = runner
+    _worker_state["edk2path"] = Edk2Path(workspace, packages_path)
+    _worker_state["plugins"] = [d for d in pm.GetPluginsOfClass(ICiBuildPlugin) if d.Name in plugin_names]
+    _worker_state["plugin_settings"] = plugin_settings
+    _worker_state["log_directory"] = log_directory
+
+
+def _run_ci_build_worker(pkgToRunOn, package_class_name):
+    ''' Process pool entry point.  Run the parallel safe plugins on one package.
+
+        returns tuple of (testsuite, number of failures, number of plugins run, plugin timings)
+    '''
+    from edk2toollib.log.junit_report_format import JunitTestReport
+    ts = JunitTestReport().create_new_testsuite(pkgToRunOn, package_class_name)
+    _worker_state["runner"].plugin_timings = []
+    (failure_num, total_num) = _worker_state["runner"]._RunPluginsOnPackage(
+        pkgToRunOn, ts, package_class_name, _worker_state["plugins"], _worker_state["edk2path"],
+        _worker_state["plugin_settings"], _worker_state["log_directory"], f"BUILDLOG_{pkgToRunOn}_PARALLEL")
+    return (ts, failure_num, total_num, _worker_state["runner"].plugin_timings)
+
+
 def main():
     Edk2CiBuild().Invoke()
@@ -11,9 +11,10 @@
 import logging
 from edk2toolext import edk2_logging
 from edk2toolext.environment import plugin_manager
-from edk2toolext.environment.plugintypes.uefi_helper_plugin import HelperFunctions
+from edk2toolext.environment.plugintypes.uefi_helper_plugin import HelperFunctions, IUefiHelperPlugin
 from edk2toolext.environment import self_describing_environment
 from edk2toolext.environment.uefi_build import UefiBuilder
+from edk2toolext.environment.plugintypes.uefi_build_plugin import IUefiBuildPlugin
 from edk2toolext.edk2_invocable import Edk2Invocable, Edk2InvocableSettingsInterface
 from edk2toollib.utility_functions import locate_class_in_module
 from edk2toollib.uefi.edk2.path_utilities import Edk2Path
@@ -59,10 +60,14 @@ def GetLoggingFileName(self, loggerType):
             return f"BUILDLOG_{name}"
         return "BUILDLOG"
 
+    def GetPluginClasses(self):
+        '''  Load the helper and build plugins up front  '''
+        return (IUefiHelperPlugin, IUefiBuildPlugin)
+
     def Go(self):
         logging.info("Running Python version: " + str(sys.version_info))
 
-        Edk2PlatformBuild.collect_python_pip_info()
+        Edk2PlatformBuild.collect_python_pip_info(background=True)
 
         (build_env, shell_env) = self_describing_environment.BootstrapEnvironment(
             self.GetWorkspaceRoot(), self.GetActiveScopes())
@@ -83,7 +88,7 @@ def Go(self):
         logging.log(edk2_logging.SECTION, "Loading Plugins")
         pm = plugin_manager.PluginManager()
         failedPlugins = pm.SetListOfEnvironmentDescriptors(
-            build_env.plugins)
+            build_env.plugins, self.GetPluginClasses())
         if failedPlugins:
             logging.critical("One or more plugins failed to load. Halting build.")
             for a in failedPlugins:
@@ -8,16 +8,55 @@
 ##
 
 import os
+import json
+import importlib
 import logging
+import subprocess
 from io import StringIO
 from edk2toolext import edk2_logging
+from edk2toolext.environment import file_walker
+from edk2toolext.environment.parse_cache import ParseCache, hash_object, get_include_files
 from edk2toolext.invocables.edk2_multipkg_aware_invocable import Edk2MultiPkgAwareInvocable
 from edk2toolext.invocables.edk2_multipkg_aware_invocable import MultiPkgAwareSettingsInterface
 from edk2toollib.uefi.edk2 import path_utilities
-from edk2toollib.uefi.edk2.parsers.dec_parser import DecParser
-from edk2toollib.uefi.edk2.parsers.dsc_parser import DscParser
-from edk2toollib.uefi.edk2.parsers.inf_parser import InfParser
 from edk2toollib.utility_functions import RunCmd
+from edk2toollib.utility_functions import locate_class_in_module
+from edk2toollib.utility_functions import import_module_by_file_name
+
+
+# edk2toollib parsers that are only imported the first time they are used.  They can still be
+# imported from (and patched in) this module.
+_LAZY_IMPORTS = {"DecParser": "edk2toollib.uefi.edk2.parsers.dec_parser",
+                 "DscParser": "edk2toollib.uefi.edk2.parsers.dsc_parser",
+                 "InfParser": "edk2toollib.uefi.edk2.parsers.inf_parser"}
+
+
+def _lazy_import(name):
+    ''' return a name from _LAZY_IMPORTS, importing its module the first time it's used '''
+    if name not in globals():
+        globals()[name] = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    return globals()[name]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        return _lazy_import(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _read_nul_separated(stream, chunk_size=65536):
+    ''' yield the nul separated fields of a binary stream as strings without reading it all at once '''
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        fields = (pending + chunk).split(b"\0")
+        pending = fields.pop()
+        for field in fields:
+            yield field.decode("utf-8", errors="surrogateescape")
+    if pending:
+        yield pending.decode("utf-8", errors="surrogateescape")
 
 
 class PrEvalSettingsManager(MultiPkgAwareSettingsInterface):
@@ -42,6 +81,18 @@ class Edk2PrEval(Edk2MultiPkgAwareInvocable):
     ''' Evaluate the changes and determine what packages of the supplied packages should
         be tested based on impact from the changes '''
 
+    # Maximum number of INF parse results kept in the PR eval parse cache
+    PARSE_CACHE_MAX_ENTRIES = 20000
+
+    def __init__(self):
+        self.additional_platform_modules = []
+        self.cmdline_architecture_list = []
+        self.cmdline_target_list = []
+        self.output_json_path = None
+        self.eval_cache_key = None
+        self.changed_files_cache = {}
+        super().__init__()
+
     def AddCommandLineOptions(self, parserObj):
         ''' adds command line options to the argparser '''
         parserObj.add_argument("--pr-target", dest='pr_target', type=str, default=None,
@@ -56,6 +107,15 @@ def AddCommandLineOptions(self, parserObj):
                                default=None, help="Provide format string that will be output to stdout the count of"
                                " packages to be tested.  Valid Tokens: {pkgcount}"
                                " Example --output-count-format-string PackageCount={pkgcount}")
+        parserObj.add_argument("--additional-platform-module", dest='additional_platform_modules', type=str,
+                               action="append", default=[],
+                               help="Additional platform module to evaluate against the same diff and parse cache."
+                               " All supported packages of the platform are evaluated with the architectures and"
+                               " targets from the command line.  Can be used multiple times."
+                               " Example --additional-platform-module Platforms/Other/PlatformBuild.py")
+        parserObj.add_argument("--output-json", dest='output_json_path', type=str, default=None,
+                               help="Write the packages to build and the reason for every evaluated platform"
+                               " to a json file.  Example --output-json Build/PrEval.json")
         super().AddCommandLineOptions(parserObj)
 
     def RetrieveCommandLineOptions(self, args):
@@ -63,7 +123,12 @@ def RetrieveCommandLineOptions(self, args):
         self.pr_target = args.pr_target
         self.output_csv_format_string = args.output_csv_format_string
         self.output_count_format_string = args.output_count_format_string
+        self.additional_platform_modules = args.additional_platform_modules
+        self.output_json_path = args.output_json_path
         super().RetrieveCommandLineOptions(args)
+        # keep what was on the command line.  The requested lists default to what the primary platform supports
+        self.cmdline_architecture_list = list(self.requested_architecture_list)
+        self.cmdline_target_list = list(self.requested_target_list)
 
     def GetVerifyCheckRequired(self):
         ''' Will not call self_describing_environment.VerifyEnvironment because it might not be set up yet '''
@@ -77,46 +142,103 @@ def GetLoggingFileName(self, loggerType):
         return "PREVALLOG"
 
     def Go(self):
-
-        # create path obj for resolving paths.  Since PR eval is run early to determine if a build is
-        # impacted by the changes of a PR we must ignore any packages path that are not valid due to
-        # not having their submodule or folder populated.
-        # A packages path is ok to drop for this because if it isn't populated it is assumed outside
-        # the repository and thus will not trigger the build.
-        self.edk2_path_obj = path_utilities.Edk2Path(
-            self.GetWorkspaceRoot(), self.GetPackagesPath(), error_on_invalid_pp=False)
         self.logger = logging.getLogger("edk2_pr_eval")
-        actualPackagesDict = self.get_packages_to_build(self.requested_package_list)
-
-        #
-        # Report the packages that need to be built
-        #
-        self.logger.log(edk2_logging.SECTION, "Output Results")
-        self.logger.critical("Need to Build:")
-        if len(actualPackagesDict.keys()) > 0:
-            max_pkg_width = max(len(t) for t in actualPackagesDict.keys())
-            for key, value in actualPackagesDict.items():
-                self.logger.critical(f"{key:{max_pkg_width}}  Reason: {value}")
-        else:
-            self.logger.critical("None")
 
-        #
-        # If requested thru cmd line write to std out in defined format
-        # This enabled CI pipelines
-        #
-        if self.output_csv_format_string is not None:
-            pkgcsv = ",".join([x for x in actualPackagesDict.keys()])
-            print(self.output_csv_format_string.format(pkgcsv=pkgcsv))
+        # the platform from the command line is evaluated for the requested packages and
+        # each additional platform is evaluated for all of its supported packages.  Like the
+        # primary platform they get the architectures and targets from the command line or
+        # all of those they support.
+        platforms = [(os.path.abspath(self.PlatformModule.__file__), self.PlatformSettings,
+                      self.requested_package_list)]
+        for module_path in self.additional_platform_modules:
+            settings = self._load_platform_settings(module_path)
+            packages = list(settings.GetPackagesSupported())
+            settings.SetPackages(packages)
+            settings.SetArchitectures(self.cmdline_architecture_list or list(settings.GetArchitecturesSupported()))
+            settings.SetTargets(self.cmdline_target_list or list(settings.GetTargetsSupported()))
+            platforms.append((os.path.abspath(module_path), settings, packages))
+
+        results = {}
+        edk2_path_objs = {}
+        primary_settings = self.PlatformSettings
+        for (module_path, settings, packages) in platforms:
+            self.PlatformSettings = settings
+            # create path obj for resolving paths.  Since PR eval is run early to determine if a build is
+            # impacted by the changes of a PR we must ignore any packages path that are not valid due to
+            # not having their submodule or folder populated.
+            # A packages path is ok to drop for this because if it isn't populated it is assumed outside
+            # the repository and thus will not trigger the build.
+            path_key = (settings.GetWorkspaceRoot(), tuple(settings.GetPackagesPath()))
+            if path_key not in edk2_path_objs:
+                edk2_path_objs[path_key] = path_utilities.Edk2Path(
+                    path_key[0], list(path_key[1]), error_on_invalid_pp=False)
+            self.edk2_path_obj = edk2_path_objs[path_key]
+
+            if len(platforms) > 1:
+                self.logger.log(edk2_logging.SECTION, f"Evaluating {module_path}")
+            results[module_path] = self.get_packages_to_build(packages)
+        self.PlatformSettings = primary_settings
+
+        for module_path, actualPackagesDict in results.items():
+            #
+            # Report the packages that need to be built
+            #
+            self.logger.log(edk2_logging.SECTION, "Output Results")
+            if len(platforms) > 1:
+                self.logger.critical(f"Platform: {module_path}")
+            self.logger.critical("Need to Build:")
+            if len(actualPackagesDict.keys()) > 0:
+                max_pkg_width = max(len(t) for t in actualPackagesDict.keys())
+                for key, value in actualPackagesDict.items():
+                    self.logger.critical(f"{key:{max_pkg_width}}  Reason: {value}")
+            else:
+                self.logger.critical("None")
 
-        if self.output_count_format_string is not None:
-            pkgcount = len(actualPackagesDict.keys())
-            print(self.output_count_format_string.format(pkgcount=pkgcount))
+            #
+            # If requested thru cmd line write to std out in defined format
+            # This enabled CI pipelines
+            #
+            if self.output_csv_format_string is not None:
+                pkgcsv = ",".join([x for x in actualPackagesDict.keys()])
+                print(self.output_csv_format_string.format(pkgcsv=pkgcsv))
+
+            if self.output_count_format_string is not None:
+                pkgcount = len(actualPackagesDict.keys())
+                print(self.output_count_format_string.format(pkgcount=pkgcount))
+
+        if self.output_json_path is not None:
+            output = {"pr_target": self.pr_target,
+                      "platforms": {module_path: {"packages": list(packages.keys()), "reasons": packages}
+                                    for module_path, packages in results.items()}}
+            with open(self.output_json_path, "w") as f:
+                json.dump(output, f, indent=2)
+            self.logger.info(f"PR eval results written to {self.output_json_path}")
 
         return 0
 
-    def get_packages_to_build(self, possible_packages: list) -> dict:
+    def _load_platform_settings(self, module_path):
+        ''' load the PrEvalSettingsManager from an additional platform module '''
+        module = import_module_by_file_name(os.path.abspath(module_path))
+        return locate_class_in_module(module, self.GetSettingsClass())()
+
+    def _init_eval_caches(self):
+        ''' reset the parse and lookup caches.  They are shared by every platform that uses the same Edk2Path '''
         self.parsed_dec_cache = {}
-        (rc, files) = self._get_files_that_changed_in_this_pr(self.pr_target)
+        self.reverse_dependency_index = {}
+        self.indexed_packages = set()
+        self.containing_package_cache = {}
+        self.public_include_paths = {}
+        self.parse_cache = ParseCache(os.path.join(self.edk2_path_obj.WorkspacePath, "Build", "PrEvalCache.json"),
+                                      Edk2PrEval.PARSE_CACHE_MAX_ENTRIES)
+        self.eval_cache_key = (self.edk2_path_obj.WorkspacePath, tuple(self.edk2_path_obj.PackagePathList))
+
+    def get_packages_to_build(self, possible_packages: list) -> dict:
+        if self.eval_cache_key != (self.edk2_path_obj.WorkspacePath, tuple(self.edk2_path_obj.PackagePathList)):
+            self._init_eval_caches()
+        # the diff is the same for every platform
+        if self.pr_target not in self.changed_files_cache:
+            self.changed_files_cache[self.pr_target] = self._get_files_that_changed_in_this_pr(self.pr_target)
+        (rc, files) = self.changed_files_cache[self.pr_target]
         if rc != 0:
             return {}
 
@@ -140,15 +262,15 @@ def get_packages_to_build(self, possible_packages: list) -> dict:
         if len(remaining_packages) == 0:
             return packages_to_build
 
+        # resolve the package and public status of every changed file once for all policies
+        changed_file_info = self._get_changed_file_info(files)
+
         #
         # Policy 2: Build any package that has changed
         #
         for f in files:
-            try:
-                pkg = self.edk2_path_obj.GetContainingPackage(os.path.abspath(f))
-
-            except Exception as e:
-                self.logger.warning(f"Failed to get package for file {f}.  Exception {e}")
+            (pkg, _) = changed_file_info[f]
+            if pkg is None:
                 # Ignore a file in which we fail to get the package
                 continue
 
@@ -170,15 +292,8 @@ def get_packages_to_build(self, possible_packages: list) -> dict:
 
         # Get all public files in packages
         for f in files:
-            try:
-                pkg = self.edk2_path_obj.GetContainingPackage(os.path.abspath(f))
-
-            except Exception as e:
-                self.logger.warning(f"Failed to get package for file {f}.  Exception {e}")
-                # Ignore a file in which we fail to get the package
-                continue
-
-            if self._is_public_file(f):
+            (pkg, is_public) = changed_file_info[f]
+            if pkg is not None and is_public:
                 public_package_changes.append(pkg)
         # de-duplicate list
         public_package_changes = list(set(public_package_changes))
@@ -186,9 +301,14 @@ def get_packages_to_build(self, possible_packages: list) -> dict:
         # Now check all remaining packages to see if they depend on the set of packages
         # with public file changes.
         # NOTE: future enhancement could be to check actual file dependencies
+        if len(public_package_changes) > 0:
+            self._index_package_dependencies(remaining_packages)
+            self.parse_cache.Save()
         for a in public_package_changes:
+            dependent_packages = self._get_dependent_packages(a)
             for p in remaining_packages[:]:  # slice so we can delete as we go
-                if(self._does_pkg_depend_on_package(p, a)):
+                if p in dependent_packages:
+                    self.logger.info(f"Module: {dependent_packages[p]} depends on package {a}")
                     packages_to_build[p] = f"Policy 3 - Package depends on {a}"
                     remaining_packages.remove(p)  # remove from remaining packages
 
@@ -209,14 +329,7 @@ def get_packages_to_build(self, possible_packages: list) -> dict:
             changed_modules = self._get_unique_module_infs_changed(files)
 
             # now check DSC
-            dsc = DscParser()
-            dsc.SetBaseAbsPath(self.edk2_path_obj.WorkspacePath)
-            dsc.SetPackagePaths(self.edk2_path_obj.PackagePathList)
-            # given that PR eval runs before dependencies are downloaded we must tolerate errors
-            dsc.SetNoFailMode()
-            dsc.SetInputVars(PlatformDscInfo[1])
-            dsc.ParseFile(PlatformDscInfo[0])
-            allinfs = dsc.OtherMods + dsc.ThreeMods + dsc.SixMods + dsc.Libs  # get list of all INF files
+            allinfs = self._get_dsc_modules(PlatformDscInfo[0], PlatformDscInfo[1])  # get set of all INF files
 
             #
             # Note: for now we assume that remaining_packages has only 1 package and that it corresponds
@@ -236,10 +349,19 @@ def get_packages_to_build(self, possible_packages: list) -> dict:
     def _get_unique_module_infs_changed(self, files: list):
         '''return a list of edk2 relative paths to modules infs that have changed files'''
         modules = []
+        # the containing modules of a file only depend on its directory so look up each directory once
+        directories = {}
 
         for f in files:
             if os.path.splitext(f) in [".txt", ".md"]:  # ignore markdown and txt files
                 continue
+            abs_path = os.path.abspath(f)
+            if abs_path.lower().endswith(".inf"):
+                modules.append(abs_path)
+            else:
+                directories.setdefault(os.path.dirname(abs_path), f)
+
+        for directory, f in directories.items():
             try:
                 infs = self.edk2_path_obj.GetContainingModules(os.path.abspath(f))
             except Exception as e:
@@ -254,53 +376,137 @@ def _get_unique_module_infs_changed(self, files: list):
         logging.debug("Changed Modules: " + str(modules))
         return modules
 
-    def _does_pkg_depend_on_package(self, package_to_eval: str, support_package: str) -> bool:
-        ''' return if any module in package_to_eval depends on public files defined in support_package'''
-        # get filesystem path of package_to_eval
-        abs_pkg_path = self.edk2_path_obj.GetAbsolutePathOnThisSytemFromEdk2RelativePath(package_to_eval)
-
-        # loop thru all inf files in the package
-        inf_files = self._walk_dir_for_filetypes([".inf"], abs_pkg_path)
+    def _get_dsc_modules(self, dsc_path: str, input_vars: dict) -> set:
+        ''' return the set of INF files (edk2 relative) used by the DSC.
+            Results are cached across runs by the content of the DSC and its includes and the input vars.
+        '''
+        abs_dsc_path = self.edk2_path_obj.GetAbsolutePathOnThisSytemFromEdk2RelativePath(dsc_path, False)
+        cache_key = None
+        if abs_dsc_path is not None:
+            cache_key = "dsc:" + os.path.normcase(abs_dsc_path) + ":" + hash_object(
+                [self.edk2_path_obj.WorkspacePath, self.edk2_path_obj.PackagePathList, input_vars])
+            modules = self.parse_cache.Lookup(cache_key)
+            if modules is not None:
+                return set(modules)
+
+        dsc = _lazy_import("DscParser")()
+        dsc.SetBaseAbsPath(self.edk2_path_obj.WorkspacePath)
+        dsc.SetPackagePaths(self.edk2_path_obj.PackagePathList)
+        # given that PR eval runs before dependencies are downloaded we must tolerate errors
+        dsc.SetNoFailMode()
+        dsc.SetInputVars(input_vars)
+        dsc.ParseFile(dsc_path)
+        modules = set(dsc.OtherMods + dsc.ThreeMods + dsc.SixMods + dsc.Libs)
+
+        if cache_key is not None:
+            if hasattr(dsc, "GetAllDscPaths"):
+                dsc_files = list(dsc.GetAllDscPaths())
+            else:
+                dsc_files = get_include_files(dsc, abs_dsc_path)
+            # only cache when every include could be found
+            if dsc_files is not None:
+                self.parse_cache.Store(cache_key, [abs_dsc_path] + dsc_files, sorted(modules))
+                self.parse_cache.Save()
+        return modules
 
-        # compare if support_pkg in packages section
-        # For each INF file
-        for f in inf_files:
-            ip = InfParser()
+    def _get_packages_used_by_inf(self, inf_path: str) -> list:
+        ''' return the [Packages] section of an INF file.  Results are cached by file content across runs '''
+        cache_key = "inf:" + os.path.normcase(os.path.abspath(inf_path))
+        packages_used = self.parse_cache.Lookup(cache_key)
+        if packages_used is None:
+            ip = _lazy_import("InfParser")()
             ip.SetBaseAbsPath(self.edk2_path_obj.WorkspacePath).SetPackagePaths(
-                self.edk2_path_obj.PackagePathList).ParseFile(f)
+                self.edk2_path_obj.PackagePathList).ParseFile(inf_path)
+            packages_used = ip.PackagesUsed
+            self.parse_cache.Store(cache_key, [inf_path], packages_used)
+        return packages_used
+
+    @staticmethod
+    def _get_package_name_of_dec(dec_path: str) -> str:
+        ''' return the normalized name of the package a DEC from an INF [Packages] section defines.
+            Like GetContainingPackage this is the name of the folder the DEC is in.
+        '''
+        return os.path.normcase(os.path.basename(os.path.dirname(dec_path.replace("\\", "/"))))
+
+    def _index_package_dependencies(self, packages: list):
+        ''' add the modules of each package to the reverse dependency index.
+            The index maps the normalized name of each package listed in an INF [Packages] section
+            to a dictionary of package: first INF in that package that uses it.
+        '''
+        for package in packages:
+            if package in self.indexed_packages:
+                continue
+            self.indexed_packages.add(package)
+            abs_pkg_path = self.edk2_path_obj.GetAbsolutePathOnThisSytemFromEdk2RelativePath(package)
+            for f in self._walk_dir_for_filetypes([".inf"], abs_pkg_path):
+                for p in self._get_packages_used_by_inf(f):
+                    self.reverse_dependency_index.setdefault(
+                        self._get_package_name_of_dec(p), {}).setdefault(package, f)
 
-            for p in ip.PackagesUsed:
-                if p.startswith(support_package):
-                    self.logger.info(f"Module: {f} depends on package {support_package}")
-                    return True
+    def _get_dependent_packages(self, support_package: str) -> dict:
+        ''' return a dictionary of package: INF for each indexed package with a module that uses support_package '''
+        return self.reverse_dependency_index.get(os.path.normcase(support_package), {})
+
+    def _does_pkg_depend_on_package(self, package_to_eval: str, support_package: str) -> bool:
+        ''' return if any module in package_to_eval depends on public files defined in support_package'''
+        self._index_package_dependencies([package_to_eval])
+        inf = self._get_dependent_packages(support_package).get(package_to_eval)
+        if inf is not None:
+            self.logger.info(f"Module: {inf} depends on package {support_package}")
+            return True
         # if never found return False
         return False
 
     def _get_files_that_changed_in_this_pr(self, base_branch) -> tuple:
-        ''' Get all the files that changed in this pr.
-            Return the error code and list of files
+        ''' Get all the files that changed in this pr compared to the merge base with base_branch.
+            Return the error code and a list of the workspace relative files.  Every policy
+            evaluates all of the files so the whole diff is read here.
         '''
 
-        # get file differences between pr and base
+        # find the commit this pr branched from
         output = StringIO()
-        cmd_params = f"diff --name-only HEAD..{base_branch}"
-        rc = RunCmd("git", cmd_params, outstream=output)
-
-        if(rc == 0):
-            self.logger.debug("git diff command returned successfully!")
-        else:
-            self.logger.critical("git diff returned error return value: %s" % str(rc))
+        rc = RunCmd("git", f"merge-base HEAD {base_branch}", outstream=output)
+        if(rc != 0):
+            self.logger.critical("git merge-base returned error return value: %s" % str(rc))
             return(rc, [])
+        merge_base = output.getvalue().strip()
+        self.logger.debug(f"Merge base with {base_branch}: {merge_base}")
 
-        if(output.getvalue() is None):
-            self.logger.info("No files listed in diff")
-            return(0, [])
-
-        files = output.getvalue().split()
-        for f in files:
-            self.logger.debug(f"File Changed: {f}")
+        try:
+            # a path can be listed twice, such as the old path of a rename that was added again
+            files = list(dict.fromkeys(self._stream_git_diff(merge_base)))
+        except subprocess.CalledProcessError as e:
+            self.logger.critical("git diff returned error return value: %s" % str(e.returncode))
+            return(e.returncode, [])
         return(0, files)
 
+    def _stream_git_diff(self, commit):
+        ''' yield every file changed between commit and HEAD.
+            Both the old and the new path of a renamed file are yielded.
+            Raises CalledProcessError once the output is read if git diff fails.
+        '''
+        cmd = ["git", "diff", "-z", "--name-status", commit, "HEAD"]
+        self.logger.info("Cmd to run is: " + " ".join(cmd))
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        try:
+            # output is status\0path\0 or for renames and copies status\0old path\0new path\0
+            fields = _read_nul_separated(proc.stdout)
+            for status in fields:
+                paths = [next(fields)]
+                if status[:1] in ("R", "C"):
+                    paths.append(next(fields))
+                    if status[:1] == "C":
+                        paths.pop(0)  # the source of a copy is unchanged
+                for f in paths:
+                    self.logger.debug(f"File Changed: {f}")
+                    yield f
+        finally:
+            proc.stdout.close()
+            rc = proc.wait()
+        if(rc != 0):
+            raise subprocess.CalledProcessError(rc, cmd)
+        self.logger.debug("git diff command returned successfully!")
+
     def _parse_dec_for_package(self, path_to_package):
         ''' find DEC for package and parse it'''
         # find DEC file
@@ -325,42 +531,82 @@ def _parse_dec_for_package(self, path_to_package):
             return None
 
         # parse it
-        dec = DecParser()
+        dec = _lazy_import("DecParser")()
         dec.SetBaseAbsPath(self.edk2_path_obj.WorkspacePath).SetPackagePaths(self.edk2_path_obj.PackagePathList)
         dec.ParseFile(wsr_dec_path)
         return dec
 
+    def _get_package_root(self, filepath):
+        ''' return a tuple of the package containing filepath (None if it can't be found) and the
+            absolute path of the folder with its DEC (None if it has no DEC).
+            Both only depend on the directory of the file so lookups are cached per directory.
+        '''
+        abs_path = os.path.abspath(filepath)
+        directory = os.path.normcase(os.path.dirname(abs_path))
+        if directory not in self.containing_package_cache:
+            try:
+                pkg = self.edk2_path_obj.GetContainingPackage(abs_path)
+            except Exception as e:
+                self.logger.warning(f"Failed to get package for file {filepath}.  Exception {e}")
+                pkg = None
+            # GetContainingPackage names the package after the nearest folder with a DEC in it
+            root = None
+            folder = os.path.dirname(abs_path)
+            while pkg is not None and root is None:
+                if os.path.basename(folder) == pkg and os.path.isdir(folder) and \
+                        any(f.lower().endswith(".dec") for f in os.listdir(folder)):
+                    root = folder
+                parent = os.path.dirname(folder)
+                if parent == folder:
+                    break
+                folder = parent
+            self.containing_package_cache[directory] = (pkg, root)
+        return self.containing_package_cache[directory]
+
+    def _get_containing_package(self, filepath):
+        ''' return the package containing filepath or None if it can't be found '''
+        return self._get_package_root(filepath)[0]
+
+    def _get_public_include_paths(self, package_root):
+        ''' return a tuple of the normalized "<include path>/" prefixes, relative to the package root,
+            of the public include paths in the DEC of a package
+        '''
+        if package_root not in self.public_include_paths:
+            if (package_root in self.parsed_dec_cache):
+                dec = self.parsed_dec_cache[package_root]
+            else:
+                dec = self._parse_dec_for_package(package_root)
+                self.parsed_dec_cache[package_root] = dec
+            include_paths = () if dec is None else dec.IncludePaths
+            self.public_include_paths[package_root] = tuple(
+                os.path.normcase(p).replace("\\", "/").strip("/") + "/" for p in include_paths)
+        return self.public_include_paths[package_root]
+
+    def _get_changed_file_info(self, files: list) -> dict:
+        ''' resolve the containing package and public status of each changed file in one pass.
+            returns a dictionary of file: (package or None, is public file)
+        '''
+        info = {}
+        for f in files:
+            pkg = self._get_containing_package(f)
+            info[f] = (pkg, pkg is not None and self._is_public_file(f))
+        return info
+
     def _is_public_file(self, filepath):
         ''' return if file is a public files '''
-        fp = filepath.replace("\\", "/")  # make consistant for easy compare
-
-        self.logger.debug("Is public: " + fp)
+        self.logger.debug("Is public: " + filepath)
 
         if filepath.lower().endswith(".dec"):  # if DEC file then it is public
             return True
 
-        try:
-            pkg = self.edk2_path_obj.GetContainingPackage(os.path.abspath(filepath))
-        except Exception as e:
-            self.logger.warning(f"Failed to get package for {filepath}.  Exception: {str(e)}")
-            return False
-
-        dec = None
-        if (pkg in self.parsed_dec_cache):
-            dec = self.parsed_dec_cache[pkg]
-        else:
-            abs_pkg_path = self.edk2_path_obj.GetAbsolutePathOnThisSytemFromEdk2RelativePath(pkg)
-            dec = self._parse_dec_for_package(abs_pkg_path)
-            self.parsed_dec_cache[pkg] = dec
-
-        if dec is None:
+        (_, package_root) = self._get_package_root(filepath)
+        if package_root is None:
             return False
 
-        for includepath in dec.IncludePaths:  # if in the include path of a package then it is public
-            if (pkg + "/" + includepath + "/") in filepath:
-                return True
-
-        return False
+        # if in the include path of a package then it is public.  The path is compared from the
+        # package root so a folder with the same name elsewhere doesn't match
+        fp = os.path.normcase(os.path.relpath(os.path.abspath(filepath), package_root)).replace("\\", "/")
+        return fp.startswith(self._get_public_include_paths(package_root))
 
     def _walk_dir_for_filetypes(self, extensionlist, directory, ignorelist=None):
         ''' Walks a directory for all items ending in certain extension '''
@@ -377,31 +623,7 @@ def _walk_dir_for_filetypes(self, extensionlist, directory, ignorelist=None):
         if not os.path.isdir(directory):
             raise ValueError("Invalid find directory to walk")
 
-        if ignorelist is not None:
-            ignorelist_lower = list()
-            for item in ignorelist:
-                ignorelist_lower.append(item.lower())
-
-        extensionlist_lower = list()
-        for item in extensionlist:
-            extensionlist_lower.append(item.lower())
-
-        returnlist = list()
-        for Root, Dirs, Files in os.walk(directory):
-            for File in Files:
-                for Extension in extensionlist_lower:
-                    if File.lower().endswith(Extension):
-                        ignoreIt = False
-                        if(ignorelist is not None):
-                            for c in ignorelist_lower:
-                                if(File.lower().startswith(c)):
-                                    ignoreIt = True
-                                    break
-                        if not ignoreIt:
-                            logging.debug(os.path.join(Root, File))
-                            returnlist.append(os.path.join(Root, File))
-
-        return returnlist
+        return file_walker.walk_dir_for_extensions(extensionlist, directory, ignorelist)
 
 
 def main():
@@ -9,12 +9,10 @@
 import logging
 import argparse
 import datetime
-import yaml
 from io import StringIO
 
 from edk2toolext import edk2_logging
 from edk2toollib import utility_functions
-from edk2toolext.edk2_git import Repo
 
 
 class OmniCacheConfig():
@@ -35,6 +33,7 @@ def __init__(self, absfilepath):
             self.remotes = {}
 
     def _Load(self):
+        import yaml
         with open(self.filepath) as yml_file:
             content = yaml.safe_load(yml_file)
 
@@ -51,6 +50,7 @@ def Save(self):
         data = {"version": self.version, "remotes": list(self.remotes.values()),
                 "last_change": datetime.datetime.strftime(datetime.datetime.now(),
                                                           "%A, %B %d, %Y %I:%M%p")}
+        import yaml
         with open(self.filepath, 'w') as outfile:
             yaml.dump(data, outfile, default_flow_style=False)
 
@@ -128,6 +128,7 @@ def AddEntriesFromConfig(config, input_config_file):
         the number of entries added to cache
     '''
 
+    import yaml
     count = 0
     with open(input_config_file) as yml_file:
         content = yaml.safe_load(yml_file)
@@ -378,6 +379,7 @@ def main():
             gitDir = os.path.join(itemDir, ".git")
             # Check if it's a directory or a file (submodules usually have a file instead of a folder)
             if os.path.isdir(gitDir) or os.path.isfile(gitDir):
+                from edk2toolext.edk2_git import Repo
                 repo = Repo(itemDir)
                 if repo.url:
                     if repo.url not in reposFound:
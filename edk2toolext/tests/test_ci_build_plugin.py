@@ -136,3 +136,33 @@ def test_valid_parameters_ignore_caseinsensitive_WalkDirectoryForExtension(self)
         # case insensitive + all match including extension
         result = plugin.WalkDirectoryForExtension([".txt", ".py"], self.test_dir, ["FILE2.py"])
         self.assertEqual(len(result), 1)
+
+    def test_matches_os_walk_WalkDirectoryForExtension(self):
+        plugin = ICiBuildPlugin()
+
+        files = ["a.c", "B.C", "c.h", "x.c.bak", "Makefile", os.path.join("d1", "e.c"), os.path.join("d1", "f.inf"),
+                 os.path.join("d1", "d2", "g.C"), os.path.join("d3", "h.c")]
+        for f in files:
+            os.makedirs(os.path.dirname(os.path.join(self.test_dir, f)), exist_ok=True)
+            with open(os.path.join(self.test_dir, f), "w") as the_file:
+                the_file.write("")
+
+        for extensions in [[".c"], [".C", ".h"], ["c"], ["file", ".c"], [".c.bak"], [""]]:
+            expected = [os.path.join(root, f) for root, _, fs in os.walk(self.test_dir)
+                        for f in fs for e in extensions if f.lower().endswith(e.lower())]
+            result = plugin.WalkDirectoryForExtension(extensions, self.test_dir)
+            self.assertEqual(result, expected, extensions)
+
+        # a listed extension that is repeated matches the file each time
+        self.assertEqual(len(plugin.WalkDirectoryForExtension([".inf", ".INF"], self.test_dir)), 2)
+
+    def test_cached_WalkDirectoryForExtension(self):
+        plugin = ICiBuildPlugin()
+        with open(os.path.join(self.test_dir, "a.c"), "w") as the_file:
+            the_file.write("")
+
+        self.assertEqual(len(plugin.WalkDirectoryForExtension([".c"], self.test_dir, use_cache=True)), 1)
+        with open(os.path.join(self.test_dir, "b.c"), "w") as the_file:
+            the_file.write("")
+        self.assertEqual(len(plugin.WalkDirectoryForExtension([".c"], self.test_dir, use_cache=True)), 1)
+        self.assertEqual(len(plugin.WalkDirectoryForExtension([".c"], self.test_dir)), 2)
@@ -9,9 +9,12 @@
 from edk2toolext.invocables.edk2_ci_build import Edk2CiBuild
 import sys
 import os
+import json
 import logging
 import shutil
 from importlib import reload
+from unittest import mock
+from edk2toolext import edk2_logging
 from edk2toolext.tests.uefi_tree import uefi_tree
 from edk2toolext.environment import shell_environment
 from edk2toolext.environment import self_describing_environment
@@ -71,3 +74,106 @@ def test_ci_build(self):
             self.assertEqual(e.code, 0, "We should have a non zero error code")
             pass
         self.assertTrue(os.path.exists(os.path.join(self.minimalTree, "Build")))
+
+    def test_ci_build_parallel(self):
+        plugin_text = """
+from edk2toolext.environment.plugintypes.ci_build_plugin import ICiBuildPlugin
+
+
+class {0}(ICiBuildPlugin):
+    def GetTestName(self, packagename, environment):
+        return ("{0} " + packagename, packagename + ".{0}")
+
+    def IsParallelSafe(self):
+        return {1}
+
+    def RunBuildPlugin(self, packagename, Edk2pathObj, pkgconfig, environment, PLM, PLMHelper, tc, output_stream):
+        tc.SetSuccess()
+        return 0
+"""
+        for name, parallel_safe in [("ParallelPlugin", True), ("SerialPlugin", False)]:
+            uefi_tree.write_to_file(os.path.join(self.minimalTree, name + ".py"),
+                                    plugin_text.format(name, parallel_safe))
+            uefi_tree.write_to_file(os.path.join(self.minimalTree, name + "_plug_in.json"),
+                                    f'{{"scope": "global", "name": "{name}", "module": "{name}"}}')
+        for pkg in ["TestPkg1", "TestPkg2"]:
+            os.makedirs(os.path.join(self.minimalTree, pkg))
+
+        builder = Edk2CiBuild()
+        settings_file = os.path.join(self.minimalTree, "settings.py")
+        sys.argv = ["stuart_ci_build", "-c", settings_file, "-p", "TestPkg1,TestPkg2", "-t", "NO-TARGET",
+                    "--jobs", "2"]
+        try:
+            builder.Invoke()
+        except SystemExit as e:
+            self.assertEqual(e.code, 0, "We should have a zero error code")
+
+        with open(os.path.join(self.minimalTree, "Build", "TestSuites.xml"), "r") as f:
+            report = f.read()
+        for pkg in ["TestPkg1", "TestPkg2"]:
+            self.assertIn(f'name="ParallelPlugin Edk2CiBuild.TestEdk2Invocable.{pkg}"', report)
+            self.assertIn(f'name="SerialPlugin Edk2CiBuild.TestEdk2Invocable.{pkg}"', report)
+        self.assertTrue(os.path.isfile(os.path.join(self.minimalTree, "Build", "TestPkg1",
+                                                    "BUILDLOG_TestPkg1_PARALLEL.txt")))
+
+        # every plugin run, including those in worker processes, is in the timing report
+        with open(os.path.join(self.minimalTree, "Build", "CI_TIMING_REPORT.json"), "r") as f:
+            timings = json.load(f)
+        self.assertEqual(len(timings), 4)
+        self.assertEqual({t["plugin"] for t in timings}, {"ParallelPlugin", "SerialPlugin"})
+        self.assertTrue(all(t["wall_time"] >= 0 for t in timings))
+
+    def test_ci_build_result_cache(self):
+        plugin_text = """
+import os
+from edk2toolext.environment.plugintypes.ci_build_plugin import ICiBuildPlugin
+
+
+class CacheablePlugin(ICiBuildPlugin):
+    def GetTestName(self, packagename, environment):
+        return ("CacheablePlugin " + packagename, packagename + ".CacheablePlugin")
+
+    def IsResultCacheable(self):
+        return True
+
+    def RunBuildPlugin(self, packagename, Edk2pathObj, pkgconfig, environment, PLM, PLMHelper, tc, output_stream):
+        with open(os.path.join(os.path.dirname(__file__), "runs.txt"), "a") as f:
+            f.write(packagename + "\\n")
+        tc.SetFailed("Bad file <a.c>", "CHECK_FAILED")
+        return 1
+"""
+        uefi_tree.write_to_file(os.path.join(self.minimalTree, "CacheablePlugin.py"), plugin_text)
+        uefi_tree.write_to_file(os.path.join(self.minimalTree, "CacheablePlugin_plug_in.json"),
+                                '{"scope": "global", "name": "CacheablePlugin", "module": "CacheablePlugin"}')
+        os.makedirs(os.path.join(self.minimalTree, "TestPkg"))
+        uefi_tree.write_to_file(os.path.join(self.minimalTree, "TestPkg", "a.c"), "int a;")
+        cache_dir = os.path.join(self.minimalTree, "ResultCache")
+        settings_file = os.path.join(self.minimalTree, "settings.py")
+        reports = []
+        output_streams = []
+        original_create_output_stream = edk2_logging.create_output_stream
+
+        def create_output_stream(*args, **kwargs):
+            output_streams.append(original_create_output_stream(*args, **kwargs))
+            return output_streams[-1]
+        for _ in range(2):
+            sys.argv = ["stuart_ci_build", "-c", settings_file, "-p", "TestPkg", "-t", "NO-TARGET",
+                        "--result-cache", cache_dir]
+            try:
+                with mock.patch.object(edk2_logging, "create_output_stream", side_effect=create_output_stream):
+                    Edk2CiBuild().Invoke()
+            except SystemExit as e:
+                self.assertEqual(e.code, 1, "The plugin failure should be reported")
+            with open(os.path.join(self.minimalTree, "Build", "TestSuites.xml"), "r") as f:
+                reports.append(f.read())
+            self_describing_environment.DestroyEnvironment()
+            TestEdk2CiBuild.restart_logging()
+
+        with open(os.path.join(self.minimalTree, "runs.txt"), "r") as f:
+            self.assertEqual(f.read().split(), ["TestPkg"], "The plugin should only run once")
+        self.assertIn("Bad file &lt;a.c&gt;", reports[1])
+        self.assertIn('type="CHECK_FAILED"', reports[1])
+        # the plugin output is freed once the plugin is done
+        self.assertEqual(len(output_streams), 2)
+        for output_stream in output_streams:
+            self.assertTrue(output_stream.stream.closed)
@@ -0,0 +1,83 @@
+## @file test_edk2_invocable.py
+# Unit test suite for the Edk2Invocable class and the startup cost of the stuart entry points.
+#
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import re
+import sys
+import subprocess
+import unittest
+from edk2toolext.edk2_invocable import Edk2Invocable
+from edk2toolext.environment import version_aggregator
+
+# module of each stuart_* console script
+ENTRY_POINT_MODULES = ["edk2toolext.invocables.edk2_setup",
+                       "edk2toolext.invocables.edk2_update",
+                       "edk2toolext.invocables.edk2_platform_build",
+                       "edk2toolext.invocables.edk2_ci_build",
+                       "edk2toolext.invocables.edk2_ci_setup",
+                       "edk2toolext.invocables.edk2_pr_eval",
+                       "edk2toolext.omnicache"]
+
+# modules that are only imported once they are needed
+DEFERRED_MODULES = ["pkg_resources",
+                    "cProfile",
+                    "pstats",
+                    "yaml",
+                    "importlib.metadata",
+                    "concurrent.futures.process",
+                    "edk2toollib.log.junit_report_format",
+                    "edk2toollib.uefi.edk2.parsers.dsc_parser",
+                    "edk2toollib.uefi.edk2.parsers.fdf_parser"]
+
+
+def get_imported_modules(module):
+    ''' return a dictionary of module name: cumulative import time in us from python -X importtime '''
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    imported = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s*(\d+) \|\s*(\d+) \|\s*(\S+)", line)
+        if match:
+            imported[match.group(3)] = int(match.group(2))
+    return imported
+
+
+class TestEdk2Invocable(unittest.TestCase):
+
+    def setUp(self):
+        version_aggregator.ResetVersionAggregator()
+
+    def tearDown(self):
+        version_aggregator.ResetVersionAggregator()
+
+    def test_collect_python_pip_info(self):
+        Edk2Invocable.collect_python_pip_info()
+        versions = version_aggregator.GetVersionAggregator().GetAggregatedVersionInformation()
+        self.assertIn("Python", versions)
+        self.assertIn("edk2-pytool-library", versions)
+        self.assertEqual(versions["edk2-pytool-library"]["type"], "PIP")
+
+    def test_collect_python_pip_info_background(self):
+        Edk2Invocable.collect_python_pip_info(background=True)
+        versions = version_aggregator.GetVersionAggregator().GetAggregatedVersionInformation()
+        self.assertIn("edk2-pytool-library", versions)
+
+    def test_entry_points_defer_imports(self):
+        for module in ENTRY_POINT_MODULES:
+            imported = get_imported_modules(module)
+            self.assertIn(module, imported)
+            for deferred in DEFERRED_MODULES:
+                self.assertNotIn(deferred, imported, f"{module} imports {deferred}")
+
+    def test_deferred_parsers_are_importable(self):
+        from edk2toolext.environment.uefi_build import DscParser, FdfParser, TargetTxtParser  # noqa: F401
+        from edk2toolext.invocables.edk2_pr_eval import DecParser, InfParser  # noqa: F401
+        from edk2toollib.uefi.edk2.parsers.dsc_parser import DscParser as LibDscParser
+        from edk2toolext.invocables import edk2_pr_eval
+        self.assertIs(edk2_pr_eval.DscParser, LibDscParser)
+        with self.assertRaises(AttributeError):
+            edk2_pr_eval.NotAParser
@@ -5,10 +5,15 @@
 #
 # SPDX-License-Identifier: BSD-2-Clause-Patent
 ##
+import io
+import json
 import os
+import sys
+import subprocess
 import tempfile
 import unittest
 import logging
+import logging.handlers
 from edk2toolext import edk2_logging
 
 
@@ -54,6 +59,192 @@ def test_can_close_logger(self):
         file.close()
         self.assertEqual(num_lines, num_lines2, "We should only have one line")
 
+    def test_queued_loggers(self):
+        test_dir = tempfile.mkdtemp()
+        txt_location, txt_logger = edk2_logging.setup_txt_logger(test_dir, "test_queue", use_queue=True)
+        md_location, md_logger = edk2_logging.setup_markdown_logger(test_dir, "test_queue", use_queue=True)
+        self.assertIsInstance(txt_logger, edk2_logging.QueuedHandler)
+        args = ["Queued"]
+        logging.critical("Testing %s", args)
+        # the message is taken when it is logged
+        args[0] = "Changed"
+        logging.debug("Not at this level")
+        txt_logger.flush()
+        with open(txt_location, "r") as file:
+            self.assertEqual(file.readlines(), ["CRITICAL - Testing ['Queued']\n"])
+
+        for i in range(1000):
+            logging.critical(f"Line {i}")
+        edk2_logging.stop_logging([txt_logger, md_logger])
+        logging.critical("After stop")
+        with open(txt_location, "r") as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 1001)
+        self.assertEqual(lines[-1], "CRITICAL - Line 999\n")
+        with open(md_location, "r") as file:
+            md = file.read()
+        self.assertIn("Line 999", md)
+        self.assertIn("Table of Contents", md)
+
+    def test_queued_logger_flushed_at_exit(self):
+        test_dir = tempfile.mkdtemp()
+        code = ("import logging\n"
+                "from edk2toolext import edk2_logging\n"
+                f"edk2_logging.setup_txt_logger(r'{test_dir}', 'test_exit', use_queue=True)\n"
+                "for i in range(1000):\n"
+                "    logging.critical(f'Line {i}')\n")
+        subprocess.run([sys.executable, "-c", code], check=True)
+        with open(os.path.join(test_dir, "test_exit.txt"), "r") as file:
+            self.assertEqual(len(file.readlines()), 1000)
+
+    def test_add_section(self):
+        log_filter = edk2_logging.get_edk2_filter()
+        log_filter.addSection("edk2_test_section")
+        count = len(edk2_logging.Edk2LogFilter._allowedLoggers)
+        log_filter.addSection("edk2_test_section")
+        self.assertEqual(len(edk2_logging.Edk2LogFilter._allowedLoggers), count)
+        record = logging.LogRecord("edk2_test_section", logging.INFO, "", 0, "msg", None, None)
+        self.assertTrue(log_filter.filter(record))
+        record.name = "edk2_test_other"
+        self.assertFalse(log_filter.filter(record))
+
+    def test_filter_keeps_logger_levels(self):
+        logger = logging.getLogger("edk2_test_filtered")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        filtered = edk2_logging.create_output_stream(logging_namespace="edk2_test_filtered")
+        filtered.addFilter(edk2_logging.get_edk2_filter())
+        # a handler added without edk2_logging still gets every record
+        unfiltered = logging.handlers.BufferingHandler(10)
+        logger.addHandler(unfiltered)
+        try:
+            logging.getLogger("edk2_test_filtered.child").info("info")
+            self.assertEqual(logging.getLogger("edk2_test_filtered.child").level, logging.NOTSET)
+            self.assertEqual([r.getMessage() for r in unfiltered.buffer], ["info"])
+            filtered.seek(0, 0)
+            self.assertEqual(filtered.readlines(), [])
+        finally:
+            edk2_logging.remove_output_stream([filtered, unfiltered], "edk2_test_filtered")
+            logger.setLevel(logging.NOTSET)
+            logger.propagate = True
+
+    def test_output_stream(self):
+        logger = logging.getLogger("edk2_test_output_stream")
+        logger.setLevel(logging.DEBUG)
+        unbounded = edk2_logging.create_output_stream(logging_namespace="edk2_test_output_stream")
+        ring = edk2_logging.create_output_stream(logging_namespace="edk2_test_output_stream", max_lines=2)
+        spill = edk2_logging.create_output_stream(logging.DEBUG, "edk2_test_output_stream", spill_size=16)
+        try:
+            logger.debug("debug line")
+            logger.info("foo.c(12): error C2065: 'x': undeclared")
+            logger.info("line 1\nline 2")
+
+            unbounded.seek(0, 0)
+            self.assertEqual(unbounded.readlines(), ["foo.c(12): error C2065: 'x': undeclared\n",
+                                                     "line 1\n", "line 2\n"])
+            ring.seek(0, 0)
+            self.assertEqual(ring.readlines(), ["... 1 earlier lines were dropped\n", "line 1\n", "line 2\n"])
+            # output past spill_size is kept in full
+            self.assertEqual(len(edk2_logging.scan_compiler_output(spill)), 1)
+
+            # records logged while reading are appended after the read position
+            spill.seek(0, 0)
+            self.assertEqual(spill.readline(), "debug line\n")
+            logger.info("line 3")
+            self.assertEqual(list(spill), ["foo.c(12): error C2065: 'x': undeclared\n", "line 1\n", "line 2\n",
+                                           "line 3\n"])
+        finally:
+            edk2_logging.remove_output_stream([unbounded, ring, spill], "edk2_test_output_stream")
+            for handler in [unbounded, ring, spill]:
+                handler.close()
+            logger.setLevel(logging.NOTSET)
+        # a closed output stream can't be read
+        with self.assertRaises(ValueError):
+            spill.seek(0, 0)
+
+    def test_json_logger(self):
+        test_dir = tempfile.mkdtemp()
+        for use_queue in [False, True]:
+            logger = logging.getLogger("edk2_test_json")
+            logger.setLevel(logging.DEBUG)
+            location, json_logger = edk2_logging.setup_json_logger(test_dir, "test_json", logging.DEBUG,
+                                                                   "edk2_test_json", isVerbose=True,
+                                                                   use_queue=use_queue)
+            try:
+                with edk2_logging.timed_section("Timed", logger=logger):
+                    logger.log(edk2_logging.SECTION, "Inner")
+                    logger.log(edk2_logging.PROGRESS, "Step 1")
+                    logger.log(edk2_logging.PROGRESS, "Step 2")
+                    try:
+                        raise ValueError("bad")
+                    except ValueError:
+                        logger.exception("failed")
+                logger.log(edk2_logging.SECTION, "Summary")
+                logger.info("done")
+            finally:
+                edk2_logging.stop_logging(json_logger, "edk2_test_json")
+                logger.setLevel(logging.NOTSET)
+
+            with open(location, "r") as f:
+                entries = [json.loads(line) for line in f]
+            records = [e for e in entries if e["type"] == "record"]
+            self.assertEqual([r["message"] for r in records][:5], ["Timed", "Inner", "Step 1", "Step 2", "failed"])
+            self.assertTrue(records[5]["message"].startswith("Timed finished in"))
+            self.assertEqual([r["message"] for r in records][6:], ["Summary", "done"])
+            self.assertEqual(records[0]["logger"], "edk2_test_json")
+            self.assertEqual(records[4]["level"], "ERROR")
+            self.assertIn("ValueError: bad", records[4]["exception"])
+
+            # spans are written when they end.  The timed section contains the sections logged in it
+            spans = [(e["level"], e["name"]) for e in entries if e["type"] == "span"]
+            self.assertEqual(spans, [("PROGRESS", "Step 1"), ("PROGRESS", "Step 2"), ("SECTION", "Inner"),
+                                     ("SECTION", "Timed"), ("SECTION", "Summary")])
+            for span in [e for e in entries if e["type"] == "span"]:
+                self.assertAlmostEqual(span["duration"], span["end"] - span["start"], places=5)
+                self.assertGreaterEqual(span["duration"], 0)
+
+    def test_scan_compiler_output(self):
+        output_stream = io.StringIO("foo.c(12): error C2065: 'x': undeclared\n"
+                                    "ok line\n"
+                                    "link : error LNK2019: unresolved\n"
+                                    "GenFv: error F003: bad\n"
+                                    "a.c error C1: and warning C2: both\n")
+        problems = edk2_logging.scan_compiler_output(output_stream)
+        self.assertEqual(problems, [(logging.ERROR, "Compiler #2065 from foo.c(12):   'x': undeclared"),
+                                    (logging.ERROR, "Linker #2019 from link :   unresolved"),
+                                    (logging.ERROR, "EDK2 #003 from GenFv:   bad"),
+                                    (logging.ERROR, "Compiler #1 from a.c   and warning C2: both"),
+                                    (logging.WARNING, "Compiler #2 from a.c error C1: and   both")])
+
+    def test_compiler_output_scanner(self):
+        found = []
+        logger = logging.getLogger('')
+        old_level = logger.level
+        logger.setLevel(logging.INFO)
+        scanner = edk2_logging.create_compiler_output_scanner(
+            context_lines=2, max_problems=1, callback=lambda level, problem, context: found.append(context))
+        logging.info("line 1")
+        logging.info("line 2")
+        logging.info("foo.c(12): warning C4244: conversion")
+        logging.info("build.py...\n : error 7000E: Failed")
+        edk2_logging.remove_output_stream(scanner)
+        logging.info("foo.c(12): error C2065: not scanned")
+        logger.setLevel(old_level)
+
+        self.assertEqual(found, [["line 1", "line 2"], ["foo.c(12): warning C4244: conversion", "build.py..."]])
+
+        # problems logged by the callback aren't scanned again
+        logger.setLevel(logging.INFO)
+        relogging = edk2_logging.create_compiler_output_scanner(
+            callback=lambda level, problem, context: logging.error("foo.c(1): error C1: " + problem))
+        logging.info("foo.c(12): error C2065: undeclared")
+        edk2_logging.remove_output_stream(relogging)
+        logger.setLevel(old_level)
+        self.assertEqual(len(relogging.get_problems()), 1)
+        self.assertEqual(scanner.get_problems(),
+                         [(logging.WARNING, "Compiler #4244 from foo.c(12):   conversion"),
+                          (logging.WARNING, "1 additional problems were not recorded")])
+
 
 if __name__ == '__main__':
     unittest.main()
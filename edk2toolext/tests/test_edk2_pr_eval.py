@@ -0,0 +1,260 @@
+# @file test_edk2_pr_eval.py
+# This contains unit tests for the edk2_pr_eval package selection policies
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import os
+import json
+import shutil
+import subprocess
+import logging
+import tempfile
+import unittest
+from unittest import mock
+from edk2toollib.uefi.edk2.path_utilities import Edk2Path
+from edk2toollib.utility_functions import import_module_by_file_name
+from edk2toolext.invocables.edk2_pr_eval import Edk2PrEval, PrEvalSettingsManager
+
+DEC_TEXT = """[Defines]
+  DEC_SPECIFICATION = 0x00010005
+  PACKAGE_NAME = {0}
+  PACKAGE_GUID = 2A3B3E0F-6E4B-4A4D-9E2F-1A2B3C4D5E6F
+  PACKAGE_VERSION = 1.0
+
+[Includes]
+  Include
+"""
+
+INF_TEXT = """[Defines]
+  INF_VERSION = 0x00010005
+  BASE_NAME = {0}
+  FILE_GUID = 1A3B3E0F-6E4B-4A4D-9E2F-1A2B3C4D5E6F
+  MODULE_TYPE = DXE_DRIVER
+
+[Sources]
+  {0}.c
+
+[Packages]
+  {1}
+"""
+
+SETTINGS_TEXT = """
+import os
+from edk2toolext.invocables.edk2_pr_eval import PrEvalSettingsManager
+
+
+class Settings(PrEvalSettingsManager):
+    def GetWorkspaceRoot(self):
+        return os.path.dirname(os.path.abspath(__file__))
+
+    def GetPackagesSupported(self):
+        return {0}
+
+    def GetArchitecturesSupported(self):
+        return ["X64"]
+
+    def GetTargetsSupported(self):
+        return ["DEBUG", "RELEASE"]
+
+    def SetArchitectures(self, list_of_requested_architectures):
+        self.architectures = list_of_requested_architectures
+
+    def SetTargets(self, list_of_requested_target):
+        self.targets = list_of_requested_target
+
+    def FilterPackagesToTest(self, changedFilesList, potentialPackagesList):
+        return []
+"""
+
+
+class TestEdk2PrEval(unittest.TestCase):
+
+    def setUp(self):
+        self.workspace = os.path.realpath(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+        os.chdir(self.workspace)
+        # PkgA is depended on by PkgB.  PkgC only depends on itself.
+        self._write_package("PkgA", "PkgA/PkgA.dec")
+        self._write_package("PkgB", "PkgA/PkgA.dec")
+        self._write_package("PkgC", "PkgC/PkgC.dec")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def _write(self, path, text):
+        path = os.path.join(self.workspace, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def _write_package(self, pkg, dependency):
+        self._write(f"{pkg}/{pkg}.dec", DEC_TEXT.format(pkg))
+        self._write(f"{pkg}/Include/{pkg}.h", "")
+        self._write(f"{pkg}/Driver/Driver.inf", INF_TEXT.format("Driver", dependency))
+        self._write(f"{pkg}/Driver/Driver.c", "")
+
+    def _get_packages_to_build(self, changed_files, packages=("PkgA", "PkgB", "PkgC"), dsc_info=None):
+        pr_eval = Edk2PrEval()
+        pr_eval.edk2_path_obj = Edk2Path(self.workspace, [])
+        pr_eval.logger = logging.getLogger("edk2_pr_eval")
+        pr_eval.pr_target = "origin/master"
+        pr_eval.PlatformSettings = mock.Mock(spec=PrEvalSettingsManager)
+        pr_eval.PlatformSettings.FilterPackagesToTest.return_value = []
+        pr_eval.PlatformSettings.GetPlatformDscAndConfig.return_value = dsc_info
+        with mock.patch.object(pr_eval, "_get_files_that_changed_in_this_pr", return_value=(0, changed_files)):
+            return pr_eval.get_packages_to_build(list(packages))
+
+    def test_private_change(self):
+        result = self._get_packages_to_build(["PkgA/Driver/Driver.c"])
+        self.assertEqual(list(result.keys()), ["PkgA"])
+        self.assertIn("Policy 2", result["PkgA"])
+
+    def test_public_change_builds_dependent_packages(self):
+        result = self._get_packages_to_build(["PkgA/Include/PkgA.h"])
+        self.assertEqual(list(result.keys()), ["PkgA", "PkgB"])
+        self.assertEqual(result["PkgB"], "Policy 3 - Package depends on PkgA")
+
+    def test_public_change_matches_package_name(self):
+        # a package whose name starts with PkgA doesn't depend on PkgA.  A DEC in a nested folder
+        # is matched by the name of the folder it is in
+        self._write_package("PkgAExtra", "PkgAExtra/PkgAExtra.dec")
+        self._write_package("PkgD", "Silicon\\PkgA/PkgA.dec")
+        result = self._get_packages_to_build(["PkgA/Include/PkgA.h"], ["PkgA", "PkgAExtra", "PkgD"])
+        self.assertEqual(list(result.keys()), ["PkgA", "PkgD"])
+
+    def test_public_files_are_under_the_package_include_paths(self):
+        # an include folder of a package nested in another folder is public
+        self._write("Silicon/PkgN/PkgN.dec", DEC_TEXT.format("PkgN"))
+        self._write("Silicon/PkgN/Include/PkgN.h", "")
+        self._write_package("PkgD", "Silicon/PkgN/PkgN.dec")
+        result = self._get_packages_to_build(["Silicon/PkgN/Include/PkgN.h"], ["PkgA", "PkgB", "PkgD"])
+        self.assertEqual(result, {"PkgD": "Policy 3 - Package depends on PkgN"})
+
+        # a folder deeper in the package that looks like its include path is private
+        self._write("PkgA/Driver/PkgA/Include/Private.h", "")
+        result = self._get_packages_to_build(["PkgA/Driver/PkgA/Include/Private.h"])
+        self.assertEqual(list(result.keys()), ["PkgA"])
+
+    def test_inf_parse_results_are_cached(self):
+        self._get_packages_to_build(["PkgA/Include/PkgA.h"])
+        self.assertTrue(os.path.isfile(os.path.join(self.workspace, "Build", "PrEvalCache.json")))
+
+        # unchanged INF files are not parsed again
+        with mock.patch("edk2toolext.invocables.edk2_pr_eval.InfParser", side_effect=AssertionError):
+            result = self._get_packages_to_build(["PkgA/Include/PkgA.h"])
+        self.assertEqual(list(result.keys()), ["PkgA", "PkgB"])
+
+        # a changed INF file is parsed again
+        self._write("PkgC/Driver/Driver.inf", INF_TEXT.format("Driver", "PkgA/PkgA.dec"))
+        result = self._get_packages_to_build(["PkgA/Include/PkgA.h"])
+        self.assertEqual(list(result.keys()), ["PkgA", "PkgB", "PkgC"])
+
+    def test_containing_package_resolved_once_per_directory(self):
+        files = ["PkgA/Include/PkgA.h", "PkgA/Include/Other.h", "PkgB/Driver/Driver.c", "PkgB/Driver/Driver.inf",
+                 "PkgC/Missing/Deleted.c"]
+        with mock.patch.object(Edk2Path, "GetContainingPackage", autospec=True,
+                               side_effect=Edk2Path.GetContainingPackage) as get_containing_package:
+            result = self._get_packages_to_build(files)
+        # one lookup for each of the three directories
+        self.assertEqual(get_containing_package.call_count, 3)
+        self.assertEqual(list(result.keys()), ["PkgA", "PkgB"])
+        self.assertIn("Policy 2", result["PkgB"])
+
+    def test_dsc_modules_are_cached(self):
+        self._write("PkgC/PkgC.dsc", "[Defines]\n  PLATFORM_NAME = PkgC\n\n[Components]\n  PkgB/Driver/Driver.inf\n")
+        dsc_info = ("PkgC/PkgC.dsc", {"TARGET": "DEBUG"})
+        result = self._get_packages_to_build(["PkgB/Driver/Driver.c"], ["PkgC"], dsc_info)
+        self.assertEqual(result, {"PkgC": "Policy 4 - Package Dsc depends on PkgB/Driver/Driver.inf"})
+
+        # an unchanged DSC is not parsed again
+        with mock.patch("edk2toolext.invocables.edk2_pr_eval.DscParser", side_effect=AssertionError):
+            result = self._get_packages_to_build(["PkgB/Driver/Driver.c"], ["PkgC"], dsc_info)
+        self.assertEqual(list(result.keys()), ["PkgC"])
+
+        # different input vars or a changed DSC are parsed again
+        result = self._get_packages_to_build(["PkgA/Driver/Driver.c"], ["PkgC"], ("PkgC/PkgC.dsc", {}))
+        self.assertEqual(result, {})
+        self._write("PkgC/PkgC.dsc", "[Defines]\n  PLATFORM_NAME = PkgC\n\n[Components]\n  PkgA/Driver/Driver.inf\n")
+        result = self._get_packages_to_build(["PkgA/Driver/Driver.c"], ["PkgC"], dsc_info)
+        self.assertEqual(list(result.keys()), ["PkgC"])
+
+    def test_files_changed_since_merge_base(self):
+        def git(*args):
+            subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@test.com"] + list(args),
+                           cwd=self.workspace, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        git("init", "-b", "main")
+        git("add", "-A")
+        git("commit", "-m", "base")
+        git("checkout", "-b", "topic")
+        os.rename(os.path.join(self.workspace, "PkgA", "Driver", "Driver.c"),
+                  os.path.join(self.workspace, "PkgA", "Driver", "Renamed.c"))
+        self._write("PkgB/Driver/File With Spaces.c", "")
+        git("add", "-A")
+        git("commit", "-m", "topic change")
+        # a later change on the target branch is not part of this pr
+        git("checkout", "main")
+        self._write("PkgC/Driver/Driver.c", "int a;")
+        git("commit", "-am", "main change")
+        git("checkout", "topic")
+        # uncommitted and untracked changes are not part of this pr
+        self._write("PkgC/Driver/Driver.c", "int b;")
+        self._write("PkgC/Driver/Untracked.c", "")
+
+        pr_eval = Edk2PrEval()
+        pr_eval.logger = logging.getLogger("edk2_pr_eval")
+        (rc, files) = pr_eval._get_files_that_changed_in_this_pr("main")
+        self.assertEqual(rc, 0)
+        self.assertEqual(sorted(files), ["PkgA/Driver/Driver.c", "PkgA/Driver/Renamed.c",
+                                         "PkgB/Driver/File With Spaces.c"])
+
+        (rc, files) = pr_eval._get_files_that_changed_in_this_pr("not_a_branch")
+        self.assertNotEqual(rc, 0)
+
+        # a git diff failure is returned rather than raised while the files are used
+        def bad_merge_base(cmd, parameters, outstream=None, **kwargs):
+            outstream.write("not_a_commit\n")
+            return 0
+        with mock.patch("edk2toolext.invocables.edk2_pr_eval.RunCmd", side_effect=bad_merge_base):
+            (rc, files) = pr_eval._get_files_that_changed_in_this_pr("main")
+        self.assertNotEqual(rc, 0)
+        self.assertEqual(list(files), [])
+
+    def test_multiple_platforms(self):
+        self._write("PlatformA.py", SETTINGS_TEXT.format('["PkgA"]'))
+        self._write("PlatformBC.py", SETTINGS_TEXT.format('["PkgB", "PkgC"]'))
+        json_path = os.path.join(self.workspace, "PrEval.json")
+
+        pr_eval = Edk2PrEval()
+        pr_eval.PlatformModule = import_module_by_file_name(os.path.join(self.workspace, "PlatformA.py"))
+        pr_eval.PlatformSettings = pr_eval.PlatformModule.Settings()
+        pr_eval.requested_package_list = ["PkgA"]
+        pr_eval.pr_target = "origin/master"
+        pr_eval.output_csv_format_string = None
+        pr_eval.output_count_format_string = None
+        pr_eval.additional_platform_modules = [os.path.join(self.workspace, "PlatformBC.py")]
+        pr_eval.output_json_path = json_path
+        pr_eval.cmdline_target_list = ["RELEASE"]
+        loaded = []
+        load_platform_settings = pr_eval._load_platform_settings
+        with mock.patch.object(pr_eval, "_get_files_that_changed_in_this_pr",
+                               return_value=(0, ["PkgA/Include/PkgA.h"])) as get_files:
+            with mock.patch.object(pr_eval, "_load_platform_settings",
+                                   side_effect=lambda path: loaded.append(load_platform_settings(path)) or loaded[-1]):
+                self.assertEqual(pr_eval.Go(), 0)
+        # one diff is shared by all of the platforms
+        self.assertEqual(get_files.call_count, 1)
+        # additional platforms get the command line architectures and targets or all they support
+        self.assertEqual(loaded[0].architectures, ["X64"])
+        self.assertEqual(loaded[0].targets, ["RELEASE"])
+
+        with open(json_path, "r") as f:
+            results = json.load(f)
+        self.assertEqual(results["pr_target"], "origin/master")
+        platforms = results["platforms"]
+        self.assertEqual(platforms[os.path.join(self.workspace, "PlatformA.py")]["packages"], ["PkgA"])
+        platform_bc = platforms[os.path.join(self.workspace, "PlatformBC.py")]
+        self.assertEqual(platform_bc["packages"], ["PkgB"])
+        self.assertEqual(platform_bc["reasons"], {"PkgB": "Policy 3 - Package depends on PkgA"})
@@ -122,3 +122,13 @@ def test_bad_ext_dep(self):
         build_env, shell_env, failure = updater.PerformUpdate()
         # we should have no failures
         self.assertEqual(failure, 1)
+
+    def test_profile(self):
+        ''' makes sure --profile writes a profile next to the log '''
+        WORKSPACE = self.get_temp_folder()
+        tree = uefi_tree(WORKSPACE)
+        logging.getLogger().setLevel(logging.WARNING)
+        updater = self.invoke_update(tree.get_settings_provider_path(), ["--profile"])
+        self.assertTrue(updater.profile)
+        self.assertEqual(updater.GetProfileFileName(), os.path.join(WORKSPACE, "Build", "UPDATE_LOG.prof"))
+        self.assertTrue(os.path.isfile(updater.GetProfileFileName()))
@@ -0,0 +1,81 @@
+## @file test_package_model.py
+# Unit test suite for the PackageModel and PackageModelService classes.
+#
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import os
+import tempfile
+import unittest
+from unittest import mock
+from edk2toollib.uefi.edk2.path_utilities import Edk2Path
+from edk2toolext.environment.package_model import PackageModelService
+from edk2toolext.environment.plugin_manager import PluginManager
+
+DEC_TEXT = """[Defines]
+  DEC_SPECIFICATION = 0x00010005
+  PACKAGE_NAME = TestPkg
+  PACKAGE_GUID = 2A3B3E0F-6E4B-4A4D-9E2F-1A2B3C4D5E6F
+  PACKAGE_VERSION = 1.0
+
+[Includes]
+  Include
+"""
+
+INF_TEXT = """[Defines]
+  INF_VERSION = 0x00010005
+  BASE_NAME = TestDriver
+  FILE_GUID = 1A3B3E0F-6E4B-4A4D-9E2F-1A2B3C4D5E6F
+  MODULE_TYPE = DXE_DRIVER
+
+[Sources]
+  TestDriver.c
+"""
+
+
+class TestPackageModel(unittest.TestCase):
+
+    def setUp(self):
+        self.workspace = tempfile.mkdtemp()
+        self.pkg = os.path.join(self.workspace, "TestPkg")
+        os.makedirs(os.path.join(self.pkg, "TestDriver"))
+        files = {"TestPkg.dec": DEC_TEXT,
+                 os.path.join("TestDriver", "TestDriver.inf"): INF_TEXT,
+                 os.path.join("TestDriver", "TestDriver.c"): "",
+                 os.path.join("TestDriver", "Other.C"): ""}
+        for name, text in files.items():
+            with open(os.path.join(self.pkg, name), "w") as f:
+                f.write(text)
+
+    def test_files_by_extension(self):
+        model = PackageModelService().GetPackageModel(self.pkg, self.workspace)
+        self.assertEqual(len(model.GetAllFiles()), 4)
+        self.assertEqual(sorted(os.path.basename(p) for p in model.GetFilesWithExtension([".c"])),
+                         ["Other.C", "TestDriver.c"])
+        self.assertEqual(len(model.GetFilesWithExtension([".INF", ".dec", ".inf"])), 2)
+        self.assertEqual(model.GetFilesWithExtension([".h"]), [])
+
+    def test_scan_and_parse_once(self):
+        service = PackageModelService()
+        model = service.GetPackageModel(self.pkg, self.workspace)
+        self.assertIs(model, service.GetPackageModel(self.pkg + os.sep, self.workspace))
+        with mock.patch("os.walk", wraps=os.walk) as walk:
+            model.GetFilesWithExtension([".c"])
+            model.GetAllFiles()
+            self.assertEqual(walk.call_count, 1)
+
+        inf_path = os.path.join(self.pkg, "TestDriver", "TestDriver.inf")
+        inf = model.GetInfParser(inf_path)
+        self.assertEqual(inf.Sources, ["TestDriver.c"])
+        self.assertIs(inf, model.GetInfParser(inf_path))
+        dec = model.GetDecParser(os.path.join(self.pkg, "TestPkg.dec"))
+        self.assertIs(dec, model.GetDecParser(os.path.join(self.pkg, "TestPkg.dec")))
+
+    def test_plugin_manager_package_model(self):
+        pm = PluginManager()
+        edk2path = Edk2Path(self.workspace, [])
+        model = pm.GetPackageModel("TestPkg", edk2path)
+        self.assertIs(model, pm.GetPackageModel("TestPkg", edk2path))
+        self.assertEqual(len(model.GetFilesWithExtension([".dec"])), 1)
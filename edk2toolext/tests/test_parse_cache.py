@@ -0,0 +1,63 @@
+## @file test_parse_cache.py
+# Unit test suite for the ParseCache class.
+#
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import os
+import tempfile
+import unittest
+from edk2toolext.environment.parse_cache import ParseCache, hash_object
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, "Build", "ParseCache.json")
+        self.src = os.path.join(self.test_dir, "Test.dsc")
+        with open(self.src, "w") as f:
+            f.write("[Defines]\n")
+
+    def test_lookup_missing(self):
+        cache = ParseCache(self.cache_path)
+        self.assertIsNone(cache.Lookup("dsc"))
+
+    def test_store_save_and_reload(self):
+        cache = ParseCache(self.cache_path)
+        cache.Store("dsc", [self.src], {"A": "B"})
+        self.assertEqual(cache.Lookup("dsc"), {"A": "B"})
+        cache.Save()
+        self.assertTrue(os.path.isfile(self.cache_path))
+
+        cache2 = ParseCache(self.cache_path)
+        self.assertEqual(cache2.Lookup("dsc"), {"A": "B"})
+
+    def test_changed_file_invalidates(self):
+        cache = ParseCache(self.cache_path)
+        cache.Store("dsc", [self.src], {"A": "B"})
+        with open(self.src, "a") as f:
+            f.write("OUTPUT_DIRECTORY = Build\n")
+        self.assertIsNone(cache.Lookup("dsc"))
+
+    def test_missing_file_is_not_cached(self):
+        cache = ParseCache(self.cache_path)
+        cache.Store("dsc", [os.path.join(self.test_dir, "missing.dsc")], {"A": "B"})
+        self.assertIsNone(cache.Lookup("dsc"))
+
+    def test_eviction(self):
+        cache = ParseCache(self.cache_path)
+        for i in range(ParseCache.MAX_ENTRIES + 1):
+            cache.Store(str(i), [self.src], i)
+        self.assertIsNone(cache.Lookup("0"))
+        self.assertEqual(cache.Lookup(str(ParseCache.MAX_ENTRIES)), ParseCache.MAX_ENTRIES)
+
+    def test_hash_object_is_order_independent(self):
+        self.assertEqual(hash_object({"A": "1", "B": "2"}), hash_object({"B": "2", "A": "1"}))
+        self.assertNotEqual(hash_object({"A": "1"}), hash_object({"A": "2"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# @file test_plugin_manager.py
+# This contains unit tests for the plugin manager
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import os
+import sys
+import logging
+import shutil
+import tempfile
+import unittest
+from edk2toolext.environment import shell_environment
+from edk2toolext.environment.plugin_manager import PluginManager
+from edk2toolext.environment.plugintypes.ci_build_plugin import ICiBuildPlugin
+from edk2toolext.environment.plugintypes.uefi_build_plugin import IUefiBuildPlugin
+from edk2toolext.environment.plugintypes.uefi_helper_plugin import IUefiHelperPlugin
+
+PLUGIN_TEXT = """
+from edk2toolext.environment.plugintypes.uefi_build_plugin import IUefiBuildPlugin
+
+
+class {0}(IUefiBuildPlugin):
+    pass
+"""
+
+CI_PLUGIN_TEXT = """
+import edk2toolext.environment.plugintypes.ci_build_plugin as ci_build_plugin
+
+
+class {0}(ci_build_plugin.ICiBuildPlugin):
+    pass
+"""
+
+DERIVED_PLUGIN_TEXT = """
+from edk2toolext.environment.plugintypes.uefi_build_plugin import IUefiBuildPlugin
+
+
+class Base(IUefiBuildPlugin):
+    pass
+
+
+class {0}(Base):
+    pass
+"""
+
+
+class TestPluginManager(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        shell_environment.CheckpointBuildVars()
+
+    def tearDown(self):
+        shell_environment.RevertBuildVars()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _create_plugin(self, name, text=None):
+        ''' write a plugin and return its descriptor '''
+        plugin_dir = os.path.join(self.test_dir, name)
+        os.makedirs(plugin_dir)
+        with open(os.path.join(plugin_dir, name + ".py"), "w") as f:
+            f.write(text if text is not None else PLUGIN_TEXT.format(name))
+        return {"name": name + " Plugin", "module": name,
+                "descriptor_file": os.path.join(plugin_dir, name + "_plug_in.yaml")}
+
+    def test_load_plugins(self):
+        descriptors = [self._create_plugin(f"TestPlugin{i}") for i in range(8)]
+        broken = self._create_plugin("BrokenPlugin", "raise RuntimeError('broken')\n")
+        missing_class = self._create_plugin("MissingClassPlugin", "")
+
+        manager = PluginManager()
+        with self.assertLogs(level=logging.DEBUG) as logs:
+            failed = manager.SetListOfEnvironmentDescriptors(descriptors + [broken, missing_class])
+        self.assertEqual(failed, [broken, missing_class])
+        # plugins are kept in descriptor order
+        self.assertEqual([p.Module for p in manager.GetAllPlugins()], [d["module"] for d in descriptors])
+        for plugin in manager.GetAllPlugins():
+            self.assertEqual(type(plugin.Obj).__name__, plugin.Module)
+        self.assertTrue(any("Imported Plugin TestPlugin0 Plugin in" in line for line in logs.output))
+
+    def test_plugin_bytecode_is_cached(self):
+        if sys.dont_write_bytecode:
+            self.skipTest("bytecode writing is disabled")
+        descriptor = self._create_plugin("CachedPlugin")
+        manager = PluginManager()
+        self.assertEqual(manager.SetListOfEnvironmentDescriptors([descriptor]), [])
+        cache_dir = os.path.join(self.test_dir, "CachedPlugin", "__pycache__")
+        self.assertTrue(any(f.startswith("CachedPlugin.") for f in os.listdir(cache_dir)))
+
+    def test_skip_plugin(self):
+        # skipped plugins are never imported
+        descriptors = [self._create_plugin("SkippedPlugin", "raise RuntimeError('imported')\n"),
+                       self._create_plugin("UsedPlugin")]
+        shell_environment.GetBuildVars().SetValue("SKIPPEDPLUGIN", "skip", "test")
+        manager = PluginManager()
+        self.assertEqual(manager.SetListOfEnvironmentDescriptors(descriptors), [])
+        self.assertEqual([p.Module for p in manager.GetAllPlugins()], ["UsedPlugin"])
+
+    def test_deferred_plugins(self):
+        build = self._create_plugin("BuildPlugin")
+        ci = self._create_plugin("CiPlugin", CI_PLUGIN_TEXT.format("CiPlugin"))
+        derived = self._create_plugin("DerivedPlugin", DERIVED_PLUGIN_TEXT.format("DerivedPlugin"))
+
+        manager = PluginManager()
+        self.assertEqual(manager.SetListOfEnvironmentDescriptors([build, ci, derived], (IUefiHelperPlugin,)), [])
+        # plugins that derive from another plugin class can't be deferred
+        self.assertEqual([p.Module for p in manager.Descriptors], ["DerivedPlugin"])
+        self.assertEqual(manager.GetEnvironmentDescriptors(), [build, ci, derived])
+
+        manager = PluginManager()
+        manager.SetListOfEnvironmentDescriptors([build, ci, derived], (IUefiHelperPlugin,))
+        self.assertEqual(manager.GetPluginsOfClass(IUefiHelperPlugin), [])
+        ci_plugins = manager.GetPluginsOfClass(ICiBuildPlugin)
+        self.assertEqual([p.Module for p in ci_plugins], ["CiPlugin"])
+        # the build plugin has not been imported
+        self.assertEqual([p.Module for p in manager.Descriptors], ["CiPlugin", "DerivedPlugin"])
+        self.assertEqual([p.Module for p in manager.GetPluginsOfClass(IUefiBuildPlugin)],
+                         ["BuildPlugin", "DerivedPlugin"])
+        self.assertEqual(manager.GetPluginsOfClass(ICiBuildPlugin), ci_plugins)
+
+    def test_deferred_plugin_failure(self):
+        broken = self._create_plugin("BrokenCiPlugin", CI_PLUGIN_TEXT.format("BrokenCiPlugin") + "raise Exception\n")
+        manager = PluginManager()
+        self.assertEqual(manager.SetListOfEnvironmentDescriptors([broken], (IUefiHelperPlugin,)), [])
+        self.assertEqual(manager.GetPluginsOfClass(IUefiBuildPlugin), [])
+        # the failure is logged rather than raised from the getter
+        with self.assertLogs(level=logging.ERROR) as logs:
+            self.assertEqual(manager.GetPluginsOfClass(ICiBuildPlugin), [])
+        self.assertIn("ERROR:root:Failed Plugin: BrokenCiPlugin Plugin", logs.output)
+        self.assertEqual(manager.GetAllPlugins(), [])
+        self.assertEqual(manager.GetEnvironmentDescriptors(), [])
+
+    def test_syntax_error_is_not_deferred(self):
+        broken = self._create_plugin("SyntaxErrorPlugin", CI_PLUGIN_TEXT.format("SyntaxErrorPlugin") + "def (\n")
+        manager = PluginManager()
+        # the plugin can't be parsed so it is loaded, and fails, up front
+        self.assertEqual(manager.SetListOfEnvironmentDescriptors([broken], (IUefiHelperPlugin,)), [broken])
+        self.assertEqual(manager.Descriptors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
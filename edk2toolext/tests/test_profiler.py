@@ -0,0 +1,60 @@
+## @file test_profiler.py
+# This contains unit tests for the stuart profiling helpers
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import os
+import re
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from edk2toollib.utility_functions import RunCmd
+from edk2toolext.environment import profiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_summarize_profile(self):
+        profile = profiler.start_profile()
+        RunCmd(sys.executable, '-c "import time; time.sleep(0.3)"', logging_level=5)
+        path = profiler.stop_profile(profile, os.path.join(self.test_dir, "Build", "log.prof"))
+        self.assertTrue(os.path.isfile(path))
+
+        lines = profiler.summarize_profile(path, count=5)
+        self.assertEqual(lines[0], f"Profile written to {path}")
+        self.assertIn("Only the main thread was profiled", lines[1])
+        # a header and five functions
+        self.assertEqual(len([line for line in lines if re.match(r"\s+\d+\.\d{3}\s", line)]), 5)
+        self.assertTrue(any("RunCmd" in line for line in lines[4:9]))
+
+        match = re.match(r"RunCmd: (\d+) calls on the main thread in (\S+) seconds, "
+                         r"(\S+) seconds waiting on child processes", lines[-2])
+        self.assertIsNotNone(match)
+        self.assertEqual(match.group(1), "1")
+        self.assertGreaterEqual(float(match.group(3)), 0.25)
+        self.assertGreaterEqual(float(match.group(2)), float(match.group(3)))
+
+    def test_summarize_profile_run_cmd_on_other_thread(self):
+        profile = profiler.start_profile()
+        thread = threading.Thread(target=RunCmd, args=(sys.executable, '-c "pass"'), kwargs={"logging_level": 5})
+        thread.start()
+        thread.join()
+        path = profiler.stop_profile(profile, os.path.join(self.test_dir, "log.prof"))
+
+        # a RunCmd on another thread isn't reported as taking no time
+        lines = profiler.summarize_profile(path)
+        self.assertEqual(lines[-2], "RunCmd: not called on the main thread")
+
+
+if __name__ == '__main__':
+    unittest.main()
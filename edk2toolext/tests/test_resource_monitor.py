@@ -0,0 +1,45 @@
+## @file test_resource_monitor.py
+# Unit test suite for the ResourceMonitor class.
+#
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import sys
+import time
+import subprocess
+import unittest
+from edk2toolext.environment.resource_monitor import ResourceMonitor
+
+
+class TestResourceMonitor(unittest.TestCase):
+
+    def test_measures_wall_time(self):
+        with ResourceMonitor() as usage:
+            time.sleep(0.05)
+        self.assertGreaterEqual(usage.wall_time, 0.05)
+        self.assertGreaterEqual(usage.cpu_time, 0)
+        self.assertEqual(usage.subprocess_count, 0)
+
+    def test_counts_subprocesses(self):
+        with ResourceMonitor() as usage:
+            for _ in range(2):
+                subprocess.run([sys.executable, "-c", "pass"], check=True)
+        self.assertEqual(usage.subprocess_count, 2)
+
+    def test_to_dict(self):
+        with ResourceMonitor() as usage:
+            pass
+        self.assertEqual(set(usage.ToDict().keys()),
+                         {"wall_time", "cpu_time", "peak_rss_growth_kb", "subprocess_count"})
+
+    def test_measures_deltas(self):
+        # memory used by a child isn't counted as growth of this process's peak
+        with ResourceMonitor() as usage:
+            subprocess.run([sys.executable, "-c", "b = bytearray(256 * 1024 * 1024)"], check=True)
+        # the child's cpu time is counted once it has finished
+        self.assertGreater(usage.cpu_time, 0)
+        if sys.platform.startswith("linux"):
+            self.assertGreaterEqual(usage.peak_rss_growth_kb, 0)
+            self.assertLess(usage.peak_rss_growth_kb, 128 * 1024)
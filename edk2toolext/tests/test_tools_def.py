@@ -0,0 +1,59 @@
+## @file test_tools_def.py
+# Unit test suite for the tools_def.txt lookup functions.
+#
+##
+# Copyright (c) Microsoft Corporation
+#
+# SPDX-License-Identifier: BSD-2-Clause-Patent
+##
+import os
+import tempfile
+import unittest
+from edk2toolext.environment import tools_def
+
+TOOLS_DEF_TEXT = """
+# comment line with *_VS2019_*_*_FAMILY = WRONG
+DEFINE VS2019_BIN = C:\\\\bin
+*_VS2019_*_*_FAMILY        = MSFT
+*_VS2019_*_*_BUILDRULEFAMILY = MSFT  # trailing comment
+*_VS2019_*_MAKE_PATH       = nmake.exe
+*_VS2019_X64_CC_PATH       = cl.exe
+*_GCC5_*_*_FAMILY          = GCC
+"""
+
+
+class TestToolsDef(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "tools_def.txt")
+        with open(self.path, "w") as f:
+            f.write(TOOLS_DEF_TEXT)
+
+    def test_get_family(self):
+        self.assertEqual(tools_def.get_tool_chain_family(self.path, "VS2019"), "MSFT")
+        self.assertEqual(tools_def.get_tool_chain_family(self.path, "GCC5"), "GCC")
+        self.assertEqual(tools_def.get_tool_chain_family(self.path, "CLANGPDB"), "UNKNOWN")
+
+    def test_get_common_values(self):
+        values = tools_def.get_tool_chain_values(self.path, "VS2019")
+        self.assertEqual(values, {"*_FAMILY": "MSFT", "*_BUILDRULEFAMILY": "MSFT", "MAKE_PATH": "nmake.exe"})
+        values = tools_def.get_tool_chain_values(self.path, "VS2019", ["CC_PATH"], arch="X64")
+        self.assertEqual(values, {"CC_PATH": "cl.exe"})
+
+    def test_first_definition_wins(self):
+        with open(self.path, "a") as f:
+            f.write("*_GCC5_*_*_FAMILY          = OTHER\n")
+        self.assertEqual(tools_def.get_tool_chain_family(self.path, "GCC5"), "GCC")
+
+    def test_file_change_is_detected(self):
+        self.assertEqual(tools_def.get_tool_chain_family(self.path, "GCC5"), "GCC")
+        with open(self.path, "w") as f:
+            f.write("*_GCC5_*_*_FAMILY = CHANGED\n")
+        # make sure the modification time differs even on coarse filesystems
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        self.assertEqual(tools_def.get_tool_chain_family(self.path, "GCC5"), "CHANGED")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,11 +9,42 @@
 import unittest
 from edk2toolext.environment import uefi_build
 from edk2toolext.environment.plugintypes import uefi_helper_plugin
-from edk2toolext.environment.plugin_manager import PluginManager
+from edk2toolext.environment.plugin_manager import PluginManager, PluginDescriptor
+from edk2toolext.environment.plugintypes.uefi_build_plugin import IUefiBuildPlugin
 import argparse
+import logging
 import tempfile
+import threading
 import os
+from unittest import mock
 from edk2toolext.environment import shell_environment
+from edk2toolext.environment.multiple_workspace import MultipleWorkspace
+
+
+class RecordingPlugin(IUefiBuildPlugin):
+    ''' post build plugin that records when it starts and ends '''
+
+    def __init__(self, name, events, parallel=False, runs_after=(), rc=0, barrier=None):
+        self.name = name
+        self.events = events
+        self.parallel = parallel
+        self.runs_after = list(runs_after)
+        self.rc = rc
+        self.barrier = barrier
+
+    def IsParallelSafe(self):
+        return self.parallel
+
+    def RunsAfter(self):
+        return self.runs_after
+
+    def do_post_build(self, thebuilder):
+        self.events.append("start " + self.name)
+        if self.barrier is not None:
+            # only passes if the other plugins using the barrier are running at the same time
+            self.barrier.wait()
+        self.events.append("end " + self.name)
+        return self.rc
 
 
 class TestUefiBuild(unittest.TestCase):
@@ -91,6 +122,184 @@ def test_go_skip_building(self):
         ret = builder.Go(self.WORKSPACE, "", helper, manager)
         self.assertEqual(ret, 0)
 
+    def test_go_uses_parse_cache(self):
+        shell_environment.GetBuildVars().SetValue("EDK_TOOLS_PATH", self.WORKSPACE, "empty")
+        builder = uefi_build.UefiBuilder()
+        builder.SkipBuild = True
+        builder.SkipPostBuild = True
+        ret = builder.Go(self.WORKSPACE, "", uefi_helper_plugin.HelperFunctions(), PluginManager())
+        self.assertEqual(ret, 0)
+        self.assertTrue(os.path.isfile(os.path.join(self.WORKSPACE, "Build", "ParseCache.json")))
+
+        # a changed DSC must not use the cached result
+        shell_environment.GetEnvironment().restore_initial_checkpoint()
+        shell_environment.GetBuildVars().SetValue("EDK_TOOLS_PATH", self.WORKSPACE, "empty")
+        TestUefiBuild.write_to_file(os.path.join(self.WORKSPACE, "Test.dsc"),
+                                    ["[Defines]\n", "OUTPUT_DIRECTORY = Build\n", "NEW_DEFINE = 1"])
+        builder = uefi_build.UefiBuilder()
+        builder.SkipBuild = True
+        builder.SkipPostBuild = True
+        ret = builder.Go(self.WORKSPACE, "", uefi_helper_plugin.HelperFunctions(), PluginManager())
+        self.assertEqual(ret, 0)
+        self.assertEqual(shell_environment.GetBuildVars().GetValue("NEW_DEFINE"), "1")
+
+    def test_parse_dsc_without_go(self):
+        # a builder set up without Go has no parse cache and parses every time
+        builder = uefi_build.UefiBuilder()
+        builder.env = shell_environment.GetBuildVars()
+        builder.mws = MultipleWorkspace()
+        builder.mws.setWs(self.WORKSPACE, "")
+        builder.ws = self.WORKSPACE
+        builder.pp = ""
+        builder.env.SetValue("ACTIVE_PLATFORM", "Test.dsc", "test")
+        self.assertEqual(builder.ParseDscFile(), 0)
+        self.assertEqual(builder.env.GetValue("OUTPUT_DIRECTORY"), "Build")
+        self.assertIsNone(builder._LookupParseCache("dsc"))
+        self.assertFalse(os.path.isfile(os.path.join(self.WORKSPACE, "Build", "ParseCache.json")))
+
+    def test_multi_build_commandline_options(self):
+        builder = uefi_build.UefiBuilder()
+        parserObj = argparse.ArgumentParser()
+        builder.AddPlatformCommandLineOptions(parserObj)
+        results = parserObj.parse_args(["--BuildTargets", "debug,RELEASE", "--BuildToolChains", "VS2019,GCC5"])
+        builder.RetrievePlatformCommandLineOptions(results)
+        self.assertEqual(builder.BuildTargetList, ["DEBUG", "RELEASE"])
+        self.assertEqual(builder.BuildToolChainList, ["VS2019", "GCC5"])
+
+    def test_build_env_overlay(self):
+        shell_environment.GetBuildVars().SetValue("EDK_TOOLS_PATH", self.WORKSPACE, "empty")
+        shell_environment.GetBuildVars().SetValue("TARGET_ARCH", "X64", "From CmdLine")
+        builder = uefi_build.UefiBuilder()
+        builder.SkipBuild = True
+        builder.SkipPostBuild = True
+        ret = builder.Go(self.WORKSPACE, "", uefi_helper_plugin.HelperFunctions(), PluginManager())
+        self.assertEqual(ret, 0)
+
+        overlay = builder.GetBuildEnvOverlay("RELEASE", "test", 4)
+        self.assertEqual(overlay.GetValue("TARGET"), "RELEASE")
+        self.assertEqual(overlay.GetValue("MAX_CONCURRENT_THREAD_NUMBER"), "4")
+        self.assertEqual(overlay.GetValue("BUILD_OUTPUT_BASE"),
+                         os.path.join(self.WORKSPACE, "Build", "RELEASE_test"))
+        # the overlay must not change the shared environment
+        self.assertEqual(builder.env.GetValue("TARGET"), "DEBUG")
+        self.assertEqual(builder.env.GetValue("BUILD_OUTPUT_BASE"),
+                         os.path.join(self.WORKSPACE, "Build", "DEBUG_test"))
+
+        params = builder.GetBuildParameters(overlay)
+        self.assertIn("-b RELEASE", params)
+        self.assertIn("-t test", params)
+        self.assertIn("-n 4", params)
+        self.assertIn("-a X64", params)
+
+    def test_build_multiple(self):
+        shell_environment.GetBuildVars().SetValue("EDK_TOOLS_PATH", self.WORKSPACE, "empty")
+        shell_environment.GetBuildVars().SetValue("TARGET_ARCH", "X64", "From CmdLine")
+        shell_environment.GetBuildVars().SetValue("BUILDMODULE", "Test/Test.inf", "From CmdLine")
+        builder = uefi_build.UefiBuilder()
+        builder.SkipBuild = True
+        builder.SkipPostBuild = True
+        ret = builder.Go(self.WORKSPACE, "", uefi_helper_plugin.HelperFunctions(), PluginManager())
+        self.assertEqual(ret, 0)
+        builder.SkipPostBuild = False
+        builder.FlashImage = True
+        builder.BuildTargetList = ["DEBUG", "RELEASE", "DEBUG"]
+        builder.BuildToolChainList = ["test"]
+
+        params = []
+
+        def run_cmd(cmd, parameters, **kwargs):
+            params.append(parameters)
+            return 0
+        with mock.patch.object(uefi_build, "RunCmd", side_effect=run_cmd):
+            self.assertEqual(builder.BuildMultiple(), 0)
+
+        # a repeated combination is only built once
+        self.assertEqual(len(params), 2)
+        for (target, param) in zip(["DEBUG", "RELEASE"], sorted(params)):
+            self.assertIn(f"-b {target}", param)
+            self.assertIn("-m Test/Test.inf", param)
+            self.assertIn("--conf=" + os.path.join(self.WORKSPACE, "Build", f"{target}_test", "Conf"), param)
+        # a single module build skips post build and flashing like a single build does
+        self.assertTrue(builder.SkipPostBuild)
+        self.assertFalse(builder.FlashImage)
+
+    def test_build_logs_problems_as_found(self):
+        shell_environment.GetBuildVars().SetValue("EDK_TOOLS_PATH", self.WORKSPACE, "empty")
+        shell_environment.GetBuildVars().SetValue("TARGET_ARCH", "X64", "From CmdLine")
+        builder = uefi_build.UefiBuilder()
+        builder.SkipBuild = True
+        builder.SkipPostBuild = True
+        self.assertEqual(builder.Go(self.WORKSPACE, "", uefi_helper_plugin.HelperFunctions(), PluginManager()), 0)
+
+        def run_cmd(cmd, parameters, **kwargs):
+            logging.info("foo.c(12): error C2065: 'x': undeclared")
+            logging.info("next line")
+            return 2
+        with mock.patch.object(uefi_build, "RunCmd", side_effect=run_cmd):
+            with self.assertLogs(level=logging.INFO) as logs:
+                self.assertEqual(builder.Build(), 2)
+        messages = [r.getMessage() for r in logs.records]
+        problem = "Compiler #2065 from foo.c(12):   'x': undeclared"
+        # the problem is logged once, before the output that follows it
+        self.assertEqual(messages.count(problem), 1)
+        self.assertLess(messages.index(problem), messages.index("next line"))
+
+    def _run_post_build(self, plugins):
+        manager = PluginManager()
+        for plugin in plugins:
+            descriptor = PluginDescriptor({"name": plugin.name, "module": plugin.name, "descriptor_file": ""})
+            descriptor.Obj = plugin
+            manager.Descriptors.append(descriptor)
+        builder = uefi_build.UefiBuilder()
+        builder.pm = manager
+        builder.env = shell_environment.GetBuildVars()
+        builder.env.SetValue("MAX_CONCURRENT_THREAD_NUMBER", "4", "test")
+        return builder.PostBuild()
+
+    def test_build_plugins_run_in_order(self):
+        events = []
+        plugins = [RecordingPlugin("A", events), RecordingPlugin("B", events, rc=3), RecordingPlugin("C", events)]
+        self.assertEqual(self._run_post_build(plugins), 3)
+        self.assertEqual(events, ["start A", "end A", "start B", "end B"])
+
+    def test_parallel_build_plugins(self):
+        events = []
+        barrier = threading.Barrier(2, timeout=10)
+        plugins = [RecordingPlugin("Serial1", events),
+                   RecordingPlugin("Sign", events, parallel=True, barrier=barrier),
+                   RecordingPlugin("Report", events, parallel=True, barrier=barrier),
+                   RecordingPlugin("Analyze", events, parallel=True, runs_after=["Sign"]),
+                   RecordingPlugin("Serial2", events)]
+        self.assertEqual(self._run_post_build(plugins), 0)
+        self.assertEqual(events[:2], ["start Serial1", "end Serial1"])
+        self.assertLess(events.index("end Sign"), events.index("start Analyze"))
+        self.assertEqual(events[-2:], ["start Serial2", "end Serial2"])
+
+    def test_parallel_build_plugin_failure(self):
+        events = []
+        plugins = [RecordingPlugin("Fail", events, parallel=True, rc=2),
+                   RecordingPlugin("After", events, parallel=True, runs_after=["Fail"]),
+                   RecordingPlugin("Serial", events)]
+        self.assertEqual(self._run_post_build(plugins), 2)
+        self.assertNotIn("start After", events)
+        self.assertNotIn("start Serial", events)
+
+        # a cycle can never run
+        plugins = [RecordingPlugin("A", events, parallel=True, runs_after=["B"]),
+                   RecordingPlugin("B", events, parallel=True, runs_after=["A"])]
+        self.assertEqual(self._run_post_build(plugins), -1)
+
+    def test_build_plugins_run_after_later_plugin(self):
+        events = []
+        # RunsAfter takes precedence over load order for plugins that aren't parallel safe too
+        plugins = [RecordingPlugin("A", events, runs_after=["C"]),
+                   RecordingPlugin("B", events),
+                   RecordingPlugin("C", events),
+                   RecordingPlugin("D", events, parallel=True)]
+        self.assertEqual(self._run_post_build(plugins), 0)
+        self.assertEqual(events, ["start B", "end B", "start C", "end C", "start A", "end A",
+                                  "start D", "end D"])
+
     # TODO finish unit test
 
 
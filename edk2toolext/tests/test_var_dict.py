@@ -6,6 +6,8 @@
 #
 # SPDX-License-Identifier: BSD-2-Clause-Patent
 ##
+import os
+import tempfile
 import unittest
 from edk2toolext.environment import var_dict
 
@@ -61,6 +63,16 @@ def test_var_dict_can_override(self):
         vv = v.GetValue("test1")
         self.assertEqual("value2", vv)
 
+    def test_var_dict_force_value(self):
+        v = var_dict.VarDict()
+        v.SetValue("test1", "value1", "test 1 comment")
+        v.ForceValue("test1", "value2", "forced")
+        self.assertEqual(v.GetValue("test1"), "value2")
+        self.assertEqual(v.GetEntry("test1").Comment, "forced")
+        ## the forced entry is not overridable unless asked
+        v.SetValue("test1", "value3", "this should fail")
+        self.assertEqual(v.GetValue("test1"), "value2")
+
     def test_var_dict_can_change_override_state_with_same_set(self):
         v = var_dict.VarDict()
         v.SetValue("test1", "value1", "test 1 comment", True)
@@ -201,6 +213,66 @@ def test_var_dict_print_all(self):
         v.SetValue("test2", "value1", "test 1 comment overrideable", True)
         v.PrintAll()
 
+    def test_var_dict_save_and_load_json(self):
+        v = var_dict.VarDict()
+        v.SetValue("bld_*_test1", "build_value1", "build test 1 comment")
+        v.SetValue("test2", "value=1", "test 1 comment overrideable", True)
+        path = os.path.join(tempfile.mkdtemp(), "env.json")
+        v.SaveToFile(path, "json")
+
+        v2 = var_dict.VarDict()
+        self.assertTrue(v2.LoadFromFile(path))
+        self.assertEqual(v2.GetValue("bld_*_test1"), "build_value1")
+        self.assertEqual(v2.GetEntry("test2").Comment, "test 1 comment overrideable")
+        self.assertTrue(v2.GetEntry("test2").Overrideable)
+        self.assertFalse(v2.GetEntry("bld_*_test1").Overrideable)
+        self.assertEqual(v2.GetValue("test2"), "value=1")
+
+    def test_var_dict_save_and_load_keyvalue(self):
+        v = var_dict.VarDict()
+        v.SetValue("test2", "value=1", "test 2 comment overrideable", True)
+        v.SetValue("test1", "value1", "test 1 comment")
+        path = os.path.join(tempfile.mkdtemp(), "env.txt")
+        v.SaveToFile(path, "keyvalue")
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+        ## keys should be sorted
+        self.assertEqual(lines, ["# test 1 comment", "TEST1=value1",
+                                 "# [overridable] test 2 comment overrideable", "TEST2=value=1"])
+
+        v2 = var_dict.VarDict()
+        self.assertTrue(v2.LoadFromFile(path))
+        self.assertEqual(v2.GetValue("test1"), "value1")
+        self.assertEqual(v2.GetValue("test2"), "value=1")
+        self.assertEqual(v2.GetEntry("test1").Comment, "test 1 comment")
+        self.assertTrue(v2.GetEntry("test2").Overrideable)
+        self.assertFalse(v2.GetEntry("test1").Overrideable)
+
+    def test_var_dict_keyvalue_round_trip(self):
+        v = var_dict.VarDict()
+        v.SetValue("multi", "line 1\nline 2\r\n", "comment\nwith lines")
+        v.SetValue("path", "C:\\Build\\new", None, True)
+        v.SetValue("nocomment", "value", None)
+        path = os.path.join(tempfile.mkdtemp(), "env.txt")
+        v.SaveToFile(path, "keyvalue")
+        with open(path, "r") as f:
+            lines = f.read().split("\n")
+        self.assertEqual(lines, ["# comment\\nwith lines", "MULTI=line 1\\nline 2\\r\\n",
+                                 "# ", "NOCOMMENT=value",
+                                 "# [overridable] ", "PATH=C:\\\\Build\\\\new", ""])
+
+        v2 = var_dict.VarDict()
+        self.assertTrue(v2.LoadFromFile(path))
+        for key in ["multi", "path", "nocomment"]:
+            self.assertEqual(v2.GetValue(key), v.GetValue(key))
+            self.assertEqual(v2.GetEntry(key).Comment, v.GetEntry(key).Comment)
+            self.assertEqual(v2.GetEntry(key).Overrideable, v.GetEntry(key).Overrideable)
+
+    def test_var_dict_save_bad_format(self):
+        v = var_dict.VarDict()
+        with self.assertRaises(ValueError):
+            v.SaveToFile(os.path.join(tempfile.mkdtemp(), "env.xml"), "xml")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,6 +7,7 @@
 # SPDX-License-Identifier: BSD-2-Clause-Patent
 ##
 import unittest
+import threading
 from edk2toolext.environment import version_aggregator
 
 
@@ -80,6 +81,21 @@ def test_global_reset(self):
         version_aggregator.ResetVersionAggregator()
         self.assertEqual(len(version1.GetAggregatedVersionInformation()), 0)
 
+    def test_pending_reporter(self):
+        version1 = version_aggregator.version_aggregator()
+        started = threading.Event()
+
+        def reporter():
+            started.wait()
+            version1.ReportVersion("late", "1.0", version_aggregator.VersionTypes.PIP)
+
+        thread = threading.Thread(target=reporter)
+        version1.AddPendingReporter(thread)
+        thread.start()
+        started.set()
+        # reading waits for the pending reporter
+        self.assertIn("late", version1.GetAggregatedVersionInformation())
+
 
 if __name__ == '__main__':
     unittest.main()